@@ -4,6 +4,44 @@ from aus_weather_data.radar.common.frame import (
     BOMRadarFrameData,
 )
 
+from aus_weather_data.radar.common.png import (
+    decode_png,
+    read_png_header,
+)
+
+from aus_weather_data.radar.common.decode import (
+    BOMRadarBatchDecoder,
+    BOMRadarDecodedBatch,
+)
+
+from aus_weather_data.radar.common.legend import (
+    BOMRadarLegend,
+    RADAR_TYPE_LEGEND,
+    REFLECTIVITY_DBZ,
+    REFLECTIVITY_RAIN_RATE,
+    VELOCITY,
+    RAINFALL_SHORT,
+    RAINFALL_LONG,
+    get_radar_type_legend,
+)
+
+from aus_weather_data.radar.common.catalog import (
+    BOMRadarCatalog,
+)
+
+from aus_weather_data.radar.common.coverage import (
+    BOMRadarCoverage,
+)
+
+from aus_weather_data.radar.common.mosaic import (
+    BOMRadarMosaic,
+    MOSAIC_METHODS,
+)
+
+from aus_weather_data.radar.common.index import (
+    BOMRadarFrameIndex,
+)
+
 from aus_weather_data.radar.common.location import (
     BOMRadarLocationModel,
     BOMRadarLocation,
@@ -11,10 +49,36 @@ from aus_weather_data.radar.common.location import (
 
 from aus_weather_data.radar.common.types import (
     RADAR_TYPE,
+    RADAR_TYPE_RANGE,
+)
+
+from aus_weather_data.radar.common.grid import (
+    compute_pixel_grid,
+    coordinates_to_pixels,
+    pixels_to_coordinates,
+    get_cache_dir,
 )
 
 from aus_weather_data.radar.common.utils import (
     split_filename,
+    parse_filename,
+)
+
+from aus_weather_data.radar.local.archive import (
+    BOMRadarArchive,
+)
+
+from aus_weather_data.radar.local.cube import (
+    BOMRadarCube,
+)
+
+from aus_weather_data.radar.local.database import (
+    BOMRadarFrameDatabase,
+    FRAME_STATUS,
+)
+
+from aus_weather_data.radar.local.pack import (
+    BOMRadarFramePack,
 )
 
 from aus_weather_data.radar.remote.conn import (
@@ -23,12 +87,21 @@ from aus_weather_data.radar.remote.conn import (
 
 from aus_weather_data.radar.remote.download import (
     BOMRadarDownload,
+    BOMRadarDownloadReport,
+)
+
+from aus_weather_data.radar.remote.listing import (
+    BOMRadarListingTracker,
 )
 
 from aus_weather_data.radar.remote.pool import (
     BOMFTPPool,
 )
 
+from aus_weather_data.radar.remote.retry import (
+    RetryPolicy,
+)
+
 from aus_weather_data.radar.remote.utils import (
     get_matching_files,
 )
@@ -45,13 +118,44 @@ __all__ = [
     "BOMRadarFrameMetadata",
     "BOMRadarFramePNG",
     "BOMRadarFrameData",
+    "decode_png",
+    "read_png_header",
+    "BOMRadarBatchDecoder",
+    "BOMRadarDecodedBatch",
+    "BOMRadarLegend",
+    "RADAR_TYPE_LEGEND",
+    "REFLECTIVITY_DBZ",
+    "REFLECTIVITY_RAIN_RATE",
+    "VELOCITY",
+    "RAINFALL_SHORT",
+    "RAINFALL_LONG",
+    "get_radar_type_legend",
+    "BOMRadarCatalog",
+    "BOMRadarCoverage",
+    "BOMRadarMosaic",
+    "MOSAIC_METHODS",
+    "BOMRadarFrameIndex",
     "BOMRadarLocationModel",
     "BOMRadarLocation",
     "RADAR_TYPE",
+    "RADAR_TYPE_RANGE",
+    "compute_pixel_grid",
+    "coordinates_to_pixels",
+    "pixels_to_coordinates",
+    "get_cache_dir",
     "split_filename",
+    "parse_filename",
+    "BOMRadarArchive",
+    "BOMRadarCube",
+    "BOMRadarFrameDatabase",
+    "FRAME_STATUS",
+    "BOMRadarFramePack",
     "BOMFTPConn",
     "BOMRadarDownload",
+    "BOMRadarDownloadReport",
     "BOMFTPPool",
+    "RetryPolicy",
+    "BOMRadarListingTracker",
     "get_matching_files",
     "BOM_FTP_HOST",
     "BOM_FTP_USER",
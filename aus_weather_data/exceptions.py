@@ -3,4 +3,16 @@ class AusWeatherDataBaseException(Exception):
 
 
 class ParseFrameError(AusWeatherDataBaseException):
-    pass
\ No newline at end of file
+    pass
+
+
+class PoolError(AusWeatherDataBaseException):
+    pass
+
+
+class PoolTimeoutError(PoolError):
+    pass
+
+
+class DecodeFrameError(AusWeatherDataBaseException):
+    pass
@@ -0,0 +1,384 @@
+import datetime
+import numpy as np
+
+from pytz import BaseTzInfo
+from typing import Iterable, Iterator, List, Optional, Tuple, Union, overload
+
+from aus_weather_data.radar.common.frame import BOMRadarFrameMetadata
+from aus_weather_data.radar.common.location import (
+    BOMRadarLocationModel,
+    IDR_INDEX_MAP,
+    IDR_LOCATIONS,
+)
+from aus_weather_data.radar.common.types import RADAR_TYPE, RADAR_TYPE_MAP
+from aus_weather_data.radar.common.utils import (
+    parse_filename,
+    datetime_to_epoch_minute,
+)
+
+_EPOCH_SHIFT = 16
+_RADAR_SHIFT = 8
+_TYPE_MASK = 0xFF
+
+
+@overload
+def pack_frame_key(radar_index: int, type_code: int, epoch_minute: int) -> int: ...
+
+
+@overload
+def pack_frame_key(
+    radar_index: Union[int, np.ndarray],
+    type_code: Union[int, np.ndarray],
+    epoch_minute: np.ndarray,
+) -> np.ndarray: ...
+
+
+def pack_frame_key(radar_index, type_code, epoch_minute):
+    """Pack a frame's radar index, type code and epoch minute into one key
+
+    Keys are ``(epoch_minute << 16) | (radar_index << 8) | type_code``, so
+    they sort by time first and fit in an int64 for any frame. An array
+    of minutes should be int64 to hold them shifted.
+
+    Args:
+        radar_index: Radar location index(es).
+        type_code: Radar type code(s) (ordinal of the filename suffix).
+        epoch_minute: Minutes since epoch.
+
+    Returns:
+        The key as an int, or an int64 array if `epoch_minute` is an array.
+    """
+
+    return (epoch_minute << _EPOCH_SHIFT) | (radar_index << _RADAR_SHIFT) | type_code
+
+
+@overload
+def unpack_frame_key(key: int) -> Tuple[int, int, int]: ...
+
+
+@overload
+def unpack_frame_key(key: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]: ...
+
+
+def unpack_frame_key(key):
+    """Split packed frame key(s), the inverse of :func:`pack_frame_key`
+
+    Args:
+        key: Packed key or int64 array of keys.
+
+    Returns:
+        (radar index, type code, epoch minute) of the key(s).
+    """
+
+    return (
+        (key >> _RADAR_SHIFT) & _TYPE_MASK,
+        key & _TYPE_MASK,
+        key >> _EPOCH_SHIFT,
+    )
+
+
+def frame_key_sql(radar_index: str, type_code: str, epoch_minute: str) -> str:
+    """SQL expression packing columns into a frame key, see :func:`pack_frame_key`
+
+    Args:
+        radar_index: SQL expression of the radar location index.
+        type_code: SQL expression of the radar type code.
+        epoch_minute: SQL expression of the minutes since epoch.
+
+    Returns:
+        The SQL expression.
+    """
+
+    return (
+        f"(({epoch_minute}) << {_EPOCH_SHIFT}) "
+        f"| (({radar_index}) << {_RADAR_SHIFT}) | ({type_code})"
+    )
+
+
+def frame_keys(
+    radar_index: np.ndarray, type_code: np.ndarray, epoch_minute: np.ndarray
+) -> np.ndarray:
+    """Pack the catalog columns into a single int64 key per frame
+
+    Args:
+        radar_index: Radar location indices.
+        type_code: Radar type codes (ordinal of the filename suffix).
+        epoch_minute: Minutes since epoch.
+
+    Returns:
+        Array of int64 keys, unique per frame (see :func:`pack_frame_key`).
+    """
+
+    return pack_frame_key(
+        radar_index.astype(np.int64),
+        type_code.astype(np.int64),
+        epoch_minute.astype(np.int64),
+    )
+
+
+def parse_frame_key(filename: str) -> Optional[int]:
+    """Parse a filename into a packed frame key
+
+    Args:
+        filename: Filename or path of the radar frame. E.G: IDR024.T.202001312236.png
+
+    Returns:
+        Packed int64 key (see :func:`frame_keys`), or None if the filename
+        isn't a radar frame PNG for a known location and radar type.
+    """
+
+    try:
+        idr, idr_type, epoch_minute = parse_filename(filename.rpartition("/")[2])
+    except ValueError:
+        return None
+
+    radar_index = IDR_INDEX_MAP.get(idr)
+    if radar_index is None or idr_type not in RADAR_TYPE_MAP:
+        return None
+
+    return pack_frame_key(radar_index, ord(idr_type), epoch_minute)
+
+
+class BOMRadarCatalog(object):
+    """Columnar catalog of radar frames
+
+    Holds a radar directory listing as three NumPy arrays: radar location
+    index (see :data:`IDR_LOCATIONS`), radar type code (the ordinal of
+    the filename suffix) and minutes since epoch. Filtering is done with
+    boolean masks over these arrays and :class:`BOMRadarFrameMetadata`
+    objects are only built when entries are accessed.
+
+    Attributes:
+        locale_tz: Timezone passed to frames built from this catalog.
+    """
+
+    def __init__(
+        self,
+        radar_index: np.ndarray,
+        type_code: np.ndarray,
+        epoch_minute: np.ndarray,
+        locale_tz: Optional[BaseTzInfo] = None,
+    ):
+        """Initialise the catalog from its columns
+
+        Args:
+            radar_index: Radar location indices (int16).
+            type_code: Radar type codes (uint8).
+            epoch_minute: Minutes since epoch (int64).
+            locale_tz (optional): :class:`pytz.timezone` object passed to the frames.
+        """
+
+        if not len(radar_index) == len(type_code) == len(epoch_minute):
+            raise ValueError("Catalog columns must be the same length")
+
+        self._radar_index = np.asarray(radar_index, dtype=np.int16)
+        self._type_code = np.asarray(type_code, dtype=np.uint8)
+        self._epoch_minute = np.asarray(epoch_minute, dtype=np.int64)
+        self.locale_tz = locale_tz
+
+    @classmethod
+    def from_filenames(
+        cls, file_list: Iterable[str], locale_tz: Optional[BaseTzInfo] = None
+    ) -> "BOMRadarCatalog":
+        """Build a catalog from a directory listing
+
+        Entries that aren't radar frame PNGs for a known location and
+        radar type are skipped.
+
+        Args:
+            file_list: Filenames or paths (EG. from :meth:`BOMFTPConn.get_directory_contents`).
+            locale_tz (optional): :class:`pytz.timezone` object passed to the frames.
+
+        Returns:
+            Catalog of the parseable frames, in listing order.
+        """
+
+        keys = [key for key in map(parse_frame_key, file_list) if key is not None]
+        return cls.from_keys(np.array(keys, dtype=np.int64), locale_tz=locale_tz)
+
+    @classmethod
+    def from_keys(
+        cls, keys: np.ndarray, locale_tz: Optional[BaseTzInfo] = None
+    ) -> "BOMRadarCatalog":
+        """Build a catalog from packed frame keys
+
+        Args:
+            keys: Packed int64 keys (see :func:`frame_keys`).
+            locale_tz (optional): :class:`pytz.timezone` object passed to the frames.
+
+        Returns:
+            Catalog of the frames, in key order.
+        """
+
+        radar_index, type_code, epoch_minute = unpack_frame_key(
+            np.asarray(keys, dtype=np.int64)
+        )
+        return cls(radar_index, type_code, epoch_minute, locale_tz=locale_tz)
+
+    def __len__(self) -> int:
+        return len(self._epoch_minute)
+
+    def __getitem__(self, index: int) -> BOMRadarFrameMetadata:
+        return BOMRadarFrameMetadata.from_components(
+            int(self._radar_index[index]),
+            chr(self._type_code[index]),
+            int(self._epoch_minute[index]),
+            self.locale_tz,
+        )
+
+    def __iter__(self) -> Iterator[BOMRadarFrameMetadata]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __str__(self) -> str:
+        return f"BOMRadarCatalog<frames={len(self)}>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def radar_index(self) -> np.ndarray:
+        """Radar location index of each frame (see :data:`IDR_LOCATIONS`)."""
+
+        return self._radar_index
+
+    @property
+    def type_code(self) -> np.ndarray:
+        """Radar type code of each frame (ordinal of the filename suffix)."""
+
+        return self._type_code
+
+    @property
+    def epoch_minute(self) -> np.ndarray:
+        """Minutes since epoch of each frame."""
+
+        return self._epoch_minute
+
+    @property
+    def keys(self) -> np.ndarray:
+        """Packed int64 key of each frame (see :func:`frame_keys`)."""
+
+        return frame_keys(self._radar_index, self._type_code, self._epoch_minute)
+
+    def subset(self, selection: np.ndarray) -> "BOMRadarCatalog":
+        """Catalog of the frames selected by a boolean mask or index array
+
+        Args:
+            selection: Boolean mask or integer index array.
+
+        Returns:
+            New catalog holding the selected frames.
+        """
+
+        return BOMRadarCatalog(
+            self._radar_index[selection],
+            self._type_code[selection],
+            self._epoch_minute[selection],
+            locale_tz=self.locale_tz,
+        )
+
+    def mask(
+        self,
+        radar_locations: Optional[List[BOMRadarLocationModel]] = None,
+        radar_types: Optional[List[RADAR_TYPE]] = None,
+        start_time_utc: Optional[datetime.datetime] = None,
+        end_time_utc: Optional[datetime.datetime] = None,
+        ignore_list: Optional[Iterable[str]] = None,
+    ) -> np.ndarray:
+        """Boolean mask of the frames matching the given filters
+
+        Args:
+            radar_locations: The radar(s) to match.
+            radar_types: The radar types to match.
+            start_time_utc: Earliest frame time to match (inclusive).
+            end_time_utc: Latest frame time to match (inclusive).
+            ignore_list: Radar frames to exclude (should be just the basename).
+
+        Returns:
+            Boolean array, True for matching frames.
+        """
+
+        # Lookup tables indexed by radar index / type code, rather than np.isin
+        mask = np.ones(len(self), dtype=bool)
+
+        if radar_locations:
+            allowed = np.zeros(len(IDR_LOCATIONS), dtype=bool)
+            allowed[
+                [
+                    IDR_INDEX_MAP[location.base]
+                    for location in radar_locations
+                    if isinstance(location, BOMRadarLocationModel)
+                ]
+            ] = True
+            mask &= allowed[self._radar_index]
+
+        if radar_types:
+            allowed = np.zeros(256, dtype=bool)
+            allowed[
+                [
+                    ord(radar_type.value)
+                    for radar_type in radar_types
+                    if isinstance(radar_type, RADAR_TYPE)
+                ]
+            ] = True
+            mask &= allowed[self._type_code]
+
+        if start_time_utc:
+            mask &= self._epoch_minute >= datetime_to_epoch_minute(
+                start_time_utc, round_up=True
+            )
+
+        if end_time_utc:
+            mask &= self._epoch_minute <= datetime_to_epoch_minute(end_time_utc)
+
+        if ignore_list:
+            ignored = BOMRadarCatalog.from_filenames(ignore_list)
+            if len(ignored):
+                mask &= ~np.isin(self.keys, ignored.keys)
+
+        return mask
+
+    def filter(
+        self,
+        radar_locations: Optional[List[BOMRadarLocationModel]] = None,
+        radar_types: Optional[List[RADAR_TYPE]] = None,
+        start_time_utc: Optional[datetime.datetime] = None,
+        end_time_utc: Optional[datetime.datetime] = None,
+        ignore_list: Optional[Iterable[str]] = None,
+    ) -> "BOMRadarCatalog":
+        """Catalog of the frames matching the given filters
+
+        See :meth:`mask` for the arguments.
+
+        Returns:
+            New catalog holding the matching frames.
+        """
+
+        return self.subset(
+            self.mask(
+                radar_locations=radar_locations,
+                radar_types=radar_types,
+                start_time_utc=start_time_utc,
+                end_time_utc=end_time_utc,
+                ignore_list=ignore_list,
+            )
+        )
+
+    def frames(self) -> List[BOMRadarFrameMetadata]:
+        """Build the metadata frames for every entry in the catalog
+
+        Returns:
+            List of :class:`BOMRadarFrameMetadata` in catalog order.
+        """
+
+        return list(self)
+
+
+__all__ = [
+    "BOMRadarCatalog",
+    "frame_key_sql",
+    "frame_keys",
+    "pack_frame_key",
+    "parse_frame_key",
+    "unpack_frame_key",
+]
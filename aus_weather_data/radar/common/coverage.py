@@ -0,0 +1,250 @@
+import numpy as np
+
+from numpy.typing import ArrayLike
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from aus_weather_data.radar.common.location import (
+    BOMRadarLocationModel,
+    IDR_LOCATIONS,
+)
+from aus_weather_data.radar.common.grid import IMAGE_SIZE
+from aus_weather_data.radar.common.types import RADAR_TYPE, RADAR_TYPE_RANGE
+from aus_weather_data.radar.common.utils import EARTH_RADIUS, get_distance_bearing
+
+CoverageKey = Tuple[BOMRadarLocationModel, RADAR_TYPE]
+
+_BOUNDS_MARGIN = 1e-4
+"""Degrees the bounding boxes are widened by, so rounding can't drop a location in range"""
+
+
+class BOMRadarCoverage(object):
+    """Spatial index of the areas covered by radar products
+
+    Holds every (:class:`BOMRadarLocationModel`, :class:`RADAR_TYPE`)
+    pair as columns of its range, and each radar's centre and bounding
+    box (from :meth:`BOMRadarLocationModel.radar_range` of its widest
+    range, widened to the full east to west extent of the range). A
+    query tests every location against every bounding box at once, then
+    works out the great circle distance only for the candidates in a
+    box. A pair
+    covers a location if it is within the radar's range, as the corners
+    of the square image hold no data.
+
+    Attributes:
+        keys: The (location, radar type) pairs, the columns of :meth:`covers`.
+        ranges: (pairs,) range of each pair in kms.
+    """
+
+    def __init__(
+        self,
+        locations: Iterable[BOMRadarLocationModel] = IDR_LOCATIONS,
+        radar_types: Optional[Iterable[RADAR_TYPE]] = None,
+    ):
+        """Build the index
+
+        Args:
+            locations (optional): Radar locations to index. Defaults to every location.
+            radar_types (optional): Radar types to index, EG. only the reflectivity types. Defaults to None for every type.
+        """
+
+        wanted = set(RADAR_TYPE if radar_types is None else radar_types)
+
+        self.keys: List[CoverageKey] = [
+            (location, radar_type)
+            for location in locations
+            for radar_type in RADAR_TYPE
+            if radar_type in wanted and radar_type in location.radar_types
+        ]
+
+        self.ranges = np.array(
+            [RADAR_TYPE_RANGE[radar_type] for _, radar_type in self.keys],
+            dtype=np.float64,
+        ).reshape(-1)
+
+        # Distances only depend on the radar, so boxes and distances are per
+        # radar, from the pair with the largest range, and spread to the pairs
+        radars: Dict[BOMRadarLocationModel, CoverageKey] = {}
+        for key in self.keys:
+            widest = radars.setdefault(key[0], key)
+            if RADAR_TYPE_RANGE[key[1]] > RADAR_TYPE_RANGE[widest[1]]:
+                radars[key[0]] = key
+        radar_index = {location: i for i, location in enumerate(radars)}
+        self._radar_index = np.array(
+            [radar_index[location] for location, _ in self.keys], dtype=np.intp
+        )
+
+        centres = np.array(
+            [location.location for location in radars], dtype=np.float64
+        ).reshape(-1, 2)
+        self._latitudes = centres[:, 0]
+        self._longitudes = centres[:, 1]
+
+        # (north, south, west, east) of each radar
+        bounds = np.empty((len(radars), 4), dtype=np.float64)
+        for i, (location, radar_type) in enumerate(radars.values()):
+            (north, west), _, (south, east), _ = location.radar_range(radar_type)
+            bounds[i] = north, south, west, east
+
+        # The box is through the points due east and west of the radar, but
+        # the range reaches further east and west towards the pole
+        widest_range = np.array(
+            [RADAR_TYPE_RANGE[radar_type] for _, radar_type in radars.values()],
+            dtype=np.float64,
+        )
+        half_width = np.degrees(
+            np.arcsin(
+                np.clip(
+                    np.sin(widest_range / EARTH_RADIUS)
+                    / np.cos(np.radians(self._latitudes)),
+                    -1.0,
+                    1.0,
+                )
+            )
+        )
+        bounds[:, 2] = np.minimum(bounds[:, 2], self._longitudes - half_width)
+        bounds[:, 3] = np.maximum(bounds[:, 3], self._longitudes + half_width)
+        self._bounds = bounds + _BOUNDS_MARGIN * np.array([1, -1, -1, 1])
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __str__(self) -> str:
+        return f"BOMRadarCoverage<pairs={len(self.keys)}>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def resolutions(self) -> np.ndarray:
+        """(pairs,) width of a pixel of each pair in kms."""
+
+        resolutions: np.ndarray = 2.0 * self.ranges / IMAGE_SIZE
+        return resolutions
+
+    def _candidates(
+        self, latitude: np.ndarray, longitude: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(location, radar) indices of the bounding boxes the locations fall in"""
+
+        north, south, west, east = self._bounds.T
+        lat = latitude[:, None]
+        lon = longitude[:, None]
+        in_box = (lat <= north) & (lat >= south) & (lon >= west) & (lon <= east)
+        points, radars = np.nonzero(in_box)
+        return points, radars
+
+    def _distances(self, latitude: ArrayLike, longitude: ArrayLike) -> np.ndarray:
+        """(locations, pairs) distance from each radar, inf outside the bounding box"""
+
+        lat = np.asarray(latitude, dtype=np.float64).reshape(-1)
+        lon = np.asarray(longitude, dtype=np.float64).reshape(-1)
+        if lat.shape != lon.shape:
+            raise ValueError(
+                f"{lat.size} latitudes but {lon.size} longitudes were given"
+            )
+
+        distances = np.full((lat.size, len(self._latitudes)), np.inf)
+        points, radars = self._candidates(lat, lon)
+        distances[points, radars], _ = get_distance_bearing(
+            self._latitudes[radars], self._longitudes[radars], lat[points], lon[points]
+        )
+        pair_distances: np.ndarray = distances[:, self._radar_index]
+        return pair_distances
+
+    def covers(self, latitude: ArrayLike, longitude: ArrayLike) -> np.ndarray:
+        """Which pairs cover each location
+
+        Args:
+            latitude: Latitude of the location(s) (in ° decimal).
+            longitude: Longitude of the location(s) (in ° decimal).
+
+        Returns:
+            (np.ndarray): (locations, pairs) bool, the columns follow :attr:`keys`
+
+        Raises:
+            ValueError: If the latitudes and longitudes differ in length.
+        """
+
+        covered: np.ndarray = self._distances(latitude, longitude) <= self.ranges
+        return covered
+
+    def covering(self, latitude: float, longitude: float) -> List[CoverageKey]:
+        """The pairs that cover a location, best resolution first
+
+        Pairs of the same resolution are ordered nearest radar first.
+
+        Args:
+            latitude: Latitude of the location (in ° decimal).
+            longitude: Longitude of the location (in ° decimal).
+
+        Returns:
+            (list[tuple[BOMRadarLocationModel, RADAR_TYPE]]): The covering pairs
+        """
+
+        distances = self._distances(latitude, longitude)[0]
+        covered = np.flatnonzero(distances <= self.ranges)
+        order = np.lexsort((distances[covered], self.ranges[covered]))
+        return [self.keys[i] for i in covered[order].tolist()]
+
+    def covering_polygon(
+        self, latitude: ArrayLike, longitude: ArrayLike
+    ) -> List[CoverageKey]:
+        """The pairs that cover the whole of a polygon, best resolution first
+
+        The range of a radar is convex, so it covers the polygon if it
+        covers every vertex. Pairs of the same resolution are ordered by
+        the distance to the furthest vertex.
+
+        Args:
+            latitude: Latitude of each vertex (in ° decimal).
+            longitude: Longitude of each vertex (in ° decimal).
+
+        Returns:
+            (list[tuple[BOMRadarLocationModel, RADAR_TYPE]]): The covering pairs
+
+        Raises:
+            ValueError: If the latitudes and longitudes differ in length or there are no vertices.
+        """
+
+        distances = self._distances(latitude, longitude)
+        if not len(distances):
+            raise ValueError("A polygon needs at least one vertex")
+
+        furthest = distances.max(axis=0)
+        covered = np.flatnonzero(furthest <= self.ranges)
+        order = np.lexsort((furthest[covered], self.ranges[covered]))
+        return [self.keys[i] for i in covered[order].tolist()]
+
+    def best(self, latitude: ArrayLike, longitude: ArrayLike) -> np.ndarray:
+        """The pair with the best resolution at each location
+
+        Of the pairs covering a location, the one with the smallest range
+        wins, then the nearest radar.
+
+        Args:
+            latitude: Latitude of the location(s) (in ° decimal).
+            longitude: Longitude of the location(s) (in ° decimal).
+
+        Returns:
+            (np.ndarray): (locations,) int64 index into :attr:`keys`, -1 if no pair covers the location
+
+        Raises:
+            ValueError: If the latitudes and longitudes differ in length.
+        """
+
+        distances = self._distances(latitude, longitude)
+        covered = distances <= self.ranges
+        if not len(self.keys):
+            return np.full(len(distances), -1, dtype=np.int64)
+
+        # Of the covering pairs with the smallest range, the nearest radar
+        smallest = np.where(covered, self.ranges, np.inf).min(axis=1, keepdims=True)
+        candidates = covered & (self.ranges == smallest)
+        nearest = np.argmin(np.where(candidates, distances, np.inf), axis=1)
+        best: np.ndarray = np.where(covered.any(axis=1), nearest, -1).astype(np.int64)
+        return best
+
+
+__all__ = [
+    "BOMRadarCoverage",
+]
@@ -0,0 +1,419 @@
+import os
+import sys
+import weakref
+import threading
+import multiprocessing
+import numpy as np
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from aus_weather_data.exceptions import DecodeFrameError
+from aus_weather_data.radar.common.frame import BOMRadarFramePNG
+from aus_weather_data.radar.common.png import decode_png, read_png_header
+
+# (frame number, input offset, input length, output offset, height, width)
+_Task = Tuple[int, int, int, int, int, int]
+_Result = Tuple[int, Union[Tuple[np.ndarray, np.ndarray], DecodeFrameError]]
+
+
+def _attach(name: str) -> SharedMemory:
+    """Attach to a block created by the parent, which is responsible for unlinking it"""
+
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+
+    # Pool workers share the parent's resource tracker, which only holds
+    # one registration per block, so the parent's unlink clears it
+    return SharedMemory(name=name)
+
+
+def _buffer(shm: SharedMemory) -> memoryview:
+    buffer = shm.buf
+    if buffer is None:
+        raise ValueError(f"Shared memory {shm.name} is closed")
+    return buffer
+
+
+def _decode_tasks(
+    input_name: str, output_name: str, tasks: List[_Task]
+) -> List[_Result]:
+    """Decode frames from the input block into the output block (runs in a worker)"""
+
+    input_shm = _attach(input_name)
+    output_shm = _attach(output_name)
+    input_buffer = _buffer(input_shm)
+    output_buffer = _buffer(output_shm)
+    results: List[_Result] = []
+
+    try:
+        for number, in_offset, in_length, out_offset, height, width in tasks:
+            data = input_buffer[in_offset : in_offset + in_length]
+            out = np.ndarray(
+                (height, width),
+                dtype=np.uint8,
+                buffer=output_buffer,
+                offset=out_offset,
+            )
+            try:
+                _, palette, alpha = decode_png(data, out=out)
+                results.append((number, (palette, alpha)))
+            except DecodeFrameError as e:
+                # The traceback holds views of the blocks, which can't close while exported
+                results.append((number, e.with_traceback(None)))
+            finally:
+                del out
+                data.release()
+    finally:
+        input_shm.close()
+        output_shm.close()
+
+    return results
+
+
+class _SharedBlock(object):
+    """Shared memory block that stays mapped while arrays of it are alive
+
+    :meth:`SharedMemory.close` fails while arrays hold exports of the
+    block, so each array's export is tracked with :func:`weakref.finalize`
+    and the block is closed once the batch is closed and the last one is gone.
+    """
+
+    def __init__(self, shm: SharedMemory):
+        self.shm = shm
+        # Finalizers run wherever an array is freed, possibly in this thread
+        # while it holds the lock
+        self._lock = threading.RLock()
+        self._exports = 0
+        self._closed = False
+
+    def array(self, count: int, offset: int = 0) -> np.ndarray:
+        """uint8 array of `count` bytes of the block from `offset`"""
+
+        array: np.ndarray = np.frombuffer(
+            _buffer(self.shm), dtype=np.uint8, count=count, offset=offset
+        )
+
+        # frombuffer holds the export in a memoryview at the bottom of the
+        # array's bases, which is released before its finalizer runs
+        export = array.base
+        if not isinstance(export, memoryview):
+            copied: np.ndarray = array.copy()
+            return copied
+
+        with self._lock:
+            self._exports += 1
+        finalizer = weakref.finalize(export, self._release)
+        finalizer.atexit = False
+        return array
+
+    def _release(self):
+        with self._lock:
+            self._exports -= 1
+            ready = self._closed and not self._exports
+        if ready:
+            self.shm.close()
+
+    def close(self):
+        """Unlink the block, and unmap it once no arrays of it are left"""
+
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            ready = not self._exports
+
+        self.shm.unlink()
+        if ready:
+            self.shm.close()
+
+
+class BOMRadarDecodedBatch(object):
+    """Palette indices of a batch of frames, held in shared memory
+
+    The indices of every frame are packed into one
+    :class:`multiprocessing.shared_memory.SharedMemory` block that the
+    worker processes decode into, so the pixels are never pickled. The
+    arrays returned by the batch are views of that block: copy any that
+    need to outlive the batch, then :meth:`close` it (or use it as a
+    context manager) to free the memory. Arrays still referenced when
+    the batch is closed keep the whole block mapped until they are freed.
+
+    A frame that can't be decoded doesn't abort the batch, it is
+    recorded in :attr:`failures`.
+
+    Attributes:
+        frames: The frames of the batch, in request order.
+        failures: Frame number to the error for the frames that couldn't be decoded.
+    """
+
+    def __init__(
+        self,
+        frames: List[BOMRadarFramePNG],
+        shm: SharedMemory,
+        layout: List[Optional[Tuple[int, int, int]]],
+    ):
+        """Initialise the batch
+
+        Args:
+            frames: The frames of the batch.
+            shm: Shared memory block holding the decoded indices.
+            layout: (offset, height, width) of each frame in the block, None if it has no space.
+        """
+
+        self.frames = frames
+        self.failures: Dict[int, DecodeFrameError] = {}
+
+        self._block: Optional[_SharedBlock] = _SharedBlock(shm)
+        self._layout = layout
+        self._palettes: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def __str__(self) -> str:
+        return f"BOMRadarDecodedBatch<frames={len(self.frames)}, failures={len(self.failures)}>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __getitem__(self, number: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(indices, palette, alpha) of a frame, as returned by :func:`decode_png`
+
+        Raises:
+            DecodeFrameError: If the frame couldn't be decoded.
+        """
+
+        if number in self.failures:
+            raise self.failures[number]
+
+        offset, height, width = self._frame_layout(number)
+        indices = self._open_block.array(height * width, offset).reshape(height, width)
+        palette, alpha = self._palettes[number]
+        return indices, palette, alpha
+
+    @property
+    def ok(self) -> bool:
+        """True if every frame was decoded."""
+
+        return not self.failures
+
+    @property
+    def _open_block(self) -> _SharedBlock:
+        if self._block is None:
+            raise ValueError("The batch is closed")
+        return self._block
+
+    def _frame_layout(self, number: int) -> Tuple[int, int, int]:
+        layout = self._layout[number]
+        if layout is None:
+            raise IndexError(number)
+        return layout
+
+    def stack(self) -> np.ndarray:
+        """Indices of every frame as one (frames, height, width) array
+
+        The frames are contiguous in the block, so this is a view
+        rather than a copy.
+
+        Raises:
+            ValueError: If the frames differ in size or any failed to decode.
+        """
+
+        if self.failures:
+            raise ValueError(f"{len(self.failures)} frames couldn't be decoded")
+
+        shapes = {layout[1:] for layout in self._layout if layout is not None}
+        if len(shapes) > 1:
+            raise ValueError(f"Frames differ in size: {sorted(shapes)}")
+
+        height, width = shapes.pop() if shapes else (0, 0)
+        stack: np.ndarray = self._open_block.array(
+            len(self.frames) * height * width
+        ).reshape(len(self.frames), height, width)
+        return stack
+
+    def close(self):
+        """Free the shared memory
+
+        The block is unlinked straight away. It is unmapped now, or once
+        the last array from the batch is freed if any are referenced.
+        """
+
+        if self._block is None:
+            return
+
+        block, self._block = self._block, None
+        block.close()
+
+
+class BOMRadarBatchDecoder(object):
+    """Decodes batches of frame PNGs across worker processes
+
+    Inflating and unfiltering a PNG is CPU bound and holds the GIL, so
+    decoding in the download threads doesn't scale with cores. The
+    decoder copies the PNGs of a batch into one shared memory block,
+    reads each frame's size from its header so the output block can be
+    laid out up front, and has a :class:`ProcessPoolExecutor` decode
+    chunks of frames straight into the output block. Only the offsets
+    and the small palettes cross the process boundary.
+
+    Attributes:
+        max_workers: Number of worker processes.
+    """
+
+    def __init__(
+        self, max_workers: Optional[int] = None, executor: Optional[Executor] = None
+    ):
+        """Initialise the decoder
+
+        Args:
+            max_workers (optional): Number of worker processes. Defaults to None for the number of CPUs.
+            executor (optional): Executor to run the workers on instead of a new :class:`ProcessPoolExecutor`. It isn't shut down by :meth:`close`.
+        """
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __str__(self) -> str:
+        return f"BOMRadarBatchDecoder<max_workers={self.max_workers}>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def executor(self) -> Executor:
+        """The executor the workers run on, started on first use.
+
+        The worker processes are started with the ``forkserver`` method, or
+        ``spawn`` where it isn't available, never forked from a process
+        that may be running other threads.
+        """
+
+        if self._executor is None:
+            # Started from the pipeline's decode thread while the download
+            # threads run, so the workers mustn't be forked from this process
+            methods = multiprocessing.get_all_start_methods()
+            method = "forkserver" if "forkserver" in methods else "spawn"
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(method),
+            )
+        return self._executor
+
+    def decode(
+        self, frames: Sequence[BOMRadarFramePNG], chunk_size: Optional[int] = None
+    ) -> BOMRadarDecodedBatch:
+        """Decode a batch of frames
+
+        Args:
+            frames: The frames, with PNG data loaded.
+            chunk_size (optional): Frames per worker task. Defaults to None to give each worker about 4 tasks.
+
+        Returns:
+            The decoded batch, which holds shared memory until it is closed.
+        """
+
+        frames = list(frames)
+        datas = [frame.png_data for frame in frames]
+
+        layout: List[Optional[Tuple[int, int, int]]] = []
+        failures: Dict[int, DecodeFrameError] = {}
+        tasks: List[_Task] = []
+        in_offset = 0
+        out_offset = 0
+
+        for number, data in enumerate(datas):
+            try:
+                header = read_png_header(data)
+                if header.colour_type != 3 or header.interlace:
+                    raise DecodeFrameError(
+                        f"Only non-interlaced palette PNGs are supported, got {header}"
+                    )
+            except DecodeFrameError as e:
+                failures[number] = e
+                layout.append(None)
+                continue
+
+            layout.append((out_offset, header.height, header.width))
+            tasks.append(
+                (
+                    number,
+                    in_offset,
+                    len(data),
+                    out_offset,
+                    header.height,
+                    header.width,
+                )
+            )
+            in_offset += len(data)
+            out_offset += header.height * header.width
+
+        # A block can't be empty
+        input_shm = SharedMemory(create=True, size=max(in_offset, 1))
+        output_shm = SharedMemory(create=True, size=max(out_offset, 1))
+        batch = BOMRadarDecodedBatch(frames, output_shm, layout)
+        batch.failures.update(failures)
+
+        try:
+            input_buffer = _buffer(input_shm)
+            for task in tasks:
+                number, offset, length = task[:3]
+                input_buffer[offset : offset + length] = datas[number]
+
+            if chunk_size is None:
+                chunk_size = max(1, -(-len(tasks) // (self.max_workers * 4)))
+
+            futures = [
+                self.executor.submit(
+                    _decode_tasks,
+                    input_shm.name,
+                    output_shm.name,
+                    tasks[i : i + chunk_size],
+                )
+                for i in range(0, len(tasks), chunk_size)
+            ]
+
+            for future in futures:
+                for number, result in future.result():
+                    if isinstance(result, DecodeFrameError):
+                        batch.failures[number] = result
+                    else:
+                        batch._palettes[number] = result
+
+        except BaseException:
+            batch.close()
+            raise
+
+        finally:
+            input_shm.close()
+            input_shm.unlink()
+
+        return batch
+
+    def close(self):
+        """Shut down the worker processes, if the decoder started them"""
+
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+__all__ = [
+    "BOMRadarBatchDecoder",
+    "BOMRadarDecodedBatch",
+]
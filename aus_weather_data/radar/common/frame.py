@@ -1,17 +1,49 @@
 import os
 import pytz
 import datetime
+import numpy as np
 
-from typing import Optional, Union
+from typing import Dict, Optional, Tuple, Type, TypeVar, Union
 
-from aus_weather_data.radar.common.utils import split_filename
+from aus_weather_data.radar.common.utils import (
+    parse_filename,
+    epoch_minute_to_datetime,
+)
 from aus_weather_data.radar.common.location import (
-    BOMRadarLocation,
     BOMRadarLocationModel,
+    IDR_INDEX_MAP,
+    IDR_LOCATIONS,
+)
+from aus_weather_data.radar.common.types import RADAR_TYPE, RADAR_TYPE_MAP
+from aus_weather_data.radar.common.png import decode_png
+from aus_weather_data.radar.common.legend import (
+    BOMRadarLegend,
+    get_radar_type_legend,
 )
-from aus_weather_data.radar.common.types import RADAR_TYPE
 from aus_weather_data.exceptions import ParseFrameError
 
+_FrameT = TypeVar("_FrameT", bound="__BOMRadarFrameBase")
+
+# Shared zero padded strings so memoized date parts don't allocate per frame
+_TWO_DIGITS: Tuple[str, ...] = tuple(f"{x:02d}" for x in range(60))
+_FOUR_DIGITS: Dict[int, str] = {}
+
+
+def _datetime_parts(dt: datetime.datetime) -> Tuple[str, str, str, str, str]:
+    """Zero padded (year, month, day, hour, minute) strings for a datetime"""
+
+    year = _FOUR_DIGITS.get(dt.year)
+    if year is None:
+        year = _FOUR_DIGITS.setdefault(dt.year, f"{dt.year:04d}")
+
+    return (
+        year,
+        _TWO_DIGITS[dt.month],
+        _TWO_DIGITS[dt.day],
+        _TWO_DIGITS[dt.hour],
+        _TWO_DIGITS[dt.minute],
+    )
+
 
 class __BOMRadarFrameBase(object):
     """Radar Frame object for data from BOM.
@@ -28,15 +60,41 @@ class __BOMRadarFrameBase(object):
     Locale dependent function will return according to the locale if
     set in locale_tz. If locale_tz is not set, defaults to UTC locale.
 
+    Only the radar index, radar type code and minutes since epoch are
+    stored for each frame. The filename, datetimes and date strings are
+    derived on first access and memoized.
+
     Attributes:
         locale_tz: Timezone for locale functions.
         start_time: Start time of the frame. Auto populates from the date time extracted from the filename.
         end_time: End time of the frame - generally start_time of the next frame in a sequence.
     """
 
-    locale_tz: Optional[pytz.BaseTzInfo]
-    start_time: datetime.datetime
+    __slots__ = (
+        "_radar_index",
+        "_type_code",
+        "_epoch_minute",
+        "_locale_tz",
+        "_start_time",
+        "end_time",
+        "_filename",
+        "_dt_utc",
+        "_dt_locale",
+        "_utc_parts",
+        "_locale_parts",
+    )
+
+    _radar_index: int
+    _type_code: str
+    _epoch_minute: int
+    _locale_tz: Optional[pytz.BaseTzInfo]
+    _start_time: Optional[datetime.datetime]
     end_time: datetime.datetime
+    _filename: Optional[str]
+    _dt_utc: Optional[datetime.datetime]
+    _dt_locale: Optional[datetime.datetime]
+    _utc_parts: Optional[Tuple[str, str, str, str, str]]
+    _locale_parts: Optional[Tuple[str, str, str, str, str]]
 
     def __init__(
         self,
@@ -52,158 +110,264 @@ class __BOMRadarFrameBase(object):
             locale_tz (optional): :class:`pytz.timezone` object passed for localizing datetime object.
         """
 
-        self._filename: str = filename
-        self._metadata: dict = split_filename(self._filename)
-        self.start_time = self._metadata["dt"]
-        self.locale_tz = locale_tz
-
         try:
-            getattr(BOMRadarLocation, self.radar_id_str)
-        except AttributeError:
+            idr, idr_type, epoch_minute = parse_filename(filename)
+        except ValueError:
+            raise ParseFrameError(
+                f"Could not parse {filename} (Couldn't match filename format)"
+            )
+
+        radar_index = IDR_INDEX_MAP.get(idr)
+        if radar_index is None:
             raise ParseFrameError(
                 f"Could not parse {filename} (Couldn't match location)"
             )
 
-        try:
-            RADAR_TYPE(self.radar_type_str)
-        except ValueError:
+        if idr_type not in RADAR_TYPE_MAP:
             raise ParseFrameError(
                 f"Could not parse {filename} (Couldn't match Radar Type)"
             )
 
+        self._set_components(radar_index, idr_type, epoch_minute, locale_tz)
+
+    @classmethod
+    def from_components(
+        cls: Type[_FrameT],
+        radar_index: int,
+        type_code: str,
+        epoch_minute: int,
+        locale_tz: Optional[pytz.BaseTzInfo] = None,
+    ) -> _FrameT:
+        """Create a frame from its compact components without parsing a filename
+
+        Args:
+            radar_index: Index of the radar location in :data:`IDR_LOCATIONS`.
+            type_code: Radar type code. EG. :literal:`3` for 128km Reflectivity.
+            epoch_minute: Minutes since epoch for the start of the frame.
+            locale_tz (optional): :class:`pytz.timezone` object passed for localizing datetime object.
+        """
+
+        frame = cls.__new__(cls)
+        frame._set_components(radar_index, type_code, epoch_minute, locale_tz)
+        return frame
+
+    def _set_components(
+        self,
+        radar_index: int,
+        type_code: str,
+        epoch_minute: int,
+        locale_tz: Optional[pytz.BaseTzInfo],
+    ):
+        """Set the stored fields and reset the memoized ones"""
+
+        self._radar_index = radar_index
+        self._type_code = type_code
+        self._epoch_minute = epoch_minute
+        self._locale_tz = locale_tz
+        self._start_time = None
+        self._filename = None
+        self._dt_utc = None
+        self._dt_locale = None
+        self._utc_parts = None
+        self._locale_parts = None
+
     def __str__(self):
-        return f"BOMRadarFrame<filename={self._filename}>"
+        return f"BOMRadarFrame<filename={self.filename}>"
 
     def __repr__(self):
         return self.__str__()
 
+    @property
+    def locale_tz(self) -> Optional[pytz.BaseTzInfo]:
+        """Timezone for locale functions."""
+
+        return self._locale_tz
+
+    @locale_tz.setter
+    def locale_tz(self, locale_tz: Optional[pytz.BaseTzInfo]):
+        self._locale_tz = locale_tz
+        self._dt_locale = None
+        self._locale_parts = None
+
+    @property
+    def start_time(self) -> datetime.datetime:
+        """Start time of the frame. Defaults to :attr:`dt_utc` unless set."""
+
+        if self._start_time is None:
+            return self.dt_utc
+        return self._start_time
+
+    @start_time.setter
+    def start_time(self, start_time: datetime.datetime):
+        self._start_time = start_time
+
+    @property
+    def radar_index(self) -> int:
+        """Index of the radar location in :data:`IDR_LOCATIONS`."""
+
+        return self._radar_index
+
+    @property
+    def epoch_minute(self) -> int:
+        """Minutes since epoch for the start of the frame."""
+
+        return self._epoch_minute
+
     @property
     def radar_id_str(self) -> str:
         """IDR extracted from the filename. EG. :literal:`IDR02` for Melbourne"""
 
-        return str(self._metadata["idr"])
+        return IDR_LOCATIONS[self._radar_index].base
 
     @property
     def radar_id(self) -> BOMRadarLocationModel:
         """Returns the radar ID as a :class:`BOMRadarLocation` object"""
 
-        return getattr(BOMRadarLocation, self.radar_id_str)  # type: ignore[no-any-return]
+        return IDR_LOCATIONS[self._radar_index]
 
     @property
     def radar_type_str(self) -> str:
         """IDR type extracted from the filename. EG. :literal:`3` for 128km Reflectivity"""
 
-        return str(self._metadata["idrType"])
+        return self._type_code
 
     @property
     def radar_type(self) -> RADAR_TYPE:
         """Returns the radar type as a :class:`RADAR_TYPE` object"""
 
-        return RADAR_TYPE(self.radar_type_str)
+        return RADAR_TYPE_MAP[self._type_code]
 
     @property
     def radar_base_str(self) -> str:
         """Base extracted from the filename. EG. :literal:`IDR023` for Melbourne 128km Reflectivity"""
 
-        return str(self._metadata["base"])
+        return f"{self.radar_id_str}{self._type_code}"
 
     @property
     def epoch_time(self) -> float:
         """Seconds since epoch for the start of the frame."""
 
-        return self.dt_utc.timestamp()
+        return float(self._epoch_minute * 60)
 
     @property
     def dt_utc(self) -> datetime.datetime:
         """Datetime object that is timezone aware for UTC locale."""
-        return self._metadata["dt"]  # type: ignore[no-any-return]
+
+        if self._dt_utc is None:
+            self._dt_utc = epoch_minute_to_datetime(self._epoch_minute)
+        return self._dt_utc
 
     @property
     def dt_locale(self) -> datetime.datetime:
         """Datetime object that is timezone aware for `locale_tz` locale. If locale_tz is None (default), then uses UTC locale."""
 
-        if self.locale_tz:
-            return self.dt_utc.astimezone(self.locale_tz)
-        else:
+        if not self._locale_tz:
             return self.dt_utc
 
+        if self._dt_locale is None:
+            self._dt_locale = self.dt_utc.astimezone(self._locale_tz)
+        return self._dt_locale
+
+    def _get_utc_parts(self) -> Tuple[str, str, str, str, str]:
+        """Memoized (year, month, day, hour, minute) strings in UTC"""
+
+        if self._utc_parts is None:
+            self._utc_parts = _datetime_parts(self.dt_utc)
+        return self._utc_parts
+
+    def _get_locale_parts(self) -> Tuple[str, str, str, str, str]:
+        """Memoized (year, month, day, hour, minute) strings in locale"""
+
+        if not self._locale_tz:
+            return self._get_utc_parts()
+
+        if self._locale_parts is None:
+            self._locale_parts = _datetime_parts(self.dt_locale)
+        return self._locale_parts
+
     @property
     def year_utc(self) -> str:
         """Year in UTC timezone (YYYY)."""
-        return str(self._metadata["year"])
+        return self._get_utc_parts()[0]
 
     @property
     def year_locale(self) -> str:
         """Year in locale timezone (YYYY)."""
 
-        return self.dt_locale.strftime("%Y")
+        return self._get_locale_parts()[0]
 
     @property
     def month_utc(self) -> str:
         """Month in UTC timezone (MM)."""
-        return str(self._metadata["month"])
+        return self._get_utc_parts()[1]
 
     @property
     def month_locale(self) -> str:
         """Month in locale timezone (MM)."""
 
-        return self.dt_locale.strftime("%m")
+        return self._get_locale_parts()[1]
 
     @property
     def day_utc(self) -> str:
         """Day in UTC timezone (DD)."""
-        return str(self._metadata["day"])
+        return self._get_utc_parts()[2]
 
     @property
     def day_locale(self) -> str:
         """Day in locale timezone (DD)."""
 
-        return self.dt_locale.strftime("%d")
+        return self._get_locale_parts()[2]
 
     @property
     def hour_utc(self) -> str:
         """Hour in UTC timezone (HH)."""
-        return str(self._metadata["hour"])
+        return self._get_utc_parts()[3]
 
     @property
     def hour_locale(self) -> str:
         """Hour in locale timezone (HH)."""
 
-        return self.dt_locale.strftime("%H")
+        return self._get_locale_parts()[3]
 
     @property
     def minute_utc(self) -> str:
         """Minute in UTC timezone (MM)."""
-        return str(self._metadata["minute"])
+        return self._get_utc_parts()[4]
 
     @property
     def minute_locale(self) -> str:
         """Minute in locale timezone (MM)."""
 
-        return self.dt_locale.strftime("%M")
+        return self._get_locale_parts()[4]
 
     @property
     def date_utc(self) -> str:
         """UTC date string (YYYY-MM-DD)."""
-        return str(self._metadata["date"])
+
+        year, month, day, _, _ = self._get_utc_parts()
+        return f"{year}-{month}-{day}"
 
     @property
     def date_locale(self) -> str:
         """Locale date string (YYYY-MM-DD)"""
-        return self.dt_locale.strftime("%Y-%m-%d")
+
+        year, month, day, _, _ = self._get_locale_parts()
+        return f"{year}-{month}-{day}"
 
     @property
     def nice_date_utc(self) -> str:
         """UTC date string fit for human consumption"""
 
-        return self.dt_utc.strftime("%Y-%m-%d %H:%M UTC")
+        year, month, day, hour, minute = self._get_utc_parts()
+        return f"{year}-{month}-{day} {hour}:{minute} UTC"
 
     @property
     def nice_date_locale(self) -> str:
         """Locale date string fit for human consumption"""
 
-        if self.locale_tz:
-            return self.dt_locale.strftime(f"%Y-%m-%d %H:%M {self.locale_tz.zone}")
+        if self._locale_tz:
+            year, month, day, hour, minute = self._get_locale_parts()
+            return f"{year}-{month}-{day} {hour}:{minute} {self._locale_tz.zone}"
         else:
             return self.nice_date_utc
 
@@ -211,6 +375,11 @@ class __BOMRadarFrameBase(object):
     def filename(self) -> str:
         """Filename of the frame"""
 
+        if self._filename is None:
+            year, month, day, hour, minute = self._get_utc_parts()
+            self._filename = (
+                f"{self.radar_base_str}.T.{year}{month}{day}{hour}{minute}.png"
+            )
         return self._filename
 
 
@@ -224,7 +393,7 @@ class BOMRadarFrameMetadata(__BOMRadarFrameBase):
 
     """
 
-    pass
+    __slots__ = ()
 
 
 class BOMRadarFramePNG(__BOMRadarFrameBase):
@@ -237,18 +406,45 @@ class BOMRadarFramePNG(__BOMRadarFrameBase):
 
     """
 
-    _png_data: Union[bytes, None]
+    __slots__ = ("_png_data",)
+
+    _png_data: Union[bytes, memoryview, None]
+
+    def _set_components(
+        self,
+        radar_index: int,
+        type_code: str,
+        epoch_minute: int,
+        locale_tz: Optional[pytz.BaseTzInfo],
+    ):
+        super()._set_components(radar_index, type_code, epoch_minute, locale_tz)
+        self._png_data = None
 
-    def load_png_data(self, data: bytes):
+    def load_png_data(self, data: Union[bytes, memoryview]):
         """Load PNG data from a byte string
 
+        A :class:`memoryview` is held as is without copying, see :meth:`detach`.
+
         Args:
-            data: PNG data as a byte string
+            data: PNG data as a byte string or a view of a buffer
 
         """
 
         self._png_data = data
 
+    def detach(self):
+        """Copy PNG data held as a :class:`memoryview` into its own byte string
+
+        Frames downloaded with ``reuse_buffer=True`` (see
+        :meth:`BOMFTPConn.get_file`) hold a view of the connection's
+        download buffer. Call this to keep the data independent of that
+        buffer, EG. before storing the frame for later. Does nothing if
+        the data is already a byte string.
+        """
+
+        if isinstance(self._png_data, memoryview):
+            self._png_data = self._png_data.tobytes()
+
     def load_png_from_file(self, path: str):
         """Load PNG data from a file
 
@@ -275,11 +471,11 @@ class BOMRadarFramePNG(__BOMRadarFrameBase):
             f.write(self._png_data)
 
     @property
-    def png_data(self) -> bytes:
+    def png_data(self) -> Union[bytes, memoryview]:
         """Get the PNG data
 
         Returns:
-            (bytes): PNG data as a byte string
+            (bytes): PNG data as a byte string, or a :class:`memoryview` if the frame isn't detached
 
         """
         if self._png_data is None:
@@ -293,13 +489,106 @@ class BOMRadarFrameData(BOMRadarFramePNG):
     This is a class to hold metadata and radar data in a binary format.
     See documentation for the functions in this class.
 
-    It extends :class:`BOMRadarFramePNG`.
-
-    (Current wip)
+    It extends :class:`BOMRadarFramePNG`, decoding the PNG into a
+    ``uint8`` array of palette indices with :func:`decode_png` (only
+    :mod:`zlib` and NumPy, no Pillow). The data is decoded the first
+    time one of :attr:`palette_indices`, :attr:`palette` or
+    :attr:`alpha` is read, and again after new PNG data is loaded.
 
     """
 
-    pass
+    __slots__ = ("_decoded",)
+
+    _decoded: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]
+
+    def _set_components(
+        self,
+        radar_index: int,
+        type_code: str,
+        epoch_minute: int,
+        locale_tz: Optional[pytz.BaseTzInfo],
+    ):
+        super()._set_components(radar_index, type_code, epoch_minute, locale_tz)
+        self._decoded = None
+
+    def load_png_data(self, data: Union[bytes, memoryview]):
+        super().load_png_data(data)
+        self._decoded = None
+
+    def load_png_from_file(self, path: str):
+        super().load_png_from_file(path)
+        self._decoded = None
+
+    def decode(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Decode the PNG data into palette indices
+
+        The result is kept for :attr:`palette_indices` and :meth:`values`,
+        unless it was decoded into `out`, which the caller may reuse.
+
+        Args:
+            out (optional): uint8 array of shape (height, width) to decode into.
+
+        Returns:
+            (np.ndarray): uint8 palette index of each pixel, shape (height, width)
+
+        Raises:
+            ValueError: If no PNG data is loaded.
+            DecodeFrameError: If the PNG data can't be decoded.
+        """
+
+        if out is not None:
+            indices: np.ndarray = decode_png(self.png_data, out=out)[0]
+            return indices
+
+        self._decoded = decode_png(self.png_data)
+        return self._decoded[0]
+
+    def _get_decoded(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._decoded is None:
+            self._decoded = decode_png(self.png_data)
+        return self._decoded
+
+    @property
+    def palette_indices(self) -> np.ndarray:
+        """uint8 palette index of each pixel, shape (height, width)."""
+
+        return self._get_decoded()[0]
+
+    @property
+    def palette(self) -> np.ndarray:
+        """(N, 3) uint8 RGB colours of the PNG palette (PLTE)."""
+
+        return self._get_decoded()[1]
+
+    @property
+    def alpha(self) -> np.ndarray:
+        """(N,) uint8 alpha of each palette entry, 0 for transparent (tRNS)."""
+
+        return self._get_decoded()[2]
+
+    def values(
+        self,
+        legend: Optional[BOMRadarLegend] = None,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Convert the frame to physical values
+
+        Args:
+            legend (optional): Legend to convert with. Defaults to None for the legend of the radar type (see :data:`RADAR_TYPE_LEGEND`).
+            out (optional): float32 array of shape (height, width) to write into.
+
+        Returns:
+            (np.ndarray): float32 value of each pixel, NaN where there is no data
+
+        Raises:
+            ValueError: If no legend is given and the radar type has no default legend.
+        """
+
+        if legend is None:
+            legend = get_radar_type_legend(self.radar_type)
+
+        indices, palette, alpha = self._get_decoded()
+        return legend.convert(indices, palette, alpha, out=out)
 
 
 __all__ = [
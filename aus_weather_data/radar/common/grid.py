@@ -0,0 +1,186 @@
+import os
+import numpy as np
+
+from loguru import logger
+from numpy.typing import ArrayLike
+from typing import Optional, Tuple
+
+from aus_weather_data.radar.common.utils import (
+    create_temp_file,
+    get_distance_bearing,
+    get_translation_coordinates,
+)
+
+IMAGE_SIZE = 512
+"""Width and height (in pixels) of a BOM radar image"""
+
+GRID_CACHE_ENV = "AUS_WEATHER_DATA_CACHE"
+"""Environment variable overriding the directory pixel grids are cached in"""
+
+_GRID_VERSION = 1
+
+
+def get_cache_dir() -> str:
+    """Directory pixel grids are cached in
+
+    Returns:
+        ``$AUS_WEATHER_DATA_CACHE`` if set, else ``~/.cache/aus_weather_data``.
+    """
+
+    return os.environ.get(GRID_CACHE_ENV) or os.path.join(
+        os.path.expanduser("~"), ".cache", "aus_weather_data"
+    )
+
+
+def pixels_to_coordinates(
+    latitude: float,
+    longitude: float,
+    range_km: float,
+    rows: ArrayLike,
+    cols: ArrayLike,
+    size: int = IMAGE_SIZE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Latitude and longitude of the centre of pixels of a radar image
+
+    The image is taken as an azimuthal equidistant projection centred on
+    the radar: the distance and bearing of a pixel from the centre of
+    the image are its distance and bearing from the radar. The rows and
+    columns broadcast against each other.
+
+    Args:
+        latitude: Latitude of the radar (in ° decimal).
+        longitude: Longitude of the radar (in ° decimal).
+        range_km: Range (in kms) from the radar to the edge of the image.
+        rows: Row of each pixel, row 0 is the north edge.
+        cols: Column of each pixel, column 0 is the west edge.
+        size: Width and height of the image in pixels. Defaults to 512.
+
+    Returns:
+        (latitude, longitude) float64 arrays
+    """
+
+    scale = 2.0 * range_km / size
+    east = (np.asarray(cols) + 0.5) * scale - range_km
+    north = range_km - (np.asarray(rows) + 0.5) * scale
+
+    distances = np.hypot(east, north)
+    bearings = np.degrees(np.arctan2(east, north))
+    return get_translation_coordinates(latitude, longitude, distances, bearings)
+
+
+def coordinates_to_pixels(
+    latitude: float,
+    longitude: float,
+    range_km: float,
+    to_latitude: ArrayLike,
+    to_longitude: ArrayLike,
+    size: int = IMAGE_SIZE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Pixels of a radar image that locations fall in
+
+    The inverse of :func:`pixels_to_coordinates`, in closed form: the
+    distance and bearing of each location from the radar give its offset
+    from the centre of the image.
+
+    Args:
+        latitude: Latitude of the radar (in ° decimal).
+        longitude: Longitude of the radar (in ° decimal).
+        range_km: Range (in kms) from the radar to the edge of the image.
+        to_latitude: Latitude of the location(s) (in ° decimal).
+        to_longitude: Longitude of the location(s) (in ° decimal).
+        size: Width and height of the image in pixels. Defaults to 512.
+
+    Returns:
+        (rows, cols) int64 arrays, both -1 for locations outside the image
+    """
+
+    distances, bearings = get_distance_bearing(
+        latitude, longitude, to_latitude, to_longitude
+    )
+    bearings = np.radians(bearings)
+    scale = size / (2.0 * range_km)
+    cols = np.floor((distances * np.sin(bearings) + range_km) * scale)
+    rows = np.floor((range_km - distances * np.cos(bearings)) * scale)
+
+    outside = (rows < 0) | (rows >= size) | (cols < 0) | (cols >= size)
+    rows = np.where(outside, -1, rows).astype(np.int64)
+    cols = np.where(outside, -1, cols).astype(np.int64)
+    return rows, cols
+
+
+def compute_pixel_grid(
+    latitude: float, longitude: float, range_km: float, size: int = IMAGE_SIZE
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Latitude and longitude of the centre of every pixel of a radar image
+
+    See :func:`pixels_to_coordinates` for the projection.
+
+    Args:
+        latitude: Latitude of the radar (in ° decimal).
+        longitude: Longitude of the radar (in ° decimal).
+        range_km: Range (in kms) from the radar to the edge of the image.
+        size: Width and height of the image in pixels. Defaults to 512.
+
+    Returns:
+        (latitude, longitude) (size, size) float64 arrays, row 0 is the north edge
+    """
+
+    pixels = np.arange(size)
+    return pixels_to_coordinates(
+        latitude, longitude, range_km, pixels[:, None], pixels[None, :], size
+    )
+
+
+def _cache_path(cache_dir: str, key: str, size: int) -> str:
+    return os.path.join(cache_dir, f"grid-v{_GRID_VERSION}-{key}-{size}.npy")
+
+
+def load_pixel_grid(
+    cache_dir: str, key: str, size: int
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Load a cached pixel grid, memory mapped read-only
+
+    Returns:
+        (latitude, longitude) arrays, or None if the grid isn't cached.
+    """
+
+    try:
+        grid = np.load(_cache_path(cache_dir, key, size), mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+    if grid.shape != (2, size, size):
+        return None
+    return grid[0], grid[1]
+
+
+def save_pixel_grid(
+    cache_dir: str, key: str, size: int, grid: Tuple[np.ndarray, np.ndarray]
+):
+    """Save a pixel grid to the cache, logging rather than raising if it can't be written"""
+
+    path = _cache_path(cache_dir, key, size)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_path = create_temp_file(cache_dir, os.path.basename(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.stack(grid))
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError as e:
+        logger.warning(f"Couldn't cache pixel grid in {cache_dir}: {e}")
+
+
+__all__ = [
+    "GRID_CACHE_ENV",
+    "IMAGE_SIZE",
+    "compute_pixel_grid",
+    "coordinates_to_pixels",
+    "get_cache_dir",
+    "load_pixel_grid",
+    "pixels_to_coordinates",
+    "save_pixel_grid",
+]
@@ -0,0 +1,287 @@
+import bisect
+import datetime
+import numpy as np
+
+from pytz import BaseTzInfo
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from aus_weather_data.radar.common.catalog import (
+    BOMRadarCatalog,
+    pack_frame_key,
+    unpack_frame_key,
+)
+from aus_weather_data.radar.common.frame import BOMRadarFrameMetadata, BOMRadarFramePNG
+from aus_weather_data.radar.common.location import (
+    BOMRadarLocationModel,
+    IDR_INDEX_MAP,
+    IDR_LOCATIONS,
+)
+from aus_weather_data.radar.common.types import RADAR_TYPE, RADAR_TYPE_MAP
+from aus_weather_data.radar.common.utils import datetime_to_epoch_minute
+
+IndexKey = Tuple[BOMRadarLocationModel, RADAR_TYPE]
+Frame = Union[BOMRadarFrameMetadata, BOMRadarFramePNG]
+
+
+class BOMRadarFrameIndex(object):
+    """Sorted time index of radar frames
+
+    Keeps a sorted list of frame times (minutes since epoch) for each
+    (:class:`BOMRadarLocationModel`, :class:`RADAR_TYPE`) pair, so time
+    window queries are a bisect plus the frames returned rather than a
+    scan over every frame.
+
+    Attributes:
+        locale_tz: Timezone passed to frames returned from this index.
+    """
+
+    def __init__(self, locale_tz: Optional[BaseTzInfo] = None):
+        """Initialise an empty index
+
+        Args:
+            locale_tz (optional): :class:`pytz.timezone` object passed to the frames.
+        """
+
+        self._times: Dict[IndexKey, List[int]] = {}
+        self.locale_tz = locale_tz
+
+    @classmethod
+    def from_catalog(
+        cls, catalog: BOMRadarCatalog, locale_tz: Optional[BaseTzInfo] = None
+    ) -> "BOMRadarFrameIndex":
+        """Build an index from a :class:`BOMRadarCatalog`
+
+        Args:
+            catalog: Catalog to index.
+            locale_tz (optional): :class:`pytz.timezone` object passed to the frames.
+                Defaults to the timezone of the catalog.
+
+        Returns:
+            Index of the frames in the catalog.
+        """
+
+        index = cls(locale_tz=locale_tz or catalog.locale_tz)
+
+        # Sort by (radar, type) then time, drop duplicates and split per pair
+        keys = np.unique(catalog.keys)
+        if not len(keys):
+            return index
+
+        radars, codes, minutes = unpack_frame_key(keys)
+        order = np.lexsort((minutes, codes, radars))
+        radars, codes, minutes = radars[order], codes[order], minutes[order]
+        starts = np.flatnonzero(
+            (np.diff(radars, prepend=-1) != 0) | (np.diff(codes, prepend=-1) != 0)
+        )
+        ends = np.append(starts[1:], len(keys))
+
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            key = (IDR_LOCATIONS[radars[start]], RADAR_TYPE_MAP[chr(codes[start])])
+            index._times[key] = minutes[start:end].tolist()
+
+        return index
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Iterable[Frame],
+        locale_tz: Optional[BaseTzInfo] = None,
+    ) -> "BOMRadarFrameIndex":
+        """Build an index from radar frames
+
+        Args:
+            frames: Frames to index.
+            locale_tz (optional): :class:`pytz.timezone` object passed to the frames.
+
+        Returns:
+            Index of the frames.
+        """
+
+        index = cls(locale_tz=locale_tz)
+        for frame in frames:
+            index._times.setdefault((frame.radar_id, frame.radar_type), []).append(
+                frame.epoch_minute
+            )
+
+        for key, times in index._times.items():
+            index._times[key] = sorted(set(times))
+
+        return index
+
+    def __len__(self) -> int:
+        return sum(len(times) for times in self._times.values())
+
+    def __contains__(self, frame: object) -> bool:
+        if not isinstance(frame, (BOMRadarFrameMetadata, BOMRadarFramePNG)):
+            return False
+
+        times = self._times.get((frame.radar_id, frame.radar_type), [])
+        position = bisect.bisect_left(times, frame.epoch_minute)
+        return position < len(times) and times[position] == frame.epoch_minute
+
+    def __str__(self) -> str:
+        return f"BOMRadarFrameIndex<frames={len(self)}>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def keys(self) -> List[IndexKey]:
+        """(radar location, radar type) pairs that have frames in the index"""
+
+        return [key for key, times in self._times.items() if times]
+
+    def to_catalog(self) -> BOMRadarCatalog:
+        """Catalog of every frame in the index
+
+        Returns:
+            Catalog of the frames, sorted by (radar location, radar type) then time.
+        """
+
+        keys = [
+            pack_frame_key(
+                IDR_INDEX_MAP[radar_location.base],
+                ord(radar_type.value),
+                np.array(times, dtype=np.int64),
+            )
+            for (radar_location, radar_type), times in sorted(
+                self._times.items(),
+                key=lambda x: (IDR_INDEX_MAP[x[0][0].base], x[0][1].value),
+            )
+        ]
+
+        return BOMRadarCatalog.from_keys(
+            np.concatenate(keys) if keys else np.empty(0, dtype=np.int64),
+            locale_tz=self.locale_tz,
+        )
+
+    def add(self, frame: Frame):
+        """Add a frame to the index
+
+        Args:
+            frame: Frame to add. Frames already in the index are ignored.
+        """
+
+        times = self._times.setdefault((frame.radar_id, frame.radar_type), [])
+        position = bisect.bisect_left(times, frame.epoch_minute)
+        if position == len(times) or times[position] != frame.epoch_minute:
+            times.insert(position, frame.epoch_minute)
+
+    def remove(self, frame: Frame):
+        """Remove a frame from the index
+
+        Args:
+            frame: Frame to remove. Frames not in the index are ignored.
+        """
+
+        times = self._times.get((frame.radar_id, frame.radar_type), [])
+        position = bisect.bisect_left(times, frame.epoch_minute)
+        if position < len(times) and times[position] == frame.epoch_minute:
+            del times[position]
+
+    def _frames(
+        self,
+        radar_location: BOMRadarLocationModel,
+        radar_type: RADAR_TYPE,
+        times: List[int],
+    ) -> List[BOMRadarFrameMetadata]:
+        """Build the frames for a list of times"""
+
+        radar_index = IDR_INDEX_MAP[radar_location.base]
+        return [
+            BOMRadarFrameMetadata.from_components(
+                radar_index, radar_type.value, epoch_minute, self.locale_tz
+            )
+            for epoch_minute in times
+        ]
+
+    def latest(
+        self,
+        radar_location: BOMRadarLocationModel,
+        radar_type: RADAR_TYPE,
+        count: int = 1,
+    ) -> List[BOMRadarFrameMetadata]:
+        """Get the latest frames for a radar location and type
+
+        Args:
+            radar_location: The radar location.
+            radar_type: The radar type.
+            count: Number of frames to return. Defaults to 1.
+
+        Returns:
+            Up to `count` frames, oldest first.
+        """
+
+        if count <= 0:
+            return []
+
+        times = self._times.get((radar_location, radar_type), [])
+        return self._frames(radar_location, radar_type, times[-count:])
+
+    def between(
+        self,
+        radar_location: BOMRadarLocationModel,
+        radar_type: RADAR_TYPE,
+        start_time_utc: Optional[datetime.datetime] = None,
+        end_time_utc: Optional[datetime.datetime] = None,
+    ) -> List[BOMRadarFrameMetadata]:
+        """Get the frames in a time range for a radar location and type
+
+        Args:
+            radar_location: The radar location.
+            radar_type: The radar type.
+            start_time_utc: Earliest frame time (inclusive). Defaults to None for no lower bound.
+            end_time_utc: Latest frame time (inclusive). Defaults to None for no upper bound.
+
+        Returns:
+            Frames in the time range, oldest first.
+        """
+
+        times = self._times.get((radar_location, radar_type), [])
+
+        start = 0
+        if start_time_utc:
+            start = bisect.bisect_left(
+                times, datetime_to_epoch_minute(start_time_utc, round_up=True)
+            )
+
+        end = len(times)
+        if end_time_utc:
+            end = bisect.bisect_right(times, datetime_to_epoch_minute(end_time_utc))
+
+        return self._frames(radar_location, radar_type, times[start:end])
+
+    def nearest(
+        self,
+        radar_location: BOMRadarLocationModel,
+        radar_type: RADAR_TYPE,
+        time_utc: datetime.datetime,
+    ) -> Optional[BOMRadarFrameMetadata]:
+        """Get the frame nearest to a time for a radar location and type
+
+        Args:
+            radar_location: The radar location.
+            radar_type: The radar type.
+            time_utc: Time to search around. Ties go to the earlier frame.
+
+        Returns:
+            The nearest frame, or None if there are no frames.
+        """
+
+        times = self._times.get((radar_location, radar_type), [])
+        if not times:
+            return None
+
+        if time_utc.tzinfo is None:
+            time_utc = time_utc.replace(tzinfo=datetime.timezone.utc)
+        target = time_utc.timestamp() / 60
+
+        position = bisect.bisect_left(times, target)
+        candidates = times[max(position - 1, 0) : position + 1]
+        epoch_minute = min(candidates, key=lambda x: abs(x - target))
+
+        return self._frames(radar_location, radar_type, [epoch_minute])[0]
+
+
+__all__ = [
+    "BOMRadarFrameIndex",
+]
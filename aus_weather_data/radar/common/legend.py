@@ -0,0 +1,270 @@
+import math
+import threading
+import numpy as np
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from aus_weather_data.radar.common.types import RADAR_TYPE
+
+_RAIN_COLOURS: List[Tuple[int, int, int]] = [
+    (245, 245, 255),
+    (180, 180, 255),
+    (120, 120, 255),
+    (20, 20, 255),
+    (0, 216, 195),
+    (0, 150, 144),
+    (0, 102, 102),
+    (255, 255, 0),
+    (255, 200, 0),
+    (255, 150, 0),
+    (255, 100, 0),
+    (255, 0, 0),
+    (200, 0, 0),
+    (120, 0, 0),
+    (40, 0, 0),
+]
+"""Colours of the BOM rain legend, lightest to heaviest"""
+
+_RAIN_RATES = [0.2, 0.5, 1.5, 2.5, 4, 6, 10, 15, 20, 35, 50, 80, 120, 200, 360]
+"""Rain rate (mm/h) at the bottom of each class of the rain legend"""
+
+_VELOCITY_COLOURS: List[Tuple[int, int, int]] = [
+    (0, 0, 120),
+    (0, 0, 200),
+    (0, 70, 255),
+    (0, 150, 255),
+    (0, 220, 255),
+    (0, 255, 150),
+    (0, 200, 0),
+    (200, 200, 200),
+    (255, 255, 0),
+    (255, 200, 0),
+    (255, 150, 0),
+    (255, 100, 0),
+    (255, 0, 0),
+    (200, 0, 0),
+    (120, 0, 0),
+]
+"""Colours of the BOM Doppler wind legend, fastest towards the radar to fastest away"""
+
+_VELOCITIES = [-35, -30, -25, -20, -15, -10, -5, 0, 5, 10, 15, 20, 25, 30, 35]
+"""Radial velocity (m/s) at the centre of each class, negative towards the radar"""
+
+_ACCUMULATIONS_SHORT = [0.2, 0.5, 1, 2, 3, 5, 10, 15, 20, 25, 30, 40, 50, 75, 100]
+"""Rainfall (mm) at the bottom of each class for the 5 minute and 1 hour totals"""
+
+_ACCUMULATIONS_LONG = [0.2, 1, 2, 5, 10, 15, 20, 25, 30, 40, 50, 75, 100, 150, 200]
+"""Rainfall (mm) at the bottom of each class for the since 9am and 24 hour totals"""
+
+
+def _pack_rgb(colours: np.ndarray) -> np.ndarray:
+    colours = colours.astype(np.uint32)
+    keys: np.ndarray = (
+        (colours[..., 0] << 16) | (colours[..., 1] << 8) | colours[..., 2]
+    )
+    return keys
+
+
+class BOMRadarLegend(object):
+    """Mapping from the colours of a radar product to physical values
+
+    The palette of a radar PNG only holds the colours used in that frame,
+    in no fixed order, so the lookup table from palette index to value
+    is built per palette with :meth:`lut`. Palettes repeat across
+    frames, so the tables are cached by palette. The legends are shared
+    module level objects, so the cache is guarded by a lock. Converting
+    a decoded frame is then a single fancy-index (see :meth:`convert`).
+
+    Colours that aren't in the legend (the background, range rings,
+    labels) and transparent palette entries map to NaN.
+
+    Attributes:
+        name: Name of the legend.
+        unit: Unit of the values, EG. :literal:`dBZ`.
+        colours: (N, 3) uint8 RGB colours of the legend.
+        values: (N,) float32 value of each colour.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        unit: str,
+        colours: Sequence[Tuple[int, int, int]],
+        values: Sequence[float],
+    ):
+        """Create a legend
+
+        Args:
+            name: Name of the legend.
+            unit: Unit of the values.
+            colours: RGB colour of each class.
+            values: Value of each class.
+
+        Raises:
+            ValueError: If the colours and values differ in length or a colour repeats.
+        """
+
+        if len(colours) != len(values):
+            raise ValueError(
+                f"{len(colours)} colours but {len(values)} values for legend {name}"
+            )
+
+        self.name = name
+        self.unit = unit
+        self.colours = np.array(colours, dtype=np.uint8).reshape(-1, 3)
+        self.values = np.array(values, dtype=np.float32)
+
+        keys = _pack_rgb(self.colours)
+        order = np.argsort(keys)
+        self._keys = keys[order]
+        self._sorted_values = self.values[order]
+        if len(np.unique(self._keys)) != len(self._keys):
+            raise ValueError(f"Legend {name} repeats a colour")
+
+        self._luts: Dict[bytes, np.ndarray] = {}
+        self._luts_lock = threading.Lock()
+
+    def __str__(self) -> str:
+        return f"BOMRadarLegend<{self.name}, {self.unit}>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def lut(
+        self, palette: np.ndarray, alpha: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Lookup table from the palette indices of a frame to values
+
+        Args:
+            palette: (N, 3) uint8 RGB palette of the frame.
+            alpha (optional): (N,) uint8 alpha of each palette entry, 0 maps to NaN.
+
+        Returns:
+            (np.ndarray): Read only (N,) float32 value of each palette index
+        """
+
+        cache_key = palette.tobytes() + (b"" if alpha is None else alpha.tobytes())
+        with self._luts_lock:
+            cached = self._luts.get(cache_key)
+        if cached is not None:
+            return cached
+
+        keys = _pack_rgb(palette)
+        position = np.searchsorted(self._keys, keys).clip(0, len(self._keys) - 1)
+        found = self._keys[position] == keys
+        if alpha is not None:
+            found &= alpha[: len(keys)] != 0
+
+        lut: np.ndarray = np.where(
+            found, self._sorted_values[position], np.float32(np.nan)
+        ).astype(np.float32)
+        lut.setflags(write=False)
+
+        # Built outside the lock, a thread racing on the same palette builds
+        # an equal table and the first one stored wins
+        with self._luts_lock:
+            if len(self._luts) >= 1024:
+                self._luts.clear()
+            stored: np.ndarray = self._luts.setdefault(cache_key, lut)
+        return stored
+
+    def convert(
+        self,
+        indices: np.ndarray,
+        palette: np.ndarray,
+        alpha: Optional[np.ndarray] = None,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Convert palette indices to values
+
+        Args:
+            indices: uint8 palette indices, EG. from :func:`decode_png`.
+            palette: (N, 3) uint8 RGB palette of the frame.
+            alpha (optional): (N,) uint8 alpha of each palette entry, 0 maps to NaN.
+            out (optional): float32 array with the shape of `indices` to write into.
+
+        Returns:
+            (np.ndarray): float32 values with the shape of `indices`
+        """
+
+        # Indices past the end of the palette are invalid, pad the table with NaN
+        lut = np.full(256, np.nan, dtype=np.float32)
+        table = self.lut(palette, alpha)
+        lut[: len(table)] = table
+        return np.take(lut, indices, out=out)
+
+
+REFLECTIVITY_RAIN_RATE = BOMRadarLegend(
+    "Reflectivity rain rate", "mm/h", _RAIN_COLOURS, _RAIN_RATES
+)
+"""Reflectivity as rain rate, the value at the bottom of each legend class"""
+
+REFLECTIVITY_DBZ = BOMRadarLegend(
+    "Reflectivity",
+    "dBZ",
+    _RAIN_COLOURS,
+    [10 * math.log10(200 * rate**1.6) for rate in _RAIN_RATES],
+)
+"""Reflectivity in dBZ, from the rain rate with the Marshall-Palmer relation Z = 200R^1.6"""
+
+VELOCITY = BOMRadarLegend("Doppler velocity", "m/s", _VELOCITY_COLOURS, _VELOCITIES)
+"""Radial velocity from the BOM Doppler wind scale, negative towards the radar"""
+
+RAINFALL_SHORT = BOMRadarLegend("Rainfall", "mm", _RAIN_COLOURS, _ACCUMULATIONS_SHORT)
+"""Rainfall accumulation from the BOM scale of the 5 minute and 1 hour products"""
+
+RAINFALL_LONG = BOMRadarLegend("Rainfall", "mm", _RAIN_COLOURS, _ACCUMULATIONS_LONG)
+"""Rainfall accumulation from the BOM scale of the since 9am and 24 hour products"""
+
+RADAR_TYPE_LEGEND: Dict[RADAR_TYPE, BOMRadarLegend] = {
+    RADAR_TYPE.REF_64_KM: REFLECTIVITY_DBZ,
+    RADAR_TYPE.REF_128_KM: REFLECTIVITY_DBZ,
+    RADAR_TYPE.REF_256_KM: REFLECTIVITY_DBZ,
+    RADAR_TYPE.REF_512_KM: REFLECTIVITY_DBZ,
+    RADAR_TYPE.VEL_128_KM: VELOCITY,
+    RADAR_TYPE.RAI_128_KM_5M: RAINFALL_SHORT,
+    RADAR_TYPE.RAI_128_KM_1H: RAINFALL_SHORT,
+    RADAR_TYPE.RAI_128_KM_9AM: RAINFALL_LONG,
+    RADAR_TYPE.RAI_128_KM_24H: RAINFALL_LONG,
+}
+"""Default legend of each :class:`RADAR_TYPE`
+
+Only the reflectivity colours have been checked against real frames.
+Pass a :class:`BOMRadarLegend` to convert with another scale.
+"""
+
+
+def get_radar_type_legend(radar_type: RADAR_TYPE) -> BOMRadarLegend:
+    """Default legend of a radar type, see :data:`RADAR_TYPE_LEGEND`
+
+    Args:
+        radar_type: The radar type.
+
+    Returns:
+        The legend of the radar type.
+
+    Raises:
+        ValueError: If the radar type has no default legend.
+    """
+
+    legend = RADAR_TYPE_LEGEND.get(radar_type)
+    if legend is None:
+        raise ValueError(
+            f"There is no default legend for {radar_type}, pass a BOMRadarLegend"
+        )
+    return legend
+
+
+__all__ = [
+    "BOMRadarLegend",
+    "RADAR_TYPE_LEGEND",
+    "RAINFALL_LONG",
+    "RAINFALL_SHORT",
+    "REFLECTIVITY_DBZ",
+    "REFLECTIVITY_RAIN_RATE",
+    "VELOCITY",
+    "get_radar_type_legend",
+]
@@ -1,6 +1,18 @@
-from typing import Set, Tuple, List
+import numpy as np
+
+from numpy.typing import ArrayLike
+from typing import Dict, Optional, Set, Tuple, List
 from aus_weather_data.radar.common.utils import get_translation_coordinate
-from aus_weather_data.radar.common.types import RADAR_TYPE
+from aus_weather_data.radar.common.types import RADAR_TYPE, RADAR_TYPE_RANGE
+from aus_weather_data.radar.common.grid import (
+    IMAGE_SIZE,
+    compute_pixel_grid,
+    coordinates_to_pixels,
+    get_cache_dir,
+    load_pixel_grid,
+    pixels_to_coordinates,
+    save_pixel_grid,
+)
 from aus_weather_data.radar.common.idr_data import IDR_DATA
 
 
@@ -38,6 +50,9 @@ class BOMRadarLocationModel(object):
         self._latitude = latitude
         self._longitude = longitude
         self._radar_types = {RADAR_TYPE(radar_type) for radar_type in radar_types}
+        self._pixel_grids: Dict[
+            Tuple[RADAR_TYPE, int], Tuple[np.ndarray, np.ndarray]
+        ] = {}
 
     def __repr__(self) -> str:
         return self.__str__()
@@ -88,6 +103,13 @@ class BOMRadarLocationModel(object):
 
         return self._radar_types
 
+    def _check_radar_type(self, radar_type: RADAR_TYPE):
+        if radar_type not in RADAR_TYPE:
+            raise TypeError("radar_type should be a RADAR_TYPE")
+
+        if radar_type not in self._radar_types:
+            raise TypeError(f"There is no {radar_type} for {self._location_name}")
+
     def radar_range(self, radar_type: RADAR_TYPE) -> Tuple[tuple, tuple, tuple, tuple]:
         """
         Get the radar bounding box for a specific radar type
@@ -113,20 +135,8 @@ class BOMRadarLocationModel(object):
             TypeError: If the radar type is not of type :class:`RADAR_TYPE`
         """
 
-        if radar_type not in RADAR_TYPE:
-            raise TypeError("radar_type should be a RADAR_TYPE")
-
-        if radar_type not in self._radar_types:
-            raise TypeError(f"There is no {radar_type} for {self._location_name}")
-
-        if "64_KM" in radar_type.name:
-            distance = 64
-        elif "128_KM" in radar_type.name:
-            distance = 128
-        elif "256_KM" in radar_type.name:
-            distance = 256
-        elif "512_KM" in radar_type.name:
-            distance = 512
+        self._check_radar_type(radar_type)
+        distance = RADAR_TYPE_RANGE[radar_type]
 
         north_lat, _ = get_translation_coordinate(
             self._latitude, self._longitude, distance, 0
@@ -148,6 +158,127 @@ class BOMRadarLocationModel(object):
             (south_lat, west_lon),
         )
 
+    def pixel_grid(
+        self,
+        radar_type: RADAR_TYPE,
+        size: int = IMAGE_SIZE,
+        cache_dir: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the latitude and longitude of every pixel for a specific radar type
+
+        The grids never change, so they are computed once and kept for
+        the life of the process. They are also saved to a disk cache as
+        ``.npy`` files keyed by location, radar type and image size, and
+        memory mapped from there by other processes rather than computed
+        again. See :func:`compute_pixel_grid` for the projection.
+
+        Args:
+            radar_type (RADAR_TYPE): The radar type to get the grid for.
+            size (int): Width and height of the image in pixels. Defaults to 512.
+            cache_dir (str): Directory of the disk cache. Defaults to None for :func:`get_cache_dir`.
+
+        Returns:
+            (tuple[np.ndarray, np.ndarray]): Read-only (size, size) latitude and longitude of each pixel centre, row 0 is the north edge.
+
+        Raises:
+            TypeError: If the radar type is not of type :class:`RADAR_TYPE`
+        """
+
+        self._check_radar_type(radar_type)
+
+        grid = self._pixel_grids.get((radar_type, size))
+        if grid is not None:
+            return grid
+
+        if cache_dir is None:
+            cache_dir = get_cache_dir()
+        key = f"{self._base}{radar_type.value}"
+
+        grid = load_pixel_grid(cache_dir, key, size)
+        if grid is None:
+            grid = compute_pixel_grid(
+                self._latitude, self._longitude, RADAR_TYPE_RANGE[radar_type], size
+            )
+            save_pixel_grid(cache_dir, key, size, grid)
+            for array in grid:
+                array.setflags(write=False)
+
+        self._pixel_grids[(radar_type, size)] = grid
+        return grid
+
+    def coordinates_to_pixels(
+        self,
+        radar_type: RADAR_TYPE,
+        latitude: ArrayLike,
+        longitude: ArrayLike,
+        size: int = IMAGE_SIZE,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the pixels that locations fall in for a specific radar type
+
+        The pixels are found in closed form from the distance and bearing
+        of each location from the radar, so no grid is searched. Sample
+        a frame with ``values[rows, cols]`` where ``rows >= 0``.
+
+        Args:
+            radar_type (RADAR_TYPE): The radar type of the image.
+            latitude (ArrayLike): Latitude of the location(s) (in ° decimal).
+            longitude (ArrayLike): Longitude of the location(s) (in ° decimal).
+            size (int): Width and height of the image in pixels. Defaults to 512.
+
+        Returns:
+            (tuple[np.ndarray, np.ndarray]): int64 row and column of each location, both -1 if it is outside the image.
+
+        Raises:
+            TypeError: If the radar type is not of type :class:`RADAR_TYPE`
+        """
+
+        self._check_radar_type(radar_type)
+        return coordinates_to_pixels(
+            self._latitude,
+            self._longitude,
+            RADAR_TYPE_RANGE[radar_type],
+            latitude,
+            longitude,
+            size,
+        )
+
+    def pixels_to_coordinates(
+        self,
+        radar_type: RADAR_TYPE,
+        rows: ArrayLike,
+        cols: ArrayLike,
+        size: int = IMAGE_SIZE,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the location of the centre of pixels for a specific radar type
+
+        The inverse of :meth:`coordinates_to_pixels`.
+
+        Args:
+            radar_type (RADAR_TYPE): The radar type of the image.
+            rows (ArrayLike): Row of each pixel, row 0 is the north edge.
+            cols (ArrayLike): Column of each pixel, column 0 is the west edge.
+            size (int): Width and height of the image in pixels. Defaults to 512.
+
+        Returns:
+            (tuple[np.ndarray, np.ndarray]): Latitude and longitude of each pixel centre.
+
+        Raises:
+            TypeError: If the radar type is not of type :class:`RADAR_TYPE`
+        """
+
+        self._check_radar_type(radar_type)
+        return pixels_to_coordinates(
+            self._latitude,
+            self._longitude,
+            RADAR_TYPE_RANGE[radar_type],
+            rows,
+            cols,
+            size,
+        )
+
 
 class BOMRadarLocation:
     """Bureau of Meteorology Radar Locations
@@ -182,7 +313,26 @@ class BOMRadarLocation:
     IDR_LIST = list(IDR_DATA.keys())
 
 
+IDR_LOCATION_MAP: Dict[str, BOMRadarLocationModel] = {
+    idr: getattr(BOMRadarLocation, idr) for idr in BOMRadarLocation.IDR_LIST
+}
+"""Lookup table from the IDR (EG. :literal:`IDR02`) to :class:`BOMRadarLocationModel`"""
+
+IDR_LOCATIONS: Tuple[BOMRadarLocationModel, ...] = tuple(
+    IDR_LOCATION_MAP[idr] for idr in BOMRadarLocation.IDR_LIST
+)
+"""Radar locations in the order of :attr:`BOMRadarLocation.IDR_LIST`"""
+
+IDR_INDEX_MAP: Dict[str, int] = {
+    idr: index for index, idr in enumerate(BOMRadarLocation.IDR_LIST)
+}
+"""Lookup table from the IDR (EG. :literal:`IDR02`) to its index in :data:`IDR_LOCATIONS`"""
+
+
 __all__ = [
     "BOMRadarLocation",
     "BOMRadarLocationModel",
+    "IDR_LOCATION_MAP",
+    "IDR_LOCATIONS",
+    "IDR_INDEX_MAP",
 ]
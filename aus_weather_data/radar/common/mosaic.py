@@ -0,0 +1,190 @@
+import numpy as np
+
+from numpy.typing import ArrayLike
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from aus_weather_data.radar.common.frame import BOMRadarFrameData
+from aus_weather_data.radar.common.grid import IMAGE_SIZE
+from aus_weather_data.radar.common.legend import (
+    BOMRadarLegend,
+    get_radar_type_legend,
+)
+from aus_weather_data.radar.common.location import BOMRadarLocationModel
+from aus_weather_data.radar.common.types import RADAR_TYPE, RADAR_TYPE_RANGE
+from aus_weather_data.radar.common.utils import get_distance_bearing
+
+MOSAIC_METHODS = ("max", "nearest")
+"""Ways overlapping radars are combined, see :class:`BOMRadarMosaic`"""
+
+
+class BOMRadarMosaic(object):
+    """Composites frames from several radars onto a regular lat/lon grid
+
+    On creation, every cell of the grid is mapped to the pixel of each
+    radar it falls in (see :meth:`BOMRadarLocationModel.coordinates_to_pixels`),
+    keeping only cells within the radar's range. Compositing a frame is
+    then a gather of its palette indices at those pixels, a lookup of the
+    values and a scatter into the grid, so no coordinates are worked out
+    per frame.
+
+    Where radars overlap, the ``max`` method keeps the largest value of
+    the radars with data, and the ``nearest`` method takes the value of
+    the nearest radar. With ``nearest`` each cell belongs to one radar,
+    so the cells of a radar without a frame are left empty.
+
+    Attributes:
+        locations: The radars of the mosaic.
+        radar_type: Radar type of the frames.
+        latitudes: (rows,) latitude of each row of the grid.
+        longitudes: (cols,) longitude of each column of the grid.
+        method: How overlapping radars are combined, one of :data:`MOSAIC_METHODS`.
+    """
+
+    def __init__(
+        self,
+        locations: Iterable[BOMRadarLocationModel],
+        radar_type: RADAR_TYPE,
+        latitudes: ArrayLike,
+        longitudes: ArrayLike,
+        method: str = "max",
+        size: int = IMAGE_SIZE,
+    ):
+        """Build the index maps of the mosaic
+
+        Args:
+            locations: The radars to composite.
+            radar_type: Radar type of the frames, EG. :attr:`RADAR_TYPE.REF_128_KM`.
+            latitudes: Latitude of each row of the grid (in ° decimal).
+            longitudes: Longitude of each column of the grid (in ° decimal).
+            method (optional): ``max`` or ``nearest``. Defaults to ``max``.
+            size (optional): Width and height of the frames in pixels. Defaults to 512.
+
+        Raises:
+            ValueError: If the method isn't one of :data:`MOSAIC_METHODS`.
+            TypeError: If a location doesn't have the radar type.
+        """
+
+        if method not in MOSAIC_METHODS:
+            raise ValueError(
+                f"method should be one of {', '.join(MOSAIC_METHODS)}, got {method}"
+            )
+
+        self.locations: List[BOMRadarLocationModel] = list(locations)
+        self.radar_type = radar_type
+        self.latitudes = np.asarray(latitudes, dtype=np.float64).reshape(-1)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64).reshape(-1)
+        self.method = method
+        self._size = size
+
+        lats = self.latitudes[:, None]
+        lons = self.longitudes[None, :]
+        radar_range = RADAR_TYPE_RANGE[radar_type]
+
+        distances = np.empty((len(self.locations),) + self.shape)
+        in_image = np.empty((len(self.locations),) + self.shape, dtype=bool)
+        pixels = []
+        for i, location in enumerate(self.locations):
+            rows, cols = location.coordinates_to_pixels(radar_type, lats, lons, size)
+            distances[i], _ = get_distance_bearing(*location.location, lats, lons)
+            in_image[i] = rows >= 0
+            pixels.append(rows * size + cols)
+
+        # Pixels past the range of the radar hold no data. A cell at the
+        # range on the edge of the image can round to the -1 of a cell
+        # outside it, which np.take would wrap to another pixel
+        covered = (distances <= radar_range) & in_image
+        if method == "nearest" and len(self.locations):
+            nearest = np.argmin(np.where(covered, distances, np.inf), axis=0)
+            covered &= nearest == np.arange(len(self.locations))[:, None, None]
+
+        # (cell of the grid, pixel of the frame) of each radar
+        self._maps: Dict[BOMRadarLocationModel, Tuple[np.ndarray, np.ndarray]] = {}
+        for location, pixel, cells in zip(self.locations, pixels, covered):
+            targets = np.flatnonzero(cells)
+            self._maps[location] = (targets, pixel.reshape(-1)[targets])
+
+    def __str__(self) -> str:
+        bases = ", ".join(location.base for location in self.locations)
+        return f"BOMRadarMosaic<{bases}, {self.radar_type}, {self.method}, shape={self.shape}>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """(rows, cols) of the grid."""
+
+        return (len(self.latitudes), len(self.longitudes))
+
+    def coverage(self) -> np.ndarray:
+        """Number of radars with data for each cell of the grid
+
+        Returns:
+            (np.ndarray): (rows, cols) int64 count, at most 1 with the ``nearest`` method
+        """
+
+        counts = np.zeros(self.shape[0] * self.shape[1], dtype=np.int64)
+        for targets, _ in self._maps.values():
+            counts[targets] += 1
+        return counts.reshape(self.shape)
+
+    def composite(
+        self,
+        frames: Iterable[BOMRadarFrameData],
+        legend: Optional[BOMRadarLegend] = None,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Composite the frames onto the grid
+
+        Args:
+            frames: The latest frame of some or all of the radars, at most one per radar.
+            legend (optional): Legend to convert with. Defaults to None for the legend of the radar type (see :data:`RADAR_TYPE_LEGEND`).
+            out (optional): C contiguous float32 array of shape :attr:`shape` to write into.
+
+        Returns:
+            (np.ndarray): (rows, cols) float32 values, NaN where there is no data
+
+        Raises:
+            ValueError: If a frame is of another radar type or size, isn't from a radar of the mosaic or repeats a radar, `out` doesn't fit the grid, or no legend is given and the radar type has no default legend.
+        """
+
+        if legend is None:
+            legend = get_radar_type_legend(self.radar_type)
+
+        if out is None:
+            out = np.empty(self.shape, dtype=np.float32)
+        elif out.shape != self.shape or not out.flags.c_contiguous:
+            raise ValueError(f"out should be C contiguous with shape {self.shape}")
+        out.fill(np.nan)
+        flat = out.reshape(-1)
+
+        seen = set()
+        for frame in frames:
+            location = frame.radar_id
+            if frame.radar_type is not self.radar_type:
+                raise ValueError(f"{frame} isn't a {self.radar_type} frame")
+            if location not in self._maps:
+                raise ValueError(f"{frame} isn't from a radar of the mosaic")
+            if location in seen:
+                raise ValueError(f"There is more than one frame for {location}")
+            seen.add(location)
+
+            indices = frame.palette_indices
+            if indices.shape != (self._size, self._size):
+                raise ValueError(f"{frame} is {indices.shape}, not {self._size} square")
+
+            targets, sources = self._maps[location]
+            values = legend.convert(
+                np.take(indices, sources), frame.palette, frame.alpha
+            )
+            if self.method == "max":
+                values = np.fmax(flat[targets], values)
+            flat[targets] = values
+
+        return out
+
+
+__all__ = [
+    "BOMRadarMosaic",
+    "MOSAIC_METHODS",
+]
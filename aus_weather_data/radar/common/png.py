@@ -0,0 +1,398 @@
+import zlib
+import struct
+import numpy as np
+
+from itertools import groupby
+from typing import List, Optional, Tuple, Union
+
+from aus_weather_data.exceptions import DecodeFrameError
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+class PNGHeader(object):
+    """Image header (IHDR) of a PNG
+
+    Attributes:
+        width: Width in pixels.
+        height: Height in pixels.
+        bit_depth: Bits per sample.
+        colour_type: PNG colour type, 3 for palette images.
+        interlace: Interlace method, 0 for none.
+    """
+
+    __slots__ = ("width", "height", "bit_depth", "colour_type", "interlace")
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        bit_depth: int,
+        colour_type: int,
+        interlace: int,
+    ):
+        self.width = width
+        self.height = height
+        self.bit_depth = bit_depth
+        self.colour_type = colour_type
+        self.interlace = interlace
+
+    def __str__(self) -> str:
+        return (
+            f"PNGHeader<{self.width}x{self.height}, bit_depth={self.bit_depth}, "
+            f"colour_type={self.colour_type}>"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """(height, width) of the image."""
+
+        return self.height, self.width
+
+
+def _chunks(data: Union[bytes, memoryview]):
+    """Iterate over the (type, data) chunks of a PNG"""
+
+    view = memoryview(data)
+    if bytes(view[:8]) != PNG_SIGNATURE:
+        raise DecodeFrameError("Not a PNG, the signature doesn't match")
+
+    position = 8
+    while position + 8 <= len(view):
+        length, chunk_type = struct.unpack_from(">I4s", view, position)
+        start = position + 8
+        end = start + length
+        if end + 4 > len(view):
+            raise DecodeFrameError(f"Truncated {chunk_type.decode()} chunk")
+
+        yield chunk_type, view[start:end]
+        if chunk_type == b"IEND":
+            return
+
+        position = end + 4
+
+    raise DecodeFrameError("PNG has no IEND chunk")
+
+
+def _parse_header(chunk: memoryview) -> PNGHeader:
+    if len(chunk) != 13:
+        raise DecodeFrameError(f"IHDR chunk is {len(chunk)} bytes, expected 13")
+
+    return PNGHeader(*struct.unpack(">IIBB2xB", chunk))
+
+
+def read_png_header(data: Union[bytes, memoryview]) -> PNGHeader:
+    """Read the image header of a PNG without decoding it
+
+    Args:
+        data: PNG data.
+
+    Returns:
+        The image header.
+
+    Raises:
+        DecodeFrameError: If the data isn't a PNG.
+    """
+
+    for chunk_type, chunk in _chunks(data):
+        if chunk_type != b"IHDR":
+            break
+
+        return _parse_header(chunk)
+
+    raise DecodeFrameError("PNG doesn't start with an IHDR chunk")
+
+
+_WAVEFRONT_ROWS = 48
+"""Fewest consecutive Average or Paeth rows undone as a wavefront, shorter runs are faster row by row"""
+
+
+def _paeth(a: int, b: int, c: int) -> int:
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    if pb <= pc:
+        return b
+    return c
+
+
+def _unfilter_row(
+    filter_type: int, row: np.ndarray, previous: np.ndarray, bpp: int, out: np.ndarray
+):
+    """Undo the filter of one scanline into `out`"""
+
+    row_bytes = len(row)
+
+    if filter_type == 0:
+        out[:] = row
+
+    elif filter_type == 1:
+        # Sub: running sum of each byte of the pixel, wrapping at 256
+        pad = (-row_bytes) % bpp
+        padded = np.concatenate([row, np.zeros(pad, dtype=np.uint8)])
+        out[:] = np.cumsum(padded.reshape(-1, bpp), axis=0, dtype=np.uint8).reshape(-1)[
+            :row_bytes
+        ]
+
+    elif filter_type == 2:
+        np.add(row, previous, out=out)
+
+    elif filter_type == 3:
+        # Average: the left neighbour is only known once reconstructed
+        up = previous.tolist()
+        values = row.tolist()
+        line_list = [0] * row_bytes
+        for x in range(row_bytes):
+            left = line_list[x - bpp] if x >= bpp else 0
+            line_list[x] = (values[x] + ((left + up[x]) >> 1)) & 0xFF
+        out[:] = line_list
+
+    else:
+        up = previous.tolist()
+        values = row.tolist()
+        line_list = [0] * row_bytes
+        for x in range(row_bytes):
+            if x >= bpp:
+                left, upper_left = line_list[x - bpp], up[x - bpp]
+            else:
+                left, upper_left = 0, 0
+            line_list[x] = (values[x] + _paeth(left, up[x], upper_left)) & 0xFF
+        out[:] = line_list
+
+
+def _unfilter_wavefront(
+    rows: np.ndarray, average: np.ndarray, previous: np.ndarray, bpp: int
+) -> np.ndarray:
+    """Undo a run of Average and Paeth scanlines at once
+
+    A byte depends on the reconstructed bytes to its left, above and
+    above left, so every pixel on an anti-diagonal (row + pixel column)
+    of the run only depends on the two anti-diagonals before it. The run
+    is skewed so that each anti-diagonal is one row of an array, then
+    reconstructed with a few NumPy operations per anti-diagonal instead
+    of a Python step per byte.
+
+    Args:
+        rows: (run, row bytes) filtered scanlines, without the filter type bytes.
+        average: (run,) bool, True for Average rows and False for Paeth rows.
+        previous: Reconstructed scanline above the run.
+        bpp: Bytes per complete pixel, the row bytes should be a multiple of it.
+
+    Returns:
+        (run, row bytes) reconstructed scanlines.
+    """
+
+    run, row_bytes = rows.shape
+    width = row_bytes // bpp
+
+    # Pixel (y, x) is at [y + x + 1, y], with `previous` as row 0 and the
+    # first anti-diagonal left zero for the pixels left of the image
+    ys = np.arange(1, run + 1)[:, None]
+    diagonals = ys + np.arange(width) + 1
+    skewed = np.zeros((run + width + 1, run + 1, bpp), dtype=np.int16)
+    skewed[diagonals, ys] = rows.reshape(run, width, bpp)
+    done = np.zeros_like(skewed)
+    done[1 : width + 1, 0] = previous.reshape(width, bpp)
+
+    average = np.concatenate([[False], average])[:, None]
+    all_average = bool(average[1:].all())
+    any_average = bool(average.any())
+
+    for d in range(2, run + width + 1):
+        lo = max(1, d - width)
+        hi = min(run, d - 1) + 1
+        left = done[d - 1, lo:hi]
+        up = done[d - 1, lo - 1 : hi - 1]
+
+        if all_average:
+            predictor = (left + up) >> 1
+        else:
+            upper_left = done[d - 2, lo - 1 : hi - 1]
+            pa = np.abs(up - upper_left)
+            pb = np.abs(left - upper_left)
+            pc = np.abs(left + up - upper_left - upper_left)
+            predictor = np.where(
+                (pa <= pb) & (pa <= pc),
+                left,
+                np.where(pb <= pc, up, upper_left),
+            )
+            if any_average:
+                predictor = np.where(average[lo:hi], (left + up) >> 1, predictor)
+
+        np.bitwise_and(predictor + skewed[d, lo:hi], 0xFF, out=done[d, lo:hi])
+
+    reconstructed: np.ndarray = done[diagonals, ys].reshape(run, row_bytes)
+    return reconstructed.astype(np.uint8)
+
+
+def _unfilter(raw: np.ndarray, bpp: int) -> np.ndarray:
+    """Undo the PNG row filters
+
+    Runs of at least :data:`_WAVEFRONT_ROWS` Average or Paeth rows are
+    undone together (see :func:`_unfilter_wavefront`), other rows one at
+    a time.
+
+    Args:
+        raw: Inflated image data, one row per scanline with the filter type byte first.
+        bpp: Bytes per complete pixel, at least 1.
+
+    Returns:
+        The reconstructed scanlines without the filter type bytes.
+    """
+
+    filters = raw[:, 0]
+    rows = raw[:, 1:]
+
+    if not filters.any():
+        return rows
+
+    if filters.max() > 4:
+        raise DecodeFrameError(f"Unknown PNG filter type {filters.max()}")
+
+    out = np.empty_like(rows)
+    previous = np.zeros(rows.shape[1], dtype=np.uint8)
+    wavefront = rows.shape[1] % bpp == 0
+
+    y = 0
+    for slow, group in groupby(filters.tolist(), key=lambda x: x >= 3):
+        filter_types = list(group)
+        end = y + len(filter_types)
+
+        if slow and wavefront and len(filter_types) >= _WAVEFRONT_ROWS:
+            out[y:end] = _unfilter_wavefront(
+                rows[y:end], filters[y:end] == 3, previous, bpp
+            )
+            previous = out[end - 1]
+            y = end
+            continue
+
+        for filter_type in filter_types:
+            _unfilter_row(filter_type, rows[y], previous, bpp, out[y])
+            previous = out[y]
+            y += 1
+
+    return out
+
+
+def _unpack(
+    rows: np.ndarray, bit_depth: int, width: int, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Unpack sub-byte samples into one uint8 per sample
+
+    Unpacks straight into `out` when the rows have no padding bits.
+    """
+
+    if bit_depth == 8:
+        return rows[:, :width]
+
+    per_byte = 8 // bit_depth
+    mask = (1 << bit_depth) - 1
+    shape = (rows.shape[0], rows.shape[1] * per_byte)
+    if out is not None and out.shape == shape:
+        samples = out
+    else:
+        samples = np.empty(shape, dtype=np.uint8)
+    for position in range(per_byte):
+        shift = 8 - bit_depth * (position + 1)
+        np.bitwise_and(rows >> shift, mask, out=samples[:, position::per_byte])
+    return samples[:, :width]
+
+
+def decode_png(
+    data: Union[bytes, memoryview],
+    out: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Decode a palette PNG into palette indices
+
+    Only uses :mod:`zlib` and NumPy. Supports non-interlaced palette
+    (colour type 3) images of any bit depth, which is what BOM radar
+    frames are.
+
+    Args:
+        data: PNG data.
+        out (optional): uint8 array of shape (height, width) to decode into.
+
+    Returns:
+        (indices, palette, alpha): uint8 palette index per pixel with
+        shape (height, width), the (N, 3) uint8 RGB palette and the (N,)
+        uint8 alpha of each palette entry (255 where tRNS doesn't set it).
+
+    Raises:
+        DecodeFrameError: If the PNG is invalid or not a supported type.
+    """
+
+    header: Optional[PNGHeader] = None
+    palette: Optional[np.ndarray] = None
+    alpha: Optional[np.ndarray] = None
+    idat: List[memoryview] = []
+
+    for chunk_type, chunk in _chunks(data):
+        if chunk_type == b"IHDR":
+            header = _parse_header(chunk)
+        elif chunk_type == b"PLTE":
+            palette = np.frombuffer(chunk, dtype=np.uint8).reshape(-1, 3)
+        elif chunk_type == b"tRNS":
+            alpha = np.frombuffer(chunk, dtype=np.uint8)
+        elif chunk_type == b"IDAT":
+            idat.append(chunk)
+
+    if header is None:
+        raise DecodeFrameError("PNG has no IHDR chunk")
+
+    if header.colour_type != 3 or palette is None:
+        raise DecodeFrameError(f"Only palette PNGs are supported, got {header}")
+
+    if header.bit_depth not in (1, 2, 4, 8):
+        raise DecodeFrameError(
+            f"Palette PNGs have a bit depth of 1, 2, 4 or 8, got {header.bit_depth}"
+        )
+
+    if header.interlace:
+        raise DecodeFrameError("Interlaced PNGs are not supported")
+
+    full_alpha = np.full(len(palette), 255, dtype=np.uint8)
+    if alpha is not None:
+        full_alpha[: len(alpha)] = alpha[: len(palette)]
+
+    bits_per_pixel = header.bit_depth * _CHANNELS[header.colour_type]
+    row_bytes = (header.width * bits_per_pixel + 7) // 8
+    bpp = max(bits_per_pixel // 8, 1)
+
+    decompressor = zlib.decompressobj()
+    try:
+        inflated = b"".join(decompressor.decompress(chunk) for chunk in idat)
+    except zlib.error as e:
+        raise DecodeFrameError(f"PNG image data is corrupt: {e}") from e
+
+    expected = header.height * (row_bytes + 1)
+    if len(inflated) < expected:
+        raise DecodeFrameError(
+            f"PNG image data is truncated, {len(inflated)} of {expected} bytes"
+        )
+
+    raw = np.frombuffer(inflated, dtype=np.uint8, count=expected).reshape(
+        header.height, row_bytes + 1
+    )
+    indices = _unpack(_unfilter(raw, bpp), header.bit_depth, header.width, out=out)
+
+    # Sub-byte samples are unpacked straight into `out` when they fit it
+    if out is None:
+        out = np.ascontiguousarray(indices)
+    elif not np.may_share_memory(indices, out):
+        out[...] = indices
+
+    return out, palette.copy(), full_alpha
+
+
+__all__ = [
+    "PNGHeader",
+    "PNG_SIGNATURE",
+    "decode_png",
+    "read_png_header",
+]
@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Dict
 
 
 class RADAR_TYPE(Enum):
@@ -62,6 +63,27 @@ class RADAR_TYPE(Enum):
         return self.__str__()
 
 
+RADAR_TYPE_MAP: Dict[str, RADAR_TYPE] = {
+    radar_type.value: radar_type for radar_type in RADAR_TYPE
+}
+"""Lookup table from the filename suffix (EG. :literal:`3`) to :class:`RADAR_TYPE`"""
+
+RADAR_TYPE_RANGE: Dict[RADAR_TYPE, int] = {
+    RADAR_TYPE.REF_64_KM: 64,
+    RADAR_TYPE.REF_128_KM: 128,
+    RADAR_TYPE.REF_256_KM: 256,
+    RADAR_TYPE.REF_512_KM: 512,
+    RADAR_TYPE.VEL_128_KM: 128,
+    RADAR_TYPE.RAI_128_KM_5M: 128,
+    RADAR_TYPE.RAI_128_KM_1H: 128,
+    RADAR_TYPE.RAI_128_KM_9AM: 128,
+    RADAR_TYPE.RAI_128_KM_24H: 128,
+}
+"""Range (in kms) from the radar to the edge of the image, EG. :literal:`128` for :attr:`RADAR_TYPE.REF_128_KM`"""
+
+
 __all__ = [
     "RADAR_TYPE",
+    "RADAR_TYPE_MAP",
+    "RADAR_TYPE_RANGE",
 ]
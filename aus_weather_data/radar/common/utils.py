@@ -1,5 +1,20 @@
+import os
 import math
+import errno
+import secrets
 import datetime
+import functools
+import tempfile
+import numpy as np
+
+from typing import Tuple
+from numpy.typing import ArrayLike
+
+EARTH_RADIUS = 6378.1
+"""Radius of the Earth (in kms) used for translating coordinates"""
+
+_EPOCH_UTC = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_EPOCH_ORDINAL = _EPOCH_UTC.toordinal()
 
 
 def get_translation_coordinate(
@@ -16,7 +31,7 @@ def get_translation_coordinate(
     Returns:
         tuple of format: (latitude, longitude)
     """
-    R = 6378.1  # Radius of the Earth
+    R = EARTH_RADIUS
     brng = math.pi * bearing / 180.0  # Convert bearing to radian
     lat = math.pi * latitude / 180.0  # Current coords to radians
     lon = math.pi * longitude / 180.0
@@ -35,10 +50,90 @@ def get_translation_coordinate(
     return (round(180.0 * lat / math.pi, 5), round(180.0 * lon / math.pi, 5))
 
 
+def get_translation_coordinates(
+    latitude: ArrayLike, longitude: ArrayLike, distance: ArrayLike, bearing: ArrayLike
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gets the coordinates defined distances and headings away from locations
+
+    The vectorised form of :func:`get_translation_coordinate`, on the same
+    spherical Earth. The arguments broadcast against each other, EG. a
+    single origin with a grid of distances and bearings.
+
+    Args:
+        latitude: Latitude of the original location(s) (in ° decimal)
+        longitude: Longitude of the original location(s) (in ° decimal)
+        distance: Distance(s) from the location (in kms)
+        bearing: Heading(s) of the second coordinate from the first (0 - 360 in ° decimal)
+    Returns:
+        (latitude, longitude) arrays in ° decimal, in the broadcast shape of the arguments.
+    """
+
+    lat = np.radians(latitude)
+    lon = np.radians(longitude)
+    brng = np.radians(bearing)
+    angle = np.asarray(distance, dtype=np.float64) / EARTH_RADIUS
+
+    sin_lat, cos_lat = np.sin(lat), np.cos(lat)
+    sin_angle, cos_angle = np.sin(angle), np.cos(angle)
+
+    sin_lat2 = sin_lat * cos_angle + cos_lat * sin_angle * np.cos(brng)
+    lat2 = np.arcsin(np.clip(sin_lat2, -1.0, 1.0))
+    lon2 = lon + np.arctan2(
+        np.sin(brng) * sin_angle * cos_lat, cos_angle - sin_lat * sin_lat2
+    )
+
+    # Wrap longitudes to [-180, 180)
+    lon2 = (lon2 + np.pi) % (2 * np.pi) - np.pi
+    return np.degrees(lat2), np.degrees(lon2)
+
+
+def get_distance_bearing(
+    latitude: ArrayLike,
+    longitude: ArrayLike,
+    to_latitude: ArrayLike,
+    to_longitude: ArrayLike,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gets the distances and headings from locations to other locations
+
+    The inverse of :func:`get_translation_coordinates`: the great circle
+    distance (haversine) and the initial bearing. The arguments
+    broadcast against each other.
+
+    Args:
+        latitude: Latitude of the original location(s) (in ° decimal)
+        longitude: Longitude of the original location(s) (in ° decimal)
+        to_latitude: Latitude of the second location(s) (in ° decimal)
+        to_longitude: Longitude of the second location(s) (in ° decimal)
+    Returns:
+        (distance, bearing) arrays, in kms and in ° decimal (0 - 360).
+    """
+
+    lat1 = np.radians(latitude)
+    lat2 = np.radians(to_latitude)
+    delta_lon = np.radians(to_longitude) - np.radians(longitude)
+
+    cos_lat2 = np.cos(lat2)
+    haversine = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * cos_lat2 * np.sin(delta_lon / 2) ** 2
+    )
+    distance = 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(haversine, 0.0, 1.0)))
+
+    bearing = np.arctan2(
+        np.sin(delta_lon) * cos_lat2,
+        np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * cos_lat2 * np.cos(delta_lon),
+    )
+    return distance, np.degrees(bearing) % 360.0
+
+
 def split_filename(filename: str) -> dict:
     """Gets information from a filename
 
-    Splits the information in a filename.
+    Splits the information in a filename. This builds a dictionary of
+    strings for every call, see :func:`parse_filename` for the fast path
+    used when parsing directory listings.
 
     Args:
         filename: Filename of the radar frame from BOM. E.G: IDR024.T.202001312236.png
@@ -49,38 +144,165 @@ def split_filename(filename: str) -> dict:
 
     filename_array = filename.split(".")
     if len(filename_array) != 4:
-        breakpoint()
         raise ValueError("Filename is not in the correct format.")
 
-    idr = filename_array[0][:-1]
-    idrType = filename_array[0][-1:]
-    base = filename_array[0]
-    year = filename_array[2][0:4]
-    month = filename_array[2][4:6]
-    day = filename_array[2][6:8]
-    hour = filename_array[2][8:10]
-    minute = filename_array[2][10:12]
-    date = "{year}-{month}-{day}".format(year=year, month=month, day=day)
-    dt = datetime.datetime.strptime(filename_array[2], "%Y%m%d%H%M").replace(
-        tzinfo=datetime.timezone.utc
+    timestamp = filename_array[2]
+    year = timestamp[0:4]
+    month = timestamp[4:6]
+    day = timestamp[6:8]
+    hour = timestamp[8:10]
+    minute = timestamp[10:12]
+    dt = datetime.datetime(
+        int(year),
+        int(month),
+        int(day),
+        int(hour),
+        int(minute),
+        tzinfo=datetime.timezone.utc,
     )
 
     return {
         "filename": filename,
-        "idr": idr,
-        "idrType": idrType,
-        "base": base,
+        "idr": filename_array[0][:-1],
+        "idrType": filename_array[0][-1:],
+        "base": filename_array[0],
         "year": year,
         "month": month,
         "day": day,
         "hour": hour,
         "minute": minute,
-        "date": date,
+        "date": f"{year}-{month}-{day}",
         "dt": dt,
     }
 
 
+@functools.lru_cache(maxsize=4096)
+def _epoch_day(date_str: str) -> int:
+    """Days since epoch for a YYYYMMDD string (cached, a listing spans few days)"""
+
+    return (
+        datetime.date(
+            int(date_str[0:4]), int(date_str[4:6]), int(date_str[6:8])
+        ).toordinal()
+        - _EPOCH_ORDINAL
+    )
+
+
+def parse_filename(filename: str) -> Tuple[str, str, int]:
+    """Fast path for parsing a radar frame filename
+
+    BOM radar filenames have a fixed layout from the end of the string,
+    :literal:`<idr><type>.T.<YYYYMMDDHHMM>.png`, so the fields are read
+    with fixed offsets instead of splitting the string and running
+    :meth:`datetime.datetime.strptime`.
+
+    Args:
+        filename: Filename of the radar frame from BOM. E.G: IDR024.T.202001312236.png
+
+    Returns:
+        tuple of format: (idr, idrType, epoch_minute) where epoch_minute is
+        the number of minutes since the unix epoch (UTC).
+
+    Raises:
+        ValueError: If the filename is not in the correct format.
+    """
+
+    if (
+        len(filename) < 21
+        or filename[-19:-16] != ".T."
+        or not filename.endswith(".png")
+        or not filename[-16:-4].isdigit()
+    ):
+        raise ValueError("Filename is not in the correct format.")
+
+    hour = int(filename[-8:-6])
+    minute = int(filename[-6:-4])
+    if hour > 23 or minute > 59:
+        raise ValueError("Filename is not in the correct format.")
+
+    epoch_minute = _epoch_day(filename[-16:-8]) * 1440 + hour * 60 + minute
+
+    return (filename[:-20], filename[-20], epoch_minute)
+
+
+def epoch_minute_to_datetime(epoch_minute: int) -> datetime.datetime:
+    """Convert minutes since the unix epoch to a UTC datetime
+
+    Args:
+        epoch_minute: Minutes since the unix epoch (UTC).
+
+    Returns:
+        Datetime object that is timezone aware for UTC locale.
+    """
+
+    return _EPOCH_UTC + datetime.timedelta(minutes=epoch_minute)
+
+
+def datetime_to_epoch_minute(dt: datetime.datetime, round_up: bool = False) -> int:
+    """Convert a datetime to minutes since the unix epoch
+
+    Naive datetimes are treated as UTC.
+
+    Args:
+        dt: Datetime to convert.
+        round_up: Round partial minutes up instead of down.
+
+    Returns:
+        Minutes since the unix epoch (UTC).
+    """
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+
+    minutes = dt.timestamp() / 60
+    return math.ceil(minutes) if round_up else math.floor(minutes)
+
+
+def create_temp_file(
+    directory: str, name: str, suffix: str = ".part"
+) -> Tuple[int, str]:
+    """Create a temporary file to write a file through
+
+    The file is created in `directory` so it can be renamed over `name`
+    once complete. Unlike :func:`tempfile.mkstemp`, which creates files
+    readable only by the owner, it gets the mode a new file gets from
+    the umask (EG. 0644), which it keeps once renamed.
+
+    Args:
+        directory: Directory of the file being written.
+        name: Basename of the file being written.
+        suffix (optional): Suffix of the temporary file. Defaults to ``.part``.
+
+    Returns:
+        (fd, path) of the temporary file, as from :func:`tempfile.mkstemp`
+
+    Raises:
+        OSError: If the file can't be created.
+    """
+
+    # Created with os.open rather than mkstemp, so the kernel applies the
+    # current umask to the mode
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    for _ in range(tempfile.TMP_MAX):
+        temp_path = os.path.join(directory, f".{name}.{secrets.token_hex(4)}{suffix}")
+        try:
+            return os.open(temp_path, flags, 0o666), temp_path
+        except FileExistsError:
+            continue
+
+    raise FileExistsError(
+        errno.EEXIST, "No usable temporary file name found", directory
+    )
+
+
 __all__ = [
+    "EARTH_RADIUS",
     "get_translation_coordinate",
+    "get_translation_coordinates",
+    "get_distance_bearing",
     "split_filename",
+    "parse_filename",
+    "epoch_minute_to_datetime",
+    "datetime_to_epoch_minute",
+    "create_temp_file",
 ]
@@ -0,0 +1,340 @@
+import os
+import datetime
+import threading
+import numpy as np
+
+from loguru import logger
+from pytz import BaseTzInfo
+from typing import List, Optional
+
+from aus_weather_data.radar.common.catalog import BOMRadarCatalog, parse_frame_key
+from aus_weather_data.radar.common.frame import BOMRadarFrameMetadata, BOMRadarFramePNG
+from aus_weather_data.radar.common.index import BOMRadarFrameIndex, Frame
+from aus_weather_data.radar.common.location import BOMRadarLocationModel
+from aus_weather_data.radar.common.types import RADAR_TYPE
+from aus_weather_data.radar.common.utils import create_temp_file
+
+
+class BOMRadarArchive(object):
+    """On-disk archive of radar frames
+
+    Frames are stored in directories partitioned by radar, radar type and
+    UTC date, EG. ``IDR02/3/2024/10/15/IDR023.T.202410150000.png``.
+
+    The frames present are kept in a :class:`BOMRadarFrameIndex`, saved
+    in the archive root as an array of packed frame keys (8 bytes per
+    frame). Membership and time range queries use the index and never
+    list directories. The index is written by :meth:`flush`, which is
+    called when leaving a ``with`` block.
+
+    Before the first change after a flush, a marker file is written to
+    the archive root, and it is removed once the index is flushed. If
+    the process stops in between, the saved index is stale, so opening
+    the archive rebuilds it while the marker is there.
+
+    Attributes:
+        root: Root directory of the archive.
+    """
+
+    INDEX_FILENAME = "index.npy"
+    """Filename of the saved index in the archive root"""
+
+    DIRTY_FILENAME = "index.dirty"
+    """Filename of the marker of changes that aren't in the saved index"""
+
+    def __init__(self, root: str, locale_tz: Optional[BaseTzInfo] = None):
+        """Open or create an archive
+
+        The index is loaded from the archive root, or rebuilt by scanning
+        the archive if it hasn't been saved or is out of date.
+
+        Args:
+            root: Root directory of the archive. Created if it doesn't exist.
+            locale_tz (optional): :class:`pytz.timezone` object passed to the frames.
+        """
+
+        self.root = root
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._keys: Optional[np.ndarray] = None
+
+        # Number of changes under way, the marker stays until they are flushed
+        self._pending = 0
+
+        os.makedirs(root, exist_ok=True)
+        self._marked = os.path.exists(self._dirty_path)
+
+        if os.path.exists(self._index_path) and not self._marked:
+            keys = np.load(self._index_path)
+            self._index = BOMRadarFrameIndex.from_catalog(
+                BOMRadarCatalog.from_keys(keys), locale_tz=locale_tz
+            )
+        else:
+            self._index = BOMRadarFrameIndex(locale_tz=locale_tz)
+            self.rebuild_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, frame: object) -> bool:
+        return frame in self._index
+
+    def __str__(self) -> str:
+        return f"BOMRadarArchive<{self.root}, frames={len(self)}>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.root, self.INDEX_FILENAME)
+
+    @property
+    def _dirty_path(self) -> str:
+        return os.path.join(self.root, self.DIRTY_FILENAME)
+
+    def _begin_change(self):
+        """Mark the saved index out of date before changing the archive"""
+
+        with self._lock:
+            if not self._marked:
+                with open(self._dirty_path, "wb"):
+                    pass
+                self._marked = True
+            self._pending += 1
+
+    def _end_change(self, frame: Frame, added: Optional[bool]):
+        """Update the index after changing the archive
+
+        Args:
+            frame: The frame that changed.
+            added: True if it was saved, False if it was removed, None if the change failed.
+        """
+
+        with self._lock:
+            if added is not None:
+                if added:
+                    self._index.add(frame)
+                else:
+                    self._index.remove(frame)
+                self._keys = None
+                self._dirty = True
+            self._pending -= 1
+
+    def _get_sorted_keys(self) -> np.ndarray:
+        """Sorted packed keys of the frames in the archive, call with the lock held"""
+
+        if self._keys is None:
+            self._keys = np.sort(self._index.to_catalog().keys)
+        return self._keys
+
+    @property
+    def index(self) -> BOMRadarFrameIndex:
+        """Index of the frames in the archive."""
+
+        return self._index
+
+    def partition(self, frame: Frame) -> str:
+        """Directory the frame is stored in
+
+        Args:
+            frame: The radar frame.
+
+        Returns:
+            Path of the partition directory, EG. ``<root>/IDR02/3/2024/10/15``.
+        """
+
+        return os.path.join(
+            self.root,
+            frame.radar_id_str,
+            frame.radar_type_str,
+            frame.year_utc,
+            frame.month_utc,
+            frame.day_utc,
+        )
+
+    def path(self, frame: Frame) -> str:
+        """Path the frame is stored at
+
+        Args:
+            frame: The radar frame.
+
+        Returns:
+            Path of the frame PNG.
+        """
+
+        return os.path.join(self.partition(frame), frame.filename)
+
+    def save(self, frame: BOMRadarFramePNG) -> str:
+        """Save a frame to the archive
+
+        The PNG is written to a temporary file in the partition and
+        renamed into place, so a frame is never left half written.
+
+        Args:
+            frame: The radar frame, with PNG data loaded.
+
+        Returns:
+            Path of the saved frame.
+        """
+
+        partition = self.partition(frame)
+        os.makedirs(partition, exist_ok=True)
+
+        target = os.path.join(partition, frame.filename)
+        fd, temp_path = create_temp_file(partition, frame.filename)
+
+        self._begin_change()
+        added: Optional[bool] = None
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(frame.png_data)
+            os.replace(temp_path, target)
+            added = True
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        finally:
+            self._end_change(frame, added)
+
+        return target
+
+    def load(self, frame: Frame) -> BOMRadarFramePNG:
+        """Load a frame from the archive
+
+        Args:
+            frame: The radar frame to load.
+
+        Returns:
+            The frame with its PNG data loaded.
+
+        Raises:
+            FileNotFoundError: If the frame isn't in the archive.
+        """
+
+        png_frame = BOMRadarFramePNG.from_components(
+            frame.radar_index, frame.radar_type_str, frame.epoch_minute, frame.locale_tz
+        )
+        png_frame.load_png_from_file(self.partition(frame))
+        return png_frame
+
+    def remove(self, frame: Frame):
+        """Remove a frame from the archive
+
+        Args:
+            frame: The radar frame to remove. Frames not in the archive are ignored.
+        """
+
+        self._begin_change()
+        added: Optional[bool] = None
+        try:
+            os.remove(self.path(frame))
+            added = False
+        except FileNotFoundError:
+            added = False
+        finally:
+            self._end_change(frame, added)
+
+    def between(
+        self,
+        radar_location: BOMRadarLocationModel,
+        radar_type: RADAR_TYPE,
+        start_time_utc: Optional[datetime.datetime] = None,
+        end_time_utc: Optional[datetime.datetime] = None,
+    ) -> List[BOMRadarFrameMetadata]:
+        """Frames in the archive in a time range, see :meth:`BOMRadarFrameIndex.between`"""
+
+        return self._index.between(
+            radar_location, radar_type, start_time_utc, end_time_utc
+        )
+
+    def latest(
+        self,
+        radar_location: BOMRadarLocationModel,
+        radar_type: RADAR_TYPE,
+        count: int = 1,
+    ) -> List[BOMRadarFrameMetadata]:
+        """Latest frames in the archive, see :meth:`BOMRadarFrameIndex.latest`"""
+
+        return self._index.latest(radar_location, radar_type, count)
+
+    def missing(self, catalog: BOMRadarCatalog) -> BOMRadarCatalog:
+        """Frames in a catalog that aren't in the archive
+
+        Args:
+            catalog: Catalog of frames, EG. :attr:`BOMRadarListingTracker.catalog`.
+
+        Returns:
+            Catalog of the frames to download to bring the archive up to date.
+        """
+
+        with self._lock:
+            keys = self._get_sorted_keys()
+        if not len(keys):
+            return catalog
+
+        position = np.searchsorted(keys, catalog.keys).clip(0, len(keys) - 1)
+        return catalog.subset(keys[position] != catalog.keys)
+
+    def flush(self):
+        """Save the index to the archive root if it has changed"""
+
+        with self._lock:
+            if not self._dirty:
+                return
+
+            keys = self._get_sorted_keys()
+
+            fd, temp_path = create_temp_file(self.root, self.INDEX_FILENAME)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.save(f, keys)
+                os.replace(temp_path, self._index_path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+
+            self._dirty = False
+
+            # A change under way may not be in the saved index yet
+            if self._marked and not self._pending:
+                os.remove(self._dirty_path)
+                self._marked = False
+
+    def rebuild_index(self):
+        """Rebuild the index by scanning the archive
+
+        Use this after frames are added or removed outside the archive,
+        or if it was not flushed.
+        """
+
+        keys = []
+        for _, _, filenames in os.walk(self.root):
+            keys.extend(
+                parse_frame_key(filename)
+                for filename in filenames
+                if not filename.startswith(".")
+            )
+
+        catalog = BOMRadarCatalog.from_keys(
+            np.array([key for key in keys if key is not None], dtype=np.int64)
+        )
+        logger.info(f"Rebuilt archive index with {len(catalog)} frames")
+
+        with self._lock:
+            self._index = BOMRadarFrameIndex.from_catalog(
+                catalog, locale_tz=self._index.locale_tz
+            )
+            self._keys = None
+            self._dirty = True
+
+
+__all__ = [
+    "BOMRadarArchive",
+]
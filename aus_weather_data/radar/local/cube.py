@@ -0,0 +1,476 @@
+import os
+import datetime
+import numpy as np
+
+from loguru import logger
+from pytz import BaseTzInfo
+from typing import Iterable, List, Mapping, Optional, Tuple
+
+from aus_weather_data.exceptions import DecodeFrameError
+from aus_weather_data.radar.common.decode import BOMRadarBatchDecoder
+from aus_weather_data.radar.common.frame import BOMRadarFramePNG
+from aus_weather_data.radar.common.legend import (
+    BOMRadarLegend,
+    get_radar_type_legend,
+)
+from aus_weather_data.radar.common.location import (
+    BOMRadarLocationModel,
+    IDR_LOCATIONS,
+)
+from aus_weather_data.radar.common.png import decode_png, read_png_header
+from aus_weather_data.radar.common.types import RADAR_TYPE, RADAR_TYPE_MAP
+from aus_weather_data.radar.common.utils import (
+    create_temp_file,
+    datetime_to_epoch_minute,
+    epoch_minute_to_datetime,
+)
+from aus_weather_data.radar.local.archive import BOMRadarArchive
+
+PALETTE_SIZE = 256
+"""Palette entries kept per frame, the most a palette PNG can have"""
+
+
+class BOMRadarCube(object):
+    """Time stack of decoded frames for one radar and radar type
+
+    The palette indices of N frames are held in one ``(N, height, width)``
+    ``uint8`` array, oldest first, in ``<path>.<version>.npy``. It is
+    opened as a read-only :class:`numpy.memmap`, so reopening a cube is
+    instant and only the frames that are read are paged in. The time of
+    each frame and its palette are kept alongside in ``<path>.npz``,
+    which also names the version of the indices. Replacing the ``.npz``
+    is the single atomic step that commits a rebuilt cube.
+
+    Palettes differ between frames, so an index only has a meaning with
+    its frame's palette, EG. via :meth:`values`.
+
+    Build a cube with :meth:`build` or :meth:`from_archive`.
+
+    Attributes:
+        path: Path of the cube, without the ``.npz`` extension.
+        locale_tz: Timezone of the frame times.
+    """
+
+    def __init__(self, path: str, locale_tz: Optional[BaseTzInfo] = None):
+        """Open a cube
+
+        Args:
+            path: Path of the cube, without the ``.npz`` extension.
+            locale_tz (optional): :class:`pytz.timezone` object for the frame times.
+
+        Raises:
+            FileNotFoundError: If the cube doesn't exist.
+            ValueError: If the cube's files don't match.
+        """
+
+        self.path = path
+        self.locale_tz = locale_tz
+
+        for attempt in range(2):
+            with np.load(f"{path}.npz") as meta:
+                self._times: np.ndarray = meta["times"]
+                self._palettes: np.ndarray = meta["palettes"]
+                self._alphas: np.ndarray = meta["alphas"]
+                self._radar_index = int(meta["radar_index"])
+                self._type_code = chr(int(meta["type_code"]))
+                version = _version(meta)
+
+            try:
+                self._indices: np.ndarray = np.load(
+                    _indices_path(path, version), mmap_mode="r"
+                )
+                break
+            except FileNotFoundError:
+                # The cube was rebuilt after the .npz was read, read it again
+                if attempt:
+                    raise
+
+        if len(self._indices) != len(self._times):
+            raise ValueError(
+                f"Cube {path} has {len(self._indices)} frames but {len(self._times)} times"
+            )
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def __str__(self) -> str:
+        return (
+            f"BOMRadarCube<{self.radar_id.base}{self._type_code}, "
+            f"frames={len(self)}, shape={self.shape}>"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __getitem__(self, t: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(indices, palette, alpha) of frame `t`, as returned by :func:`decode_png`"""
+
+        return self._indices[t], self._palettes[t], self._alphas[t]
+
+    @property
+    def indices(self) -> np.ndarray:
+        """Read-only (frames, height, width) uint8 palette indices."""
+
+        return self._indices
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """(frames, height, width) of the cube."""
+
+        return tuple(self._indices.shape)
+
+    @property
+    def times(self) -> np.ndarray:
+        """int64 minutes since epoch (UTC) of each frame, ascending."""
+
+        return self._times
+
+    @property
+    def datetimes(self) -> List[datetime.datetime]:
+        """Time of each frame, in :attr:`locale_tz` if set, else UTC."""
+
+        dts = [epoch_minute_to_datetime(int(x)) for x in self._times]
+        if self.locale_tz is not None:
+            return [dt.astimezone(self.locale_tz) for dt in dts]
+        return dts
+
+    @property
+    def palettes(self) -> np.ndarray:
+        """(frames, 256, 3) uint8 palette of each frame, padded with black."""
+
+        return self._palettes
+
+    @property
+    def alphas(self) -> np.ndarray:
+        """(frames, 256) uint8 palette alpha of each frame, padded with 0."""
+
+        return self._alphas
+
+    @property
+    def radar_id(self) -> BOMRadarLocationModel:
+        """The radar location of the frames."""
+
+        return IDR_LOCATIONS[self._radar_index]
+
+    @property
+    def radar_type(self) -> RADAR_TYPE:
+        """The radar type of the frames."""
+
+        return RADAR_TYPE_MAP[self._type_code]
+
+    def between(
+        self,
+        start_time_utc: Optional[datetime.datetime] = None,
+        end_time_utc: Optional[datetime.datetime] = None,
+    ) -> slice:
+        """Slice of the frames in a time range
+
+        Args:
+            start_time_utc: Earliest frame time (inclusive). Defaults to None for no lower bound.
+            end_time_utc: Latest frame time (inclusive). Defaults to None for no upper bound.
+
+        Returns:
+            Slice of the frame axis, EG. for ``cube.indices[cube.between(start, end)]``.
+        """
+
+        start = 0
+        if start_time_utc:
+            minute = datetime_to_epoch_minute(start_time_utc, round_up=True)
+            start = int(np.searchsorted(self._times, minute, side="left"))
+
+        end = len(self._times)
+        if end_time_utc:
+            minute = datetime_to_epoch_minute(end_time_utc)
+            end = int(np.searchsorted(self._times, minute, side="right"))
+
+        return slice(start, end)
+
+    def values(self, t: int, legend: Optional[BOMRadarLegend] = None) -> np.ndarray:
+        """Physical values of frame `t`, see :meth:`BOMRadarLegend.convert`
+
+        Args:
+            t: Frame number.
+            legend (optional): Legend to convert with. Defaults to None for the legend of the radar type.
+
+        Returns:
+            (np.ndarray): float32 value of each pixel, NaN where there is no data
+
+        Raises:
+            ValueError: If no legend is given and the radar type has no default legend.
+        """
+
+        if legend is None:
+            legend = get_radar_type_legend(self.radar_type)
+
+        return legend.convert(self._indices[t], self._palettes[t], self._alphas[t])
+
+    @classmethod
+    def build(
+        cls,
+        path: str,
+        frames: Iterable[BOMRadarFramePNG],
+        decoder: Optional[BOMRadarBatchDecoder] = None,
+        locale_tz: Optional[BaseTzInfo] = None,
+        batch_size: int = 256,
+    ) -> "BOMRadarCube":
+        """Decode frames into a new cube, replacing any cube at `path`
+
+        Frames are sorted by time and a frame time seen twice is only
+        kept once. The oldest frame sets the size of the cube, a frame
+        that differs in size or can't be decoded is left out with a
+        warning. The indices are written to the next version's file and
+        the ``.npz`` to a temporary file renamed into place, so a cube is
+        never left half written or with mismatched files. The previous
+        version's indices are removed once the new cube is in place.
+
+        Args:
+            path: Path of the cube, without the ``.npz`` extension.
+            frames: Frames of one radar and radar type with PNG data loaded, EG. from :meth:`BOMRadarDownload.get_radar_frames`.
+            decoder (optional): Decoder to decode batches of frames across processes. Defaults to None to decode in this process.
+            locale_tz (optional): :class:`pytz.timezone` object for the frame times.
+            batch_size: Frames per batch sent to `decoder`. Defaults to 256.
+
+        Returns:
+            The opened cube.
+
+        Raises:
+            ValueError: If there are no PNG frames, or the frames are from more than one radar or radar type.
+        """
+
+        unique = {frame.epoch_minute: frame for frame in frames}
+        ordered = [unique[minute] for minute in sorted(unique)]
+        if not ordered:
+            raise ValueError("A cube needs at least one frame")
+
+        products = {(frame.radar_index, frame.radar_type_str) for frame in ordered}
+        if len(products) > 1:
+            raise ValueError(
+                f"A cube holds one radar and radar type, got {len(products)}"
+            )
+
+        shape = _first_shape(ordered)
+        radar_index, type_code = products.pop()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        previous = _current_version(path)
+        version, indices_path = _create_indices_file(path, (previous or 0) + 1)
+        compact_path = f"{indices_path}.compact"
+        meta_path: Optional[str] = None
+
+        try:
+            indices = np.lib.format.open_memmap(
+                indices_path, mode="w+", dtype=np.uint8, shape=(len(ordered), *shape)
+            )
+            palettes = np.zeros((len(ordered), PALETTE_SIZE, 3), dtype=np.uint8)
+            alphas = np.zeros((len(ordered), PALETTE_SIZE), dtype=np.uint8)
+
+            kept = _decode_into(ordered, indices, palettes, alphas, decoder, batch_size)
+
+            if len(kept) < len(ordered):
+                # Compact the cube over the frames that couldn't be decoded
+                compact = np.lib.format.open_memmap(
+                    compact_path,
+                    mode="w+",
+                    dtype=np.uint8,
+                    shape=(len(kept), *shape),
+                )
+                for position, t in enumerate(kept):
+                    compact[position] = indices[t]
+                del indices
+                compact.flush()
+                del compact
+                os.replace(compact_path, indices_path)
+            else:
+                indices.flush()
+                del indices
+
+            times = np.array([ordered[t].epoch_minute for t in kept], dtype=np.int64)
+            fd, meta_path = create_temp_file(
+                directory, os.path.basename(path), suffix=".npz.part"
+            )
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    times=times,
+                    palettes=palettes[kept],
+                    alphas=alphas[kept],
+                    radar_index=radar_index,
+                    type_code=ord(type_code),
+                    version=version,
+                )
+
+            # The single step that switches readers to the new version
+            os.replace(meta_path, f"{path}.npz")
+
+        except BaseException:
+            for leftover in (indices_path, compact_path, meta_path):
+                if leftover is not None and os.path.exists(leftover):
+                    os.unlink(leftover)
+            raise
+
+        if previous is not None:
+            try:
+                os.unlink(_indices_path(path, previous))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # EG. still mapped by an open cube on Windows
+                logger.warning(f"Couldn't remove the previous indices of {path}: {e}")
+
+        logger.info(f"Built cube {path} of {len(kept)} frames")
+        return cls(path, locale_tz=locale_tz)
+
+    @classmethod
+    def from_archive(
+        cls,
+        path: str,
+        archive: BOMRadarArchive,
+        radar_location: BOMRadarLocationModel,
+        radar_type: RADAR_TYPE,
+        start_time_utc: Optional[datetime.datetime] = None,
+        end_time_utc: Optional[datetime.datetime] = None,
+        decoder: Optional[BOMRadarBatchDecoder] = None,
+    ) -> "BOMRadarCube":
+        """Build a cube from the frames in an archive, see :meth:`build`
+
+        Args:
+            path: Path of the cube, without the ``.npz`` extension.
+            archive: The archive to read the frames from.
+            radar_location: The radar location.
+            radar_type: The radar type.
+            start_time_utc: Earliest frame time (inclusive). Defaults to None for no lower bound.
+            end_time_utc: Latest frame time (inclusive). Defaults to None for no upper bound.
+            decoder (optional): Decoder to decode batches of frames across processes. Defaults to None to decode in this process.
+
+        Returns:
+            The opened cube.
+        """
+
+        frames = archive.between(
+            radar_location, radar_type, start_time_utc, end_time_utc
+        )
+        return cls.build(
+            path,
+            (archive.load(frame) for frame in frames),
+            decoder=decoder,
+            locale_tz=archive.index.locale_tz,
+        )
+
+
+def _version(meta: Mapping[str, np.ndarray]) -> int:
+    """Version of the indices named by a cube's .npz, 0 for cubes from before versions"""
+
+    return int(meta["version"]) if "version" in meta else 0
+
+
+def _indices_path(path: str, version: int) -> str:
+    """Path of a version of a cube's indices"""
+
+    return f"{path}.npy" if version == 0 else f"{path}.{version}.npy"
+
+
+def _current_version(path: str) -> Optional[int]:
+    """Version of the cube at `path`, None if there isn't one"""
+
+    try:
+        with np.load(f"{path}.npz") as meta:
+            return _version(meta)
+    except FileNotFoundError:
+        return None
+
+
+def _create_indices_file(path: str, version: int) -> Tuple[int, str]:
+    """Create the indices file of the first free version from `version`
+
+    A build that didn't finish can leave a version's file behind, so
+    the file is created exclusively, with the mode a new file gets from
+    the umask, and the next version is tried if it exists.
+    """
+
+    while True:
+        indices_path = _indices_path(path, version)
+        try:
+            os.close(os.open(indices_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+            return version, indices_path
+        except FileExistsError:
+            version += 1
+
+
+def _first_shape(frames: List[BOMRadarFramePNG]) -> Tuple[int, int]:
+    """(height, width) of the first frame with a readable header"""
+
+    for frame in frames:
+        try:
+            return read_png_header(frame.png_data).shape
+        except DecodeFrameError as e:
+            logger.warning(f"Leaving {frame.filename} out of the cube: {e}")
+
+    raise ValueError("None of the frames are PNGs")
+
+
+def _decode_into(
+    frames: List[BOMRadarFramePNG],
+    indices: np.ndarray,
+    palettes: np.ndarray,
+    alphas: np.ndarray,
+    decoder: Optional[BOMRadarBatchDecoder],
+    batch_size: int,
+) -> List[int]:
+    """Decode frames into the cube arrays, returning the frame numbers that decoded"""
+
+    kept: List[int] = []
+
+    def keep(t: int, frame_palette: np.ndarray, frame_alpha: np.ndarray):
+        palettes[t, : len(frame_palette)] = frame_palette
+        alphas[t, : len(frame_alpha)] = frame_alpha
+        kept.append(t)
+
+    if decoder is None:
+        for t, frame in enumerate(frames):
+            try:
+                if read_png_header(frame.png_data).shape != indices.shape[1:]:
+                    raise DecodeFrameError("it differs in size")
+                _, frame_palette, frame_alpha = decode_png(
+                    frame.png_data, out=indices[t]
+                )
+            except DecodeFrameError as e:
+                logger.warning(f"Leaving {frame.filename} out of the cube: {e}")
+                continue
+            keep(t, frame_palette, frame_alpha)
+        return kept
+
+    for first in range(0, len(frames), batch_size):
+        with decoder.decode(frames[first : first + batch_size]) as batch:
+            for number, frame in enumerate(batch.frames):
+                t = first + number
+                try:
+                    frame_indices, frame_palette, frame_alpha = batch[number]
+                except DecodeFrameError as e:
+                    logger.warning(f"Leaving {frame.filename} out of the cube: {e}")
+                    continue
+
+                # A view of the batch kept past the batch would hold its whole
+                # block mapped (see BOMRadarDecodedBatch.close), copy it out
+                # and drop it even if the copy fails
+                try:
+                    fits = frame_indices.shape == indices.shape[1:]
+                    if fits:
+                        indices[t] = frame_indices
+                finally:
+                    del frame_indices
+
+                if not fits:
+                    logger.warning(
+                        f"Leaving {frame.filename} out of the cube: it differs in size"
+                    )
+                    continue
+                keep(t, frame_palette, frame_alpha)
+
+    return kept
+
+
+__all__ = [
+    "BOMRadarCube",
+    "PALETTE_SIZE",
+]
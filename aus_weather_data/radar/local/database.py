@@ -0,0 +1,366 @@
+import hashlib
+import datetime
+import sqlite3
+import threading
+import numpy as np
+
+from enum import Enum
+from pytz import BaseTzInfo
+from typing import Iterable, List, Optional, Tuple, Union
+
+from aus_weather_data.radar.common.catalog import BOMRadarCatalog, frame_key_sql
+from aus_weather_data.radar.common.frame import BOMRadarFrameMetadata, BOMRadarFramePNG
+from aus_weather_data.radar.common.index import Frame
+from aus_weather_data.radar.common.location import (
+    BOMRadarLocationModel,
+    IDR_INDEX_MAP,
+)
+from aus_weather_data.radar.common.types import RADAR_TYPE
+from aus_weather_data.radar.common.utils import datetime_to_epoch_minute
+
+
+class FRAME_STATUS(Enum):
+    """
+    Enum class for the status of a frame in :class:`BOMRadarFrameDatabase`
+    """
+
+    LISTED = "listed"
+    """
+    Seen on the FTP listing, not stored locally
+    """
+
+    STORED = "stored"
+    """
+    Stored locally
+    """
+
+    FAILED = "failed"
+    """
+    Download failed
+    """
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS frames (
+    radar INTEGER NOT NULL,
+    product TEXT NOT NULL,
+    epoch INTEGER NOT NULL,
+    size INTEGER,
+    checksum TEXT,
+    status TEXT NOT NULL,
+    PRIMARY KEY (radar, product, epoch)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS frames_status ON frames (status, radar, product, epoch);
+"""
+
+# Packed frame key (see pack_frame_key) computed in SQL
+_KEY = frame_key_sql("radar", "unicode(product)", "epoch")
+
+
+class BOMRadarFrameDatabase(object):
+    """SQLite database of remote and local radar frames
+
+    Records every frame seen on the FTP listing and every frame stored
+    locally, with its size, checksum and :class:`FRAME_STATUS`. Frames
+    are keyed on (radar, product, epoch): the radar location index (see
+    :data:`IDR_LOCATIONS`), the radar type code and minutes since epoch.
+    Queries return :class:`BOMRadarCatalog` objects.
+
+    The database can be shared between threads.
+    """
+
+    def __init__(self, path: str = ":memory:", locale_tz: Optional[BaseTzInfo] = None):
+        """Open or create a database
+
+        Args:
+            path: Path of the SQLite database file. Defaults to an in-memory database.
+            locale_tz (optional): :class:`pytz.timezone` object passed to the catalogs.
+        """
+
+        self.path = path
+        self.locale_tz = locale_tz
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM frames").fetchone()[0])
+
+    def __contains__(self, frame: object) -> bool:
+        if not isinstance(frame, (BOMRadarFrameMetadata, BOMRadarFramePNG)):
+            return False
+
+        return self.status(frame) is not None
+
+    def __str__(self) -> str:
+        return f"BOMRadarFrameDatabase<{self.path}>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def close(self):
+        """Close the database"""
+
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _rows(catalog: BOMRadarCatalog) -> Iterable[Tuple[int, str, int]]:
+        """(radar, product, epoch) rows for a catalog"""
+
+        return zip(
+            catalog.radar_index.tolist(),
+            map(chr, catalog.type_code.tolist()),
+            catalog.epoch_minute.tolist(),
+        )
+
+    @staticmethod
+    def _row(frame: Frame) -> Tuple[int, str, int]:
+        return frame.radar_index, frame.radar_type_str, frame.epoch_minute
+
+    def update_listing(
+        self,
+        added: BOMRadarCatalog,
+        removed: Optional[BOMRadarCatalog] = None,
+        replace: bool = False,
+    ):
+        """Record changes to the FTP listing
+
+        New frames are recorded as :attr:`FRAME_STATUS.LISTED`, frames
+        already in the database are left as they are. Frames that have
+        gone from the listing are dropped unless they are stored, so a
+        failed frame is only retried while it is listed.
+
+        Args:
+            added: Frames new to the listing.
+            removed: Frames gone from the listing. Defaults to None.
+            replace: `added` is the whole listing, drop every other frame that isn't stored. Defaults to False.
+        """
+
+        with self._lock, self._conn:
+            if replace:
+                self._conn.execute(
+                    "DELETE FROM frames WHERE status = ?",
+                    (FRAME_STATUS.LISTED.value,),
+                )
+                # Failed frames that are still listed keep their status
+                self._conn.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS listing (key INTEGER PRIMARY KEY)"
+                )
+                self._conn.execute("DELETE FROM temp.listing")
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO temp.listing (key) VALUES (?)",
+                    ((key,) for key in added.keys.tolist()),
+                )
+                self._conn.execute(
+                    f"DELETE FROM frames WHERE status = ? AND {_KEY} "
+                    "NOT IN (SELECT key FROM temp.listing)",
+                    (FRAME_STATUS.FAILED.value,),
+                )
+                self._conn.execute("DELETE FROM temp.listing")
+
+            if removed is not None:
+                self._conn.executemany(
+                    "DELETE FROM frames WHERE radar = ? AND product = ? AND epoch = ? "
+                    f"AND status != '{FRAME_STATUS.STORED.value}'",
+                    self._rows(removed),
+                )
+
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO frames (radar, product, epoch, status) "
+                f"VALUES (?, ?, ?, '{FRAME_STATUS.LISTED.value}')",
+                self._rows(added),
+            )
+
+    def mark_stored(
+        self,
+        frame: Frame,
+        data: Optional[Union[bytes, memoryview]] = None,
+        size: Optional[int] = None,
+        checksum: Optional[str] = None,
+    ):
+        """Record a frame as stored locally
+
+        Args:
+            frame: The radar frame.
+            data: PNG data, used for the size and SHA-256 checksum. Defaults to the frame's PNG data if it has any.
+            size: Size in bytes if `data` isn't available. Defaults to None.
+            checksum: SHA-256 hex digest if `data` isn't available. Defaults to None.
+        """
+
+        if data is None and isinstance(frame, BOMRadarFramePNG):
+            try:
+                data = frame.png_data
+            except ValueError:
+                pass
+
+        if data is not None:
+            size = len(data)
+            checksum = hashlib.sha256(data).hexdigest()
+
+        self._set_status(frame, FRAME_STATUS.STORED, size, checksum)
+
+    def mark_failed(self, frame: Frame):
+        """Record a frame as failed to download
+
+        Args:
+            frame: The radar frame.
+        """
+
+        self._set_status(frame, FRAME_STATUS.FAILED, None, None)
+
+    def _set_status(
+        self,
+        frame: Frame,
+        status: FRAME_STATUS,
+        size: Optional[int],
+        checksum: Optional[str],
+    ):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO frames "
+                "(radar, product, epoch, size, checksum, status) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (*self._row(frame), size, checksum, status.value),
+            )
+
+    def remove(self, frame: Frame):
+        """Remove a frame from the database
+
+        Args:
+            frame: The radar frame.
+        """
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM frames WHERE radar = ? AND product = ? AND epoch = ?",
+                self._row(frame),
+            )
+
+    def status(self, frame: Frame) -> Optional[FRAME_STATUS]:
+        """Status of a frame
+
+        Args:
+            frame: The radar frame.
+
+        Returns:
+            The frame's status, or None if it isn't in the database.
+        """
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM frames WHERE radar = ? AND product = ? AND epoch = ?",
+                self._row(frame),
+            ).fetchone()
+
+        return FRAME_STATUS(row[0]) if row else None
+
+    def info(self, frame: Frame) -> Optional[Tuple[Optional[int], Optional[str]]]:
+        """Size and checksum of a frame
+
+        Args:
+            frame: The radar frame.
+
+        Returns:
+            (size, SHA-256 hex digest), or None if the frame isn't in the database.
+        """
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, checksum FROM frames "
+                "WHERE radar = ? AND product = ? AND epoch = ?",
+                self._row(frame),
+            ).fetchone()
+
+        return (row[0], row[1]) if row else None
+
+    def query(
+        self,
+        radar_locations: Optional[List[BOMRadarLocationModel]] = None,
+        radar_types: Optional[List[RADAR_TYPE]] = None,
+        start_time_utc: Optional[datetime.datetime] = None,
+        end_time_utc: Optional[datetime.datetime] = None,
+        status: Optional[List[FRAME_STATUS]] = None,
+        exclude_status: Optional[List[FRAME_STATUS]] = None,
+    ) -> BOMRadarCatalog:
+        """Frames matching the given filters
+
+        Args:
+            radar_locations: The radar(s) to match.
+            radar_types: The radar types to match.
+            start_time_utc: Earliest frame time to match (inclusive).
+            end_time_utc: Latest frame time to match (inclusive).
+            status: Statuses to match. Defaults to None for any status.
+            exclude_status: Statuses to exclude. Defaults to None.
+
+        Returns:
+            Catalog of the matching frames, sorted by radar, product then time.
+        """
+
+        where: List[str] = []
+        params: List[Union[int, str]] = []
+
+        def add_in(column: str, values: List[Union[int, str]], negate: bool = False):
+            where.append(
+                f"{column} {'NOT ' if negate else ''}IN "
+                f"({', '.join('?' * len(values))})"
+            )
+            params.extend(values)
+
+        if radar_locations:
+            add_in(
+                "radar",
+                [
+                    IDR_INDEX_MAP[location.base]
+                    for location in radar_locations
+                    if isinstance(location, BOMRadarLocationModel)
+                ],
+            )
+
+        if radar_types:
+            add_in(
+                "product",
+                [
+                    radar_type.value
+                    for radar_type in radar_types
+                    if isinstance(radar_type, RADAR_TYPE)
+                ],
+            )
+
+        if start_time_utc:
+            where.append("epoch >= ?")
+            params.append(datetime_to_epoch_minute(start_time_utc, round_up=True))
+
+        if end_time_utc:
+            where.append("epoch <= ?")
+            params.append(datetime_to_epoch_minute(end_time_utc))
+
+        if status:
+            add_in("status", [x.value for x in status])
+
+        if exclude_status:
+            add_in("status", [x.value for x in exclude_status], negate=True)
+
+        sql = f"SELECT {_KEY} FROM frames"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY radar, product, epoch"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        keys = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        return BOMRadarCatalog.from_keys(keys, locale_tz=self.locale_tz)
+
+
+__all__ = [
+    "BOMRadarFrameDatabase",
+    "FRAME_STATUS",
+]
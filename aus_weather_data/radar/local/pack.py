@@ -0,0 +1,293 @@
+import os
+import mmap
+import zlib
+import datetime
+import numpy as np
+
+from pytz import BaseTzInfo
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from aus_weather_data.radar.common.catalog import (
+    BOMRadarCatalog,
+    pack_frame_key,
+    unpack_frame_key,
+)
+from aus_weather_data.radar.common.frame import BOMRadarFrameMetadata, BOMRadarFramePNG
+from aus_weather_data.radar.common.index import Frame
+from aus_weather_data.radar.common.location import BOMRadarLocationModel
+from aus_weather_data.radar.common.types import RADAR_TYPE
+
+PACK_INDEX_DTYPE = np.dtype(
+    [("key", "<i8"), ("offset", "<u8"), ("length", "<u4"), ("crc", "<u4")]
+)
+"""Fixed width (24 byte) index record: packed frame key, data offset, length and CRC-32"""
+
+
+def _frame_key(frame: Frame) -> int:
+    return pack_frame_key(
+        frame.radar_index, ord(frame.radar_type_str), frame.epoch_minute
+    )
+
+
+class BOMRadarFramePack(object):
+    """Append-only container of radar frame PNGs
+
+    A pack is two files: ``<path>.data`` holding the PNGs back to back,
+    and ``<path>.idx`` holding a :data:`PACK_INDEX_DTYPE` record per
+    frame. Frames are read through a memory map of the data file, so a
+    loaded :class:`BOMRadarFramePNG` holds a :class:`memoryview` slice
+    of the map rather than a copy (see :meth:`BOMRadarFramePNG.detach`).
+
+    Each frame's data is written before its index record, so an
+    interrupted append leaves at most a partial tail that is dropped
+    when the pack is next opened. A frame is only stored once, appending
+    a frame already in the pack does nothing.
+
+    Attributes:
+        path: Path of the pack, without the ``.data`` / ``.idx`` extension.
+        locale_tz: Timezone passed to the frames loaded from the pack.
+    """
+
+    def __init__(self, path: str, locale_tz: Optional[BaseTzInfo] = None):
+        """Open or create a pack
+
+        Args:
+            path: Path of the pack, without the ``.data`` / ``.idx`` extension.
+            locale_tz (optional): :class:`pytz.timezone` object passed to the frames.
+        """
+
+        self.path = path
+        self.locale_tz = locale_tz
+
+        self._data_file = open(f"{path}.data", "ab")
+        self._index_file = open(f"{path}.idx", "ab")
+        self._mmap: Optional[mmap.mmap] = None
+
+        records = self._recover()
+        order = np.argsort(records["key"], kind="stable")
+        self._records = records[order]
+
+        # Appended since the sorted records were last rebuilt
+        self._pending: Dict[int, Tuple[int, int, int]] = {}
+
+    def _recover(self) -> np.ndarray:
+        """Load the index, dropping any partial tail from an interrupted append"""
+
+        data_size = os.path.getsize(f"{self.path}.data")
+        count = os.path.getsize(f"{self.path}.idx") // PACK_INDEX_DTYPE.itemsize
+        records = np.fromfile(f"{self.path}.idx", dtype=PACK_INDEX_DTYPE, count=count)
+
+        ends = records["offset"] + records["length"]
+        beyond = np.flatnonzero(ends > data_size)
+        valid = int(beyond[0]) if len(beyond) else len(records)
+
+        records = records[:valid]
+        self._data_size = int(ends[:valid].max()) if valid else 0
+
+        self._index_file.truncate(valid * PACK_INDEX_DTYPE.itemsize)
+        self._data_file.truncate(self._data_size)
+
+        return records
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._records) + len(self._pending)
+
+    def __contains__(self, frame: object) -> bool:
+        if not isinstance(frame, (BOMRadarFrameMetadata, BOMRadarFramePNG)):
+            return False
+
+        return self._find(_frame_key(frame)) is not None
+
+    def __str__(self) -> str:
+        return f"BOMRadarFramePack<{self.path}, frames={len(self)}>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def _merge_pending(self):
+        """Merge appended records into the sorted records"""
+
+        if not self._pending:
+            return
+
+        pending = np.array(
+            [(key, *record) for key, record in self._pending.items()],
+            dtype=PACK_INDEX_DTYPE,
+        )
+        records = np.concatenate([self._records, pending])
+        self._records = records[np.argsort(records["key"], kind="stable")]
+        self._pending = {}
+
+    def _find(self, key: int) -> Optional[Tuple[int, int, int]]:
+        """(offset, length, crc) of a frame key, or None if it isn't in the pack"""
+
+        keys = self._records["key"]
+        position = int(np.searchsorted(keys, key))
+        if position < len(keys) and keys[position] == key:
+            record = self._records[position]
+            return int(record["offset"]), int(record["length"]), int(record["crc"])
+
+        return self._pending.get(key)
+
+    def _view(self, end: int) -> memoryview:
+        """View of the data file, mapped up to at least `end`"""
+
+        if end == 0:
+            return memoryview(b"")
+
+        if self._mmap is None or len(self._mmap) < end:
+            # Views of the old map keep it alive until they are dropped
+            self._data_file.flush()
+            with open(f"{self.path}.data", "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return memoryview(self._mmap)
+
+    def append(self, frame: BOMRadarFramePNG) -> bool:
+        """Append a frame to the pack
+
+        Args:
+            frame: The radar frame, with PNG data loaded.
+
+        Returns:
+            True if the frame was added, False if it was already in the pack.
+        """
+
+        key = _frame_key(frame)
+        if self._find(key) is not None:
+            return False
+
+        data = frame.png_data
+        offset = self._data_size
+        crc = zlib.crc32(data)
+
+        self._data_file.write(data)
+        self._data_file.flush()
+
+        record = np.array([(key, offset, len(data), crc)], dtype=PACK_INDEX_DTYPE)
+        self._index_file.write(record.tobytes())
+        self._index_file.flush()
+
+        self._data_size += len(data)
+        self._pending[key] = (offset, len(data), crc)
+        if len(self._pending) >= 4096:
+            self._merge_pending()
+
+        return True
+
+    def extend(self, frames: Iterable[BOMRadarFramePNG]) -> int:
+        """Append frames to the pack
+
+        Args:
+            frames: The radar frames, with PNG data loaded.
+
+        Returns:
+            Number of frames added.
+        """
+
+        return sum(self.append(frame) for frame in frames)
+
+    def load(self, frame: Frame, verify: bool = False) -> BOMRadarFramePNG:
+        """Load a frame from the pack
+
+        Args:
+            frame: The radar frame to load.
+            verify: Check the data against the stored CRC-32. Defaults to False.
+
+        Returns:
+            The frame, holding a view of the pack's memory map.
+
+        Raises:
+            KeyError: If the frame isn't in the pack.
+            ValueError: If `verify` is set and the data is corrupt.
+        """
+
+        key = _frame_key(frame)
+        record = self._find(key)
+        if record is None:
+            raise KeyError(frame.filename)
+
+        return self._load(key, *record, verify=verify)
+
+    def _load(
+        self, key: int, offset: int, length: int, crc: int, verify: bool = False
+    ) -> BOMRadarFramePNG:
+        data = self._view(offset + length)[offset : offset + length]
+        if verify and zlib.crc32(data) != crc:
+            raise ValueError(f"CRC mismatch for frame key {key} in {self.path}")
+
+        radar_index, type_code, epoch_minute = unpack_frame_key(key)
+        png_frame = BOMRadarFramePNG.from_components(
+            radar_index, chr(type_code), epoch_minute, self.locale_tz
+        )
+        png_frame.load_png_data(data)
+        return png_frame
+
+    @property
+    def catalog(self) -> BOMRadarCatalog:
+        """Catalog of the frames in the pack, sorted by frame key."""
+
+        self._merge_pending()
+        return BOMRadarCatalog.from_keys(
+            self._records["key"].copy(), locale_tz=self.locale_tz
+        )
+
+    def frames(
+        self,
+        radar_location: Optional[BOMRadarLocationModel] = None,
+        radar_type: Optional[RADAR_TYPE] = None,
+        start_time_utc: Optional[datetime.datetime] = None,
+        end_time_utc: Optional[datetime.datetime] = None,
+    ) -> Iterator[BOMRadarFramePNG]:
+        """Iterate over frames in the pack, oldest first
+
+        Args:
+            radar_location: The radar to match. Defaults to None for all radars.
+            radar_type: The radar type to match. Defaults to None for all radar types.
+            start_time_utc: Earliest frame time (inclusive). Defaults to None for no lower bound.
+            end_time_utc: Latest frame time (inclusive). Defaults to None for no upper bound.
+
+        Yields:
+            Frames holding views of the pack's memory map.
+        """
+
+        self._merge_pending()
+        mask = self.catalog.mask(
+            radar_locations=[radar_location] if radar_location else None,
+            radar_types=[radar_type] if radar_type else None,
+            start_time_utc=start_time_utc,
+            end_time_utc=end_time_utc,
+        )
+        records = self._records[mask]
+
+        # Keys sort by time first, then by radar and type
+        for key, offset, length, crc in zip(
+            records["key"].tolist(),
+            records["offset"].tolist(),
+            records["length"].tolist(),
+            records["crc"].tolist(),
+        ):
+            yield self._load(key, offset, length, crc)
+
+    def close(self):
+        """Close the pack files
+
+        Frames loaded from the pack keep the memory map open until they
+        are dropped or detached.
+        """
+
+        self._data_file.close()
+        self._index_file.close()
+        self._mmap = None
+
+
+__all__ = [
+    "BOMRadarFramePack",
+    "PACK_INDEX_DTYPE",
+]
@@ -1,14 +1,16 @@
+import os
+import time
 import ftplib
-import threading
+import hashlib
 
-from io import BytesIO
 from loguru import logger
-from typing import List
+from typing import List, Optional
 
 from aus_weather_data.radar.common.frame import (
     BOMRadarFrameMetadata,
     BOMRadarFramePNG,
 )
+from aus_weather_data.radar.common.utils import create_temp_file
 
 from aus_weather_data.constants import (
     BOM_FTP_HOST,
@@ -24,17 +26,27 @@ class BOMFTPConn(object):
 
     This is a class to make a single ftp connection to BOM. It can be
     used to download radar frames.
+
+    The connection doesn't keep itself alive, :class:`BOMFTPPool` sends
+    :meth:`keep_alive` to idle pooled connections.
+
+    Files are downloaded into a buffer owned by the connection, which is
+    reused for the next download once nothing holds a view of it. Frames
+    that are kept still need their own copy of the data, so only callers
+    that drop each frame before the next download (EG.
+    :meth:`BOMRadarDownload.iter_radar_frames`) avoid allocating per frame.
     """
 
-    _ftp_conn: ftplib.FTP
-    _keep_alive_thread: threading.Thread
-    _file_buffer: None
+    _ftp_conn: Optional[ftplib.FTP]
 
     def __init__(self) -> None:
         """
         Instantiate the FTP Host connection.
         """
         super(BOMFTPConn, self).__init__()
+        self._ftp_conn = None
+        self._last_activity = time.monotonic()
+        self._buffer = bytearray()
 
     def __enter__(self):
         """
@@ -57,35 +69,59 @@ class BOMFTPConn(object):
         self._ftp_conn = ftplib.FTP(BOM_FTP_HOST, BOM_FTP_USER, BOM_FTP_PASS)
 
         self._ftp_conn.sendcmd("TYPE I")
-
-        # Timer for keep alive
-        self._keep_alive_thread = threading.Timer(60.0, self._keep_alive)
+        self._last_activity = time.monotonic()
 
     def quit(self):
         """
         Close the FTP connection
         """
 
-        if self._keep_alive_thread:
-            self._keep_alive_thread.cancel()
-            self._keep_alive_thread = None
+        if self._ftp_conn is None:
+            return
 
         try:
             self._ftp_conn.quit()
-            self._ftp_conn = None
         except ftplib.all_errors as e:
-            logger.exception(e)
+            logger.debug(f"Error closing FTP connection: {e}")
+            self._ftp_conn.close()
+        finally:
             self._ftp_conn = None
 
-    def _keep_alive(self):
+    @property
+    def _ftp(self) -> ftplib.FTP:
+        """The open FTP connection, raises :class:`ftplib.Error` if it is closed"""
+
+        if self._ftp_conn is None:
+            raise ftplib.Error("FTP connection is not open")
+        return self._ftp_conn
+
+    @property
+    def last_activity(self) -> float:
+        """:func:`time.monotonic` time of the last successful command."""
+
+        return self._last_activity
+
+    def keep_alive(self) -> bool:
         """
         Keep the FTP connection alive
+
+        Sends a NOOP to the server.
+
+        Returns:
+            True if the connection is alive, False if it has failed.
         """
 
+        if self._ftp_conn is None:
+            return False
+
         try:
-            self._ftp_conn.pwd()
+            self._ftp_conn.voidcmd("NOOP")
         except ftplib.all_errors as e:
-            logger.exception(e)
+            logger.debug(f"FTP keep alive failed: {e}")
+            return False
+
+        self._last_activity = time.monotonic()
+        return True
 
     def get_directory_contents(self, directory: str = BOM_RADAR_PATH) -> List[str]:
         """Get the contents of the given directory.
@@ -98,16 +134,63 @@ class BOMFTPConn(object):
         """
 
         try:
-            return self._ftp_conn.nlst(directory)
+            contents = self._ftp.nlst(directory)
+            self._last_activity = time.monotonic()
+            return contents
         except ftplib.all_errors as e:
             logger.exception(e)
             return []
 
-    def get_file(self, remote_file: BOMRadarFrameMetadata) -> BOMRadarFramePNG:
+    def _retrieve(self, filename: str) -> memoryview:
+        """Download a file from the radar directory into the connection buffer
+
+        Args:
+            filename: The filename to download.
+
+        Returns:
+            A view of the file data in the buffer.
+        """
+
+        buffer = self._buffer
+        try:
+            # Resizing fails while views of a previous download are alive,
+            # in which case they keep that buffer and this one starts afresh.
+            # Shrinking then regrowing by a byte never reallocates.
+            if buffer:
+                buffer.append(buffer.pop())
+        except BufferError:
+            buffer = self._buffer = bytearray(len(buffer))
+
+        size = 0
+
+        def write(chunk: bytes):
+            # Copy through memoryviews, slice assignment of bytes into a
+            # bytearray makes a temporary copy of the chunk first
+            nonlocal size
+            fit = min(len(chunk), len(buffer) - size)
+            with memoryview(chunk) as data:
+                if fit > 0:
+                    with memoryview(buffer) as view:
+                        view[size : size + fit] = data[:fit]
+                if fit < len(chunk):
+                    buffer.extend(data[fit:])
+            size += len(chunk)
+
+        self._ftp.retrbinary(f"RETR {BOM_RADAR_PATH}/{filename}", write)
+        self._last_activity = time.monotonic()
+        return memoryview(buffer)[:size]
+
+    def get_file(
+        self, remote_file: BOMRadarFrameMetadata, reuse_buffer: bool = False
+    ) -> BOMRadarFramePNG:
         """Get the contents of the given file.
 
         Args:
             filename: The filename to get the contents of.
+            reuse_buffer: Hold the data as a :class:`memoryview` of the connection
+                buffer rather than copying it out. Call :meth:`BOMRadarFramePNG.detach`
+                on frames that are kept, so the buffer can be reused. Defaults to False,
+                which copies the data out once, the same as detaching straight away.
 
         Returns:
             The contents of the given file as bytes.
@@ -117,21 +200,89 @@ class BOMFTPConn(object):
         """
 
         try:
-            byte_stream = BytesIO()
-            self._ftp_conn.retrbinary(
-                f"RETR {BOM_RADAR_PATH}/{remote_file.filename}", byte_stream.write
-            )
+            data = self._retrieve(remote_file.filename)
             png_frame = BOMRadarFramePNG(
                 remote_file.filename,
                 locale_tz=remote_file.locale_tz,
             )
 
-            png_frame.load_png_data(byte_stream.getvalue())
+            if reuse_buffer:
+                png_frame.load_png_data(data)
+            else:
+                png_frame.load_png_data(data.tobytes())
+                data.release()
+
             return png_frame
 
         except ftplib.all_errors as e:
             logger.exception(e)
-            raise IOError(f"Failed to get file {remote_file.filename} from FTP: {e}")
+            raise IOError(
+                f"Failed to get file {remote_file.filename} from FTP: {e}"
+            ) from e
+
+    def download_file(
+        self,
+        remote_file: BOMRadarFrameMetadata,
+        path: str,
+        digest: Optional["hashlib._Hash"] = None,
+    ) -> str:
+        """Download the given file straight to disk.
+
+        The data is streamed into a temporary file in `path` and renamed
+        into place once complete, so the file is never left half written.
+
+        Args:
+            remote_file: The file to download.
+            path: Directory to save the file to.
+            digest (optional): :mod:`hashlib` object updated with the data as it is written, EG. ``hashlib.sha256()``. Defaults to None.
+
+        Returns:
+            Path of the saved file.
+
+        Raises:
+            IOError: If the file cannot be retrieved, caused by the :mod:`ftplib` error.
+            OSError: If the file cannot be written, EG. the disk is full. The connection is still usable.
+        """
+
+        target = os.path.join(path, remote_file.filename)
+        fd, temp_path = create_temp_file(path, remote_file.filename)
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write_error: Optional[OSError] = None
+
+                def write(chunk: bytes):
+                    # Keep reading after a local error, so the transfer
+                    # completes and the connection stays in step
+                    nonlocal write_error
+                    if write_error is None:
+                        try:
+                            f.write(chunk)
+                        except OSError as e:
+                            write_error = e
+                        if digest is not None:
+                            digest.update(chunk)
+
+                try:
+                    self._ftp.retrbinary(
+                        f"RETR {BOM_RADAR_PATH}/{remote_file.filename}", write
+                    )
+                except ftplib.all_errors as e:
+                    logger.exception(e)
+                    raise IOError(
+                        f"Failed to download file {remote_file.filename} from FTP: {e}"
+                    ) from e
+
+                self._last_activity = time.monotonic()
+                if write_error is not None:
+                    raise write_error
+
+            os.replace(temp_path, target)
+            return target
+
+        except BaseException:
+            os.unlink(temp_path)
+            raise
 
     def get_files(
         self, remote_files: List[BOMRadarFrameMetadata]
@@ -1,28 +1,183 @@
+import os
+import queue
+import hashlib
 import datetime
+import threading
+import time
+import numpy as np
 
-from typing import Optional, List, Dict
+from collections import deque
+from itertools import islice
+from typing import (
+    Callable,
+    Deque,
+    Iterator,
+    Optional,
+    List,
+    Dict,
+    Tuple,
+    TypeVar,
+    Union,
+)
 from loguru import logger
 
-from pytz import BaseTzInfo
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 
 from aus_weather_data.radar.common.types import RADAR_TYPE
 from aus_weather_data.radar.common.location import BOMRadarLocationModel
+from aus_weather_data.radar.common.catalog import BOMRadarCatalog
 from aus_weather_data.radar.common.frame import BOMRadarFramePNG, BOMRadarFrameMetadata
+from aus_weather_data.radar.common.decode import (
+    BOMRadarBatchDecoder,
+    BOMRadarDecodedBatch,
+)
+from aus_weather_data.radar.local.database import BOMRadarFrameDatabase, FRAME_STATUS
 from aus_weather_data.radar.remote.pool import BOMFTPPool
-from aus_weather_data.radar.remote.utils import get_matching_files
+from aus_weather_data.radar.remote.conn import BOMFTPConn
+from aus_weather_data.radar.remote.listing import BOMRadarListingTracker
+from aus_weather_data.radar.remote.retry import RetryPolicy
 
+_T = TypeVar("_T")
 
-class BOMRadarDownload(BOMFTPPool):
+# A downloaded frame, or the error if it failed
+_Fetched = Tuple[BOMRadarFrameMetadata, Union[BOMRadarFramePNG, BaseException]]
+# A decoded batch and the remote file of each of its frames
+_Decoded = Tuple[List[BOMRadarFrameMetadata], BOMRadarDecodedBatch]
+
+
+class _PipelineStopped(Exception):
+    """Raised in a pipeline stage when another stage has stopped"""
+
+
+def _put(pipe: "queue.Queue[_T]", item: _T, stop: threading.Event) -> bool:
+    """Put an item on a bounded queue, giving up if the pipeline stops"""
+
+    while not stop.is_set():
+        try:
+            pipe.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get(pipe: "queue.Queue[_T]", stop: threading.Event) -> _T:
+    """Get an item from a queue, raising :class:`_PipelineStopped` if the pipeline stops"""
+
+    while not stop.is_set():
+        try:
+            return pipe.get(timeout=0.1)
+        except queue.Empty:
+            pass
+    raise _PipelineStopped()
+
+
+class BOMRadarDownloadReport(object):
+    """Result of downloading a batch of radar frames
+
+    A failed frame doesn't abort the batch, it is recorded here with the
+    error from its last attempt.
+
+    Attributes:
+        frames: The downloaded frames, in request order.
+        failures: (frame, error) pairs for the frames that couldn't be downloaded.
+    """
 
-    _progress = {"total": 0, "current": 0}
+    def __init__(
+        self,
+        frames: List[BOMRadarFramePNG],
+        failures: List[Tuple[BOMRadarFrameMetadata, BaseException]],
+    ):
+        """Initialise the download report
 
-    def __init__(self, connections_count: int = 10) -> None:
+        Args:
+            frames: The downloaded frames.
+            failures: (frame, error) pairs for the failed frames.
+        """
+
+        self.frames = frames
+        self.failures = failures
+
+    def __str__(self) -> str:
+        return f"BOMRadarDownloadReport<frames={len(self.frames)}, failures={len(self.failures)}>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def ok(self) -> bool:
+        """True if every frame was downloaded."""
+
+        return not self.failures
+
+    @property
+    def failed_frames(self) -> List[BOMRadarFrameMetadata]:
+        """The frames that couldn't be downloaded, EG. to retry later."""
+
+        return [frame for frame, _ in self.failures]
+
+
+class BOMRadarDownload(BOMFTPPool):
+    def __init__(
+        self,
+        connections_count: int = 10,
+        timeout: Optional[float] = 60.0,
+        min_connections: int = 0,
+        idle_timeout: Optional[float] = 300.0,
+        keep_alive_interval: Optional[float] = 60.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        database: Optional[BOMRadarFrameDatabase] = None,
+    ) -> None:
         """
         Initiate the Radar Download FTP connection.
+
+        Args:
+            connections_count: Maximum number of FTP connections to download with. Defaults to 10.
+            timeout: Seconds to wait for a free connection. Defaults to 60. None waits forever.
+            min_connections: Number of FTP connections kept open while idle. Defaults to 0.
+            idle_timeout: Seconds before an idle connection above `min_connections` is closed. Defaults to 300.
+            keep_alive_interval: Seconds between keep alive passes over idle connections. Defaults to 60.
+            retry_policy: Retry policy for frame downloads. Defaults to :class:`RetryPolicy` defaults.
+            database: Database to record the listing and downloads in. Frames stored in it aren't downloaded again. Defaults to None.
         """
         self._connections_count = connections_count
-        super().__init__(connections=connections_count)
+        self._database = database
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._last_report: Optional[BOMRadarDownloadReport] = None
+        self._listing = BOMRadarListingTracker()
+        self._progress = {"total": 0, "current": 0}
+        self._progress_lock = threading.Lock()
+        super().__init__(
+            connections=connections_count,
+            timeout=timeout,
+            min_connections=min_connections,
+            idle_timeout=idle_timeout,
+            keep_alive_interval=keep_alive_interval,
+        )
+
+    @property
+    def listing(self) -> BOMRadarListingTracker:
+        """Tracker holding the radar directory listing from the last poll."""
+
+        return self._listing
+
+    @property
+    def database(self) -> Optional[BOMRadarFrameDatabase]:
+        """Database the listing and downloads are recorded in."""
+
+        return self._database
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """Retry policy for frame downloads."""
+
+        return self._retry_policy
+
+    @property
+    def last_report(self) -> Optional[BOMRadarDownloadReport]:
+        """Report for the last batch of frames downloaded, including failures."""
+
+        return self._last_report
 
     def get_radar_frames(
         self,
@@ -34,6 +189,10 @@ class BOMRadarDownload(BOMFTPPool):
     ) -> Dict[BOMRadarLocationModel, Dict[RADAR_TYPE, List[BOMRadarFramePNG]]]:
         """Download radar data for the given radar and time range.
 
+        Every frame is kept, so each is copied out of its connection's
+        download buffer into its own byte string. Only
+        :meth:`iter_radar_frames` hands frames over without that copy.
+
         Args:
             radar_locations: The list of radar locations to download data for. Defaults to None which downloads all radar locations.
             radar_types: The list of radar types to download data for. Defaults to None which downloads all radar types.
@@ -43,6 +202,7 @@ class BOMRadarDownload(BOMFTPPool):
 
         Returns:
             A dict :class:`BOMRadarFrameRaw` objects nested by :class:`BOMRadarLocation` and :class:`RADAR_TYPE`.
+            Frames that fail to download are left out and listed in :attr:`last_report`.
         """
 
         logger.info("Starting radar download")
@@ -54,62 +214,609 @@ class BOMRadarDownload(BOMFTPPool):
         if radar_types and not isinstance(radar_types, list):
             radar_types = [radar_types]
 
-        logger.info("Getting radar files")
-        # Get all files, only need single connection
-        conn = self.get_connection()
-        radar_dir_files = conn.get_directory_contents()
-        self.release_connection(conn)
+        with self:
+            return self._get_radar_frames(
+                radar_locations, radar_types, start_time, end_time, ignore_list
+            )
 
-        logger.info("Getting matching radar files")
-        # Get matching files
-        matching_filenames = get_matching_files(
-            radar_dir_files,
-            radar_locations=radar_locations,
-            radar_types=radar_types,
-            start_time_utc=start_time,
-            end_time_utc=end_time,
-            ignore_list=ignore_list,
+    def _get_radar_frames(
+        self,
+        radar_locations: Optional[List[BOMRadarLocationModel]],
+        radar_types: Optional[List[RADAR_TYPE]],
+        start_time: Optional[datetime.datetime],
+        end_time: Optional[datetime.datetime],
+        ignore_list: Optional[List[str]],
+    ) -> Dict[BOMRadarLocationModel, Dict[RADAR_TYPE, List[BOMRadarFramePNG]]]:
+        """Download radar data with the pool open, see :meth:`get_radar_frames`"""
+
+        matching_filenames = self._get_matching_frames(
+            radar_locations, radar_types, start_time, end_time, ignore_list
         )
 
-        all_frames = self._get_frames(matching_filenames)
+        report = self._get_frames(matching_filenames)
+        if report.failures:
+            logger.warning(f"Failed to download {len(report.failures)} radar frames")
+
         frames_map: Dict[
             BOMRadarLocationModel, Dict[RADAR_TYPE, List[BOMRadarFramePNG]]
         ] = {}
 
-        for frame in all_frames:
+        for frame in report.frames:
             frames_map.setdefault(frame.radar_id, {}).setdefault(
                 frame.radar_type, []
             ).append(frame)
 
         return frames_map
 
+    def iter_radar_frames(
+        self,
+        radar_locations: Optional[List[BOMRadarLocationModel]] = None,
+        radar_types: Optional[List[RADAR_TYPE]] = None,
+        start_time: Optional[datetime.datetime] = None,
+        end_time: Optional[datetime.datetime] = None,
+        ignore_list: Optional[List[str]] = None,
+        order: str = "completion",
+        window: Optional[int] = None,
+    ) -> Iterator[BOMRadarFramePNG]:
+        """Download radar data for the given radar and time range, yielding frames as they arrive.
+
+        At most `window` frames are downloading or waiting to be consumed
+        at any time, so memory use doesn't grow with the number of frames.
+        Frames that fail to download are skipped and listed in
+        :attr:`last_report` once the generator is exhausted (the report
+        doesn't hold the yielded frames).
+
+        Frames hold a view of their connection's download buffer, which is
+        reused once the frame is dropped. Call
+        :meth:`BOMRadarFramePNG.detach` on frames that are kept.
+
+        Args:
+            radar_locations: The list of radar locations to download data for. Defaults to None which downloads all radar locations.
+            radar_types: The list of radar types to download data for. Defaults to None which downloads all radar types.
+            start_time: The start time of the data to download. Defaults to None which downloads all frames on the server.
+            end_time: The end time of the data to download. Defaults to None which downloads all frames on the server.
+            ignore_list: List of radar frames to ignore. Defaults to None which doesn't ignore any frames.
+            order: "completion" to yield frames as soon as they are downloaded, or "time" to yield them oldest first. Defaults to "completion".
+            window: Maximum number of frames in flight. Defaults to twice the number of connections.
+
+        Yields:
+            :class:`BOMRadarFramePNG` objects.
+
+        Raises:
+            ValueError: If `order` or `window` is invalid.
+        """
+
+        if order not in ("completion", "time"):
+            raise ValueError(f"Unknown order {order}, expected 'completion' or 'time'")
+
+        if window is None:
+            window = 2 * self._connections_count
+        if window < 1:
+            raise ValueError("window should be at least 1")
+
+        if radar_locations and not isinstance(radar_locations, list):
+            radar_locations = [radar_locations]
+
+        if radar_types and not isinstance(radar_types, list):
+            radar_types = [radar_types]
+
+        with self:
+            remote_files = self._get_matching_frames(
+                radar_locations, radar_types, start_time, end_time, ignore_list
+            )
+            if order == "time":
+                remote_files.sort(key=lambda x: (x.epoch_minute, x.filename))
+
+            yield from self._iter_frames(remote_files, order == "time", window)
+
+    def save_radar_frames(
+        self,
+        path: str,
+        radar_locations: Optional[List[BOMRadarLocationModel]] = None,
+        radar_types: Optional[List[RADAR_TYPE]] = None,
+        start_time: Optional[datetime.datetime] = None,
+        end_time: Optional[datetime.datetime] = None,
+        ignore_list: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Download radar data for the given radar and time range straight to disk.
+
+        Each frame is streamed into a temporary file in `path` and renamed
+        to its filename once complete, without holding the PNG in memory.
+
+        Args:
+            path: Directory to save the frames to.
+            radar_locations: The list of radar locations to download data for. Defaults to None which downloads all radar locations.
+            radar_types: The list of radar types to download data for. Defaults to None which downloads all radar types.
+            start_time: The start time of the data to download. Defaults to None which downloads all frames on the server.
+            end_time: The end time of the data to download. Defaults to None which downloads all frames on the server.
+            ignore_list: List of radar frames to ignore. Defaults to None which doesn't ignore any frames.
+
+        Returns:
+            Paths of the saved frames. Frames that fail to download are listed in :attr:`last_report`.
+        """
+
+        if radar_locations and not isinstance(radar_locations, list):
+            radar_locations = [radar_locations]
+
+        if radar_types and not isinstance(radar_types, list):
+            radar_types = [radar_types]
+
+        with self:
+            remote_files = self._get_matching_frames(
+                radar_locations, radar_types, start_time, end_time, ignore_list
+            )
+            return self._save_frames(remote_files, path)
+
+    def process_radar_frames(
+        self,
+        writer: Callable[[BOMRadarFramePNG, np.ndarray, np.ndarray, np.ndarray], None],
+        radar_locations: Optional[List[BOMRadarLocationModel]] = None,
+        radar_types: Optional[List[RADAR_TYPE]] = None,
+        start_time: Optional[datetime.datetime] = None,
+        end_time: Optional[datetime.datetime] = None,
+        ignore_list: Optional[List[str]] = None,
+        decoder: Optional[BOMRadarBatchDecoder] = None,
+        queue_size: Optional[int] = None,
+        batch_size: int = 32,
+    ) -> BOMRadarDownloadReport:
+        """Download, decode and store radar data as a pipeline.
+
+        The three stages run at the same time, joined by bounded queues:
+        the download threads fetch frames, a :class:`BOMRadarBatchDecoder`
+        decodes batches of them in worker processes, and `writer` is
+        called for each decoded frame on this thread. When a stage falls
+        behind, the queue before it fills and the stages upstream wait,
+        so memory stays flat however many frames are processed.
+
+        The arrays passed to `writer` are views of the batch's shared
+        memory, which is freed once every frame of the batch is written.
+        An array kept after `writer` returns holds the memory of its whole
+        batch until it is freed, so copy the ones that are kept.
+
+        A frame is only recorded as stored in the :attr:`database` once
+        `writer` returns. If `writer` raises, the frame is recorded as
+        failed and the run stops with the error.
+
+        Args:
+            writer: Called with (frame, palette indices, palette, alpha) for each decoded frame.
+            radar_locations: The list of radar locations to download data for. Defaults to None which downloads all radar locations.
+            radar_types: The list of radar types to download data for. Defaults to None which downloads all radar types.
+            start_time: The start time of the data to download. Defaults to None which downloads all frames on the server.
+            end_time: The end time of the data to download. Defaults to None which downloads all frames on the server.
+            ignore_list: List of radar frames to ignore. Defaults to None which doesn't ignore any frames.
+            decoder: Decoder to use. Defaults to None for a new decoder, closed when done.
+            queue_size: Maximum number of downloaded frames waiting to be decoded. Defaults to twice the number of connections.
+            batch_size: Maximum number of frames decoded per batch. Defaults to 32.
+
+        Returns:
+            Report of the frames that failed to download or decode, also kept in :attr:`last_report`.
+            The report doesn't hold the written frames.
+
+        Raises:
+            ValueError: If `queue_size` or `batch_size` is invalid.
+            Exception: The error raised by `writer`.
+        """
+
+        if queue_size is None:
+            queue_size = 2 * self._connections_count
+        if queue_size < 1 or batch_size < 1:
+            raise ValueError("queue_size and batch_size should be at least 1")
+
+        if radar_locations and not isinstance(radar_locations, list):
+            radar_locations = [radar_locations]
+
+        if radar_types and not isinstance(radar_types, list):
+            radar_types = [radar_types]
+
+        owns_decoder = decoder is None
+        if decoder is None:
+            decoder = BOMRadarBatchDecoder()
+
+        try:
+            with self:
+                remote_files = self._get_matching_frames(
+                    radar_locations, radar_types, start_time, end_time, ignore_list
+                )
+                return self._process_frames(
+                    remote_files, writer, decoder, queue_size, batch_size
+                )
+        finally:
+            if owns_decoder:
+                decoder.close()
+
+    def _get_matching_frames(
+        self,
+        radar_locations: Optional[List[BOMRadarLocationModel]],
+        radar_types: Optional[List[RADAR_TYPE]],
+        start_time: Optional[datetime.datetime],
+        end_time: Optional[datetime.datetime],
+        ignore_list: Optional[List[str]],
+    ) -> List[BOMRadarFrameMetadata]:
+        """Poll the radar listing and get the frames matching the filters"""
+
+        logger.info("Getting radar files")
+        # Get all files, only need single connection
+        with self.connection() as conn:
+            radar_dir_files = conn.get_directory_contents()
+
+        # An empty listing means the listing failed, keep the previous snapshot
+        if radar_dir_files:
+            first_poll = not len(self._listing)
+            diff = self._listing.update(radar_dir_files)
+            logger.info(
+                f"Radar listing has {len(diff.added)} new and {len(diff.removed)} removed files"
+            )
+
+            if self._database is not None:
+                # Listed frames left from an earlier session may have gone
+                self._database.update_listing(
+                    BOMRadarCatalog.from_keys(diff.added_keys),
+                    BOMRadarCatalog.from_keys(diff.removed_keys),
+                    replace=first_poll,
+                )
+
+        logger.info("Getting matching radar files")
+        if self._database is not None:
+            # One indexed query, frames already stored are skipped
+            catalog = self._database.query(
+                radar_locations=radar_locations,
+                radar_types=radar_types,
+                start_time_utc=start_time,
+                end_time_utc=end_time,
+                exclude_status=[FRAME_STATUS.STORED],
+            )
+        else:
+            # Get matching files, only new entries in the listing are parsed
+            catalog = self._listing.catalog.filter(
+                radar_locations=radar_locations,
+                radar_types=radar_types,
+                start_time_utc=start_time,
+                end_time_utc=end_time,
+            )
+
+        if ignore_list:
+            # Listed filenames reuse the keys parsed by the listing tracker
+            ignored = self._listing.keys(ignore_list)
+            catalog = catalog.subset(~np.isin(catalog.keys, ignored))
+
+        return catalog.frames()
+
+    def _with_retry(
+        self, remote_file: BOMRadarFrameMetadata, fetch: Callable[[BOMFTPConn], _T]
+    ) -> _T:
+        """Run a download on a pooled connection, retrying per the retry policy
+
+        A connection that fails with a retryable error is discarded, so
+        the next attempt runs on a fresh connection.
+        """
+
+        policy = self._retry_policy
+        attempt = 0
+        while True:
+            attempt += 1
+            conn = self.get_connection()
+            try:
+                result = fetch(conn)
+            except Exception as e:
+                retry = policy.should_retry(e)
+                if retry:
+                    self.discard_connection(conn)
+                else:
+                    self.release_connection(conn)
+
+                if not retry or attempt >= policy.attempts:
+                    raise
+
+                delay = policy.delay(attempt)
+                logger.warning(
+                    f"Attempt {attempt}/{policy.attempts} for {remote_file.filename} "
+                    f"failed, retrying in {delay:.1f}s: {e}"
+                )
+                time.sleep(delay)
+                continue
+
+            self.release_connection(conn)
+            return result
+
+    def _download(
+        self, remote_file: BOMRadarFrameMetadata, fetch: Callable[[BOMFTPConn], _T]
+    ) -> Union[_T, BaseException]:
+        """Run a download with retries, returning the error if it fails"""
+
+        try:
+            result = self._with_retry(remote_file, fetch)
+        except Exception as e:
+            logger.error(f"Failed to download {remote_file.filename}: {e}")
+            return e
+
+        with self._progress_lock:
+            self._progress["current"] += 1
+            current = self._progress["current"]
+        logger.info(f"Downloaded {current}/{self._progress['total']}")
+
+        return result
+
     def _get_frame(
-        self, remote_file: BOMRadarFrameMetadata, tz: Optional[BaseTzInfo] = None
-    ) -> BOMRadarFramePNG:
-        """Download a radar frame"""
+        self, remote_file: BOMRadarFrameMetadata, reuse_buffer: bool = False
+    ) -> Union[BOMRadarFramePNG, BaseException]:
+        """Download a radar frame, returning the error if it fails"""
 
-        conn = self.get_connection()
-        frame = conn.get_file(remote_file)
-        self.release_connection(conn)
+        return self._download(
+            remote_file, lambda conn: conn.get_file(remote_file, reuse_buffer)
+        )
+
+    def _save_frame(
+        self, remote_file: BOMRadarFrameMetadata, path: str
+    ) -> Union[Tuple[str, str], BaseException]:
+        """Download a radar frame to disk, returning (path, SHA-256 hex digest) or the error if it fails"""
 
-        self._progress["current"] += 1
-        logger.info(f"Downloaded {self._progress['current']}/{self._progress['total']}")
+        def fetch(conn: BOMFTPConn) -> Tuple[str, str]:
+            # A fresh digest per attempt, a retry starts the file again
+            digest = hashlib.sha256()
+            target = conn.download_file(remote_file, path, digest)
+            return target, digest.hexdigest()
 
-        return frame
+        return self._download(remote_file, fetch)
 
     def _get_frames(
         self, remote_files: List[BOMRadarFrameMetadata]
-    ) -> List[BOMRadarFramePNG]:
-        results = []
-        self._progress["total"] = len(remote_files)
+    ) -> BOMRadarDownloadReport:
+        with self._progress_lock:
+            self._progress = {"total": len(remote_files), "current": 0}
 
         with self:
-            with ThreadPoolExecutor(max_workers=self._connections_count) as executor:
+            # Connections are opened on demand, so small batches start fast
+            max_workers = max(min(self._connections_count, len(remote_files)), 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
                 results = list(executor.map(self._get_frame, remote_files))
 
-        return results
+        frames: List[BOMRadarFramePNG] = []
+        failures: List[Tuple[BOMRadarFrameMetadata, BaseException]] = []
+        for remote_file, result in zip(remote_files, results):
+            if isinstance(result, BaseException):
+                failures.append((remote_file, result))
+            else:
+                frames.append(result)
+
+        self._record_failures(failures)
+        self._last_report = BOMRadarDownloadReport(frames, failures)
+        return self._last_report
+
+    def _save_frames(
+        self, remote_files: List[BOMRadarFrameMetadata], path: str
+    ) -> List[str]:
+        with self._progress_lock:
+            self._progress = {"total": len(remote_files), "current": 0}
+
+        with self:
+            max_workers = max(min(self._connections_count, len(remote_files)), 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(
+                    executor.map(lambda x: self._save_frame(x, path), remote_files)
+                )
+
+        paths: List[str] = []
+        failures: List[Tuple[BOMRadarFrameMetadata, BaseException]] = []
+        for remote_file, result in zip(remote_files, results):
+            if isinstance(result, BaseException):
+                failures.append((remote_file, result))
+            else:
+                target, checksum = result
+                paths.append(target)
+                if self._database is not None:
+                    self._database.mark_stored(
+                        remote_file, size=os.path.getsize(target), checksum=checksum
+                    )
+
+        self._record_failures(failures)
+        self._last_report = BOMRadarDownloadReport([], failures)
+        return paths
+
+    def _record_failures(
+        self, failures: List[Tuple[BOMRadarFrameMetadata, BaseException]]
+    ):
+        """Mark failed frames in the database"""
+
+        if self._database is not None:
+            for remote_file, _ in failures:
+                self._database.mark_failed(remote_file)
+
+    def _iter_frames(
+        self,
+        remote_files: List[BOMRadarFrameMetadata],
+        ordered: bool,
+        window: int,
+    ) -> Iterator[BOMRadarFramePNG]:
+        """Download frames with a bounded number in flight, yielding as they finish
+
+        Args:
+            remote_files: The frames to download.
+            ordered: Yield in the order of `remote_files` rather than completion order.
+            window: Maximum number of frames in flight.
+        """
+
+        with self._progress_lock:
+            self._progress = {"total": len(remote_files), "current": 0}
+
+        failures: List[Tuple[BOMRadarFrameMetadata, BaseException]] = []
+        pending: Deque[Tuple[BOMRadarFrameMetadata, Future]] = deque()
+        remaining = iter(remote_files)
+
+        max_workers = max(min(self._connections_count, len(remote_files), window), 1)
+        with self, ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                for remote_file in islice(remaining, window):
+                    pending.append(
+                        (
+                            remote_file,
+                            executor.submit(self._get_frame, remote_file, True),
+                        )
+                    )
+
+                while pending:
+                    if ordered:
+                        remote_file, future = pending.popleft()
+                    else:
+                        wait([x for _, x in pending], return_when=FIRST_COMPLETED)
+                        position = next(
+                            i for i, (_, x) in enumerate(pending) if x.done()
+                        )
+                        remote_file, future = pending[position]
+                        del pending[position]
+
+                    result = future.result()
+
+                    # Top up the window before handing the frame over
+                    for next_file in islice(remaining, 1):
+                        pending.append(
+                            (
+                                next_file,
+                                executor.submit(self._get_frame, next_file, True),
+                            )
+                        )
+
+                    if isinstance(result, BaseException):
+                        failures.append((remote_file, result))
+                    else:
+                        yield result
+            finally:
+                # Stopped early, don't start the frames that are still queued
+                for _, future in pending:
+                    future.cancel()
+
+        self._record_failures(failures)
+        self._last_report = BOMRadarDownloadReport([], failures)
+
+    def _process_frames(
+        self,
+        remote_files: List[BOMRadarFrameMetadata],
+        writer: Callable[[BOMRadarFramePNG, np.ndarray, np.ndarray, np.ndarray], None],
+        decoder: BOMRadarBatchDecoder,
+        queue_size: int,
+        batch_size: int,
+    ) -> BOMRadarDownloadReport:
+        """Run the download, decode and store stages, see :meth:`process_radar_frames`"""
+
+        with self._progress_lock:
+            self._progress = {"total": len(remote_files), "current": 0}
+
+        downloaded: "queue.Queue[_Fetched]" = queue.Queue(maxsize=queue_size)
+        decoded: "queue.Queue[Optional[_Decoded]]" = queue.Queue(maxsize=2)
+
+        stop = threading.Event()
+        failures: List[Tuple[BOMRadarFrameMetadata, BaseException]] = []
+        errors: List[BaseException] = []
+        remaining = iter(remote_files)
+        remaining_lock = threading.Lock()
+
+        def fetch() -> None:
+            try:
+                while not stop.is_set():
+                    with remaining_lock:
+                        remote_file = next(remaining, None)
+                    if remote_file is None:
+                        return
+
+                    # The frame is queued, so it can't share the connection's buffer
+                    result = self._get_frame(remote_file)
+                    if not _put(downloaded, (remote_file, result), stop):
+                        return
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+
+        def decode() -> None:
+            try:
+                received = 0
+                while received < len(remote_files):
+                    batch_items = [_get(downloaded, stop)]
+                    while len(batch_items) < batch_size:
+                        try:
+                            batch_items.append(downloaded.get_nowait())
+                        except queue.Empty:
+                            break
+                    received += len(batch_items)
+
+                    sources: List[BOMRadarFrameMetadata] = []
+                    frames: List[BOMRadarFramePNG] = []
+                    for remote_file, result in batch_items:
+                        if isinstance(result, BaseException):
+                            failures.append((remote_file, result))
+                        else:
+                            sources.append(remote_file)
+                            frames.append(result)
+
+                    batch = decoder.decode(frames)
+                    if not _put(decoded, (sources, batch), stop):
+                        batch.close()
+                        return
+
+                _put(decoded, None, stop)
+
+            except _PipelineStopped:
+                pass
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+
+        max_workers = max(min(self._connections_count, len(remote_files)), 1)
+        decode_thread = threading.Thread(target=decode, daemon=True)
+
+        with self, ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for _ in range(max_workers):
+                executor.submit(fetch)
+            decode_thread.start()
+
+            try:
+                while True:
+                    item = _get(decoded, stop)
+                    if item is None:
+                        break
+
+                    # Arrays the writer keeps hold the batch's memory mapped
+                    # past the close, see BOMRadarDecodedBatch.close
+                    sources, batch = item
+                    with batch:
+                        for number, frame in enumerate(batch.frames):
+                            if number in batch.failures:
+                                failures.append(
+                                    (sources[number], batch.failures[number])
+                                )
+                                continue
+
+                            try:
+                                writer(frame, *batch[number])
+                            except BaseException as e:
+                                # Recorded as failed, then the run stops
+                                failures.append((sources[number], e))
+                                raise
+
+                            if self._database is not None:
+                                self._database.mark_stored(frame)
+
+            except _PipelineStopped:
+                pass
+
+            finally:
+                # Unblock the other stages if this one stopped early
+                stop.set()
+                decode_thread.join()
+                while not decoded.empty():
+                    leftover = decoded.get_nowait()
+                    if leftover is not None:
+                        leftover[1].close()
+
+                # Frames that failed before the run stopped are recorded too
+                self._record_failures(failures)
+                self._last_report = BOMRadarDownloadReport([], failures)
+
+        if errors:
+            raise errors[0]
+
+        return self._last_report
 
 
 __all__ = [
     "BOMRadarDownload",
+    "BOMRadarDownloadReport",
 ]
@@ -0,0 +1,170 @@
+import numpy as np
+
+from loguru import logger
+from pytz import BaseTzInfo
+from typing import Dict, Iterable, List, Optional
+
+from aus_weather_data.radar.common.catalog import BOMRadarCatalog, parse_frame_key
+
+
+def _to_array(keys: Iterable[Optional[int]]) -> np.ndarray:
+    """int64 array of the keys, without the entries that aren't frames"""
+
+    return np.fromiter((key for key in keys if key is not None), dtype=np.int64)
+
+
+def _keys(filenames: Iterable[str]) -> np.ndarray:
+    return _to_array(map(parse_frame_key, filenames))
+
+
+class BOMRadarListingDiff(object):
+    """Changes to a radar directory listing between two polls
+
+    Attributes:
+        added: Filenames (basenames) that are new since the previous poll.
+        removed: Filenames (basenames) that have gone since the previous poll.
+        added_keys: int64 packed frame keys of the added radar frames.
+        removed_keys: int64 packed frame keys of the removed radar frames.
+    """
+
+    def __init__(
+        self,
+        added: List[str],
+        removed: List[str],
+        added_keys: Optional[np.ndarray] = None,
+        removed_keys: Optional[np.ndarray] = None,
+    ):
+        """Initialise the listing diff
+
+        Args:
+            added: Filenames that are new since the previous poll.
+            removed: Filenames that have gone since the previous poll.
+            added_keys (optional): Frame keys of `added`, parsed from the filenames if not given.
+            removed_keys (optional): Frame keys of `removed`, parsed from the filenames if not given.
+        """
+
+        self.added = added
+        self.removed = removed
+        self.added_keys = _keys(added) if added_keys is None else added_keys
+        self.removed_keys = _keys(removed) if removed_keys is None else removed_keys
+
+    def __str__(self) -> str:
+        return (
+            f"BOMRadarListingDiff<added={len(self.added)}, removed={len(self.removed)}>"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class BOMRadarListingTracker(object):
+    """Incremental tracker for the radar directory listing
+
+    Remembers the previous snapshot of the listing so that each poll only
+    parses the filenames that are new since the last one. The current
+    listing is available as a :class:`BOMRadarCatalog`.
+
+    Attributes:
+        locale_tz: Timezone passed to the catalog and its frames.
+    """
+
+    def __init__(self, locale_tz: Optional[BaseTzInfo] = None):
+        """Initialise an empty listing tracker
+
+        Args:
+            locale_tz (optional): :class:`pytz.timezone` object passed to the frames.
+        """
+
+        # Basename -> packed frame key, or None for entries that aren't frames
+        self._entries: Dict[str, Optional[int]] = {}
+        self._catalog: Optional[BOMRadarCatalog] = None
+        self.locale_tz = locale_tz
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, filename: object) -> bool:
+        return filename in self._entries
+
+    def __str__(self) -> str:
+        return f"BOMRadarListingTracker<entries={len(self)}>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def update(self, file_list: Iterable[str]) -> BOMRadarListingDiff:
+        """Update the snapshot with a new directory listing
+
+        Args:
+            file_list: Filenames or paths (EG. from :meth:`BOMFTPConn.get_directory_contents`).
+
+        Returns:
+            The filenames added and removed since the previous update.
+        """
+
+        # Ordered and without duplicates, a listing can repeat a name
+        current = dict.fromkeys(filename.rpartition("/")[2] for filename in file_list)
+
+        removed = [x for x in self._entries if x not in current]
+        removed_keys = _to_array(self._entries.pop(x) for x in removed)
+
+        added = [x for x in current if x not in self._entries]
+        for filename in added:
+            self._entries[filename] = parse_frame_key(filename)
+        added_keys = _to_array(self._entries[x] for x in added)
+
+        if added or removed:
+            self._catalog = None
+
+        logger.debug(
+            f"Listing update: {len(added)} added, {len(removed)} removed, "
+            f"{len(self._entries)} tracked"
+        )
+
+        return BOMRadarListingDiff(added, removed, added_keys, removed_keys)
+
+    def clear(self):
+        """Forget the previous snapshot"""
+
+        self._entries.clear()
+        self._catalog = None
+
+    def keys(self, filenames: Iterable[str]) -> np.ndarray:
+        """Packed frame keys of filenames
+
+        Filenames in the snapshot reuse their parsed key, others are parsed.
+
+        Args:
+            filenames: Filenames or paths.
+
+        Returns:
+            int64 keys of the filenames that are radar frames.
+        """
+
+        entries = self._entries
+        basenames = (filename.rpartition("/")[2] for filename in filenames)
+        return _to_array(
+            entries[x] if x in entries else parse_frame_key(x) for x in basenames
+        )
+
+    @property
+    def filenames(self) -> List[str]:
+        """Filenames (basenames) in the current snapshot."""
+
+        return list(self._entries)
+
+    @property
+    def catalog(self) -> BOMRadarCatalog:
+        """Catalog of the radar frames in the current snapshot."""
+
+        if self._catalog is None or self._catalog.locale_tz is not self.locale_tz:
+            keys = _to_array(self._entries.values())
+            self._catalog = BOMRadarCatalog.from_keys(keys, locale_tz=self.locale_tz)
+
+        return self._catalog
+
+
+__all__ = [
+    "BOMRadarListingDiff",
+    "BOMRadarListingTracker",
+]
@@ -1,53 +1,260 @@
+import time
+import threading
+
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
-from typing import List
+from typing import Dict, Iterator, List, Optional
 
+from aus_weather_data.exceptions import PoolError, PoolTimeoutError
 from aus_weather_data.radar.remote.conn import BOMFTPConn
 
 
 class BOMFTPPool(object):
     """
     Pooling for FTP Connections
-    """
 
-    _all_connections: List[BOMFTPConn] = []
-    _available_connections: List[BOMFTPConn] = []
-    _used_connections: List[BOMFTPConn] = []
+    The pool is safe to share between threads. Checking out a connection
+    blocks until one is released, up to the pool timeout. Use
+    :meth:`connection` to check out a connection for the duration of a
+    ``with`` block.
+
+    The pool is opened by entering it as a context manager. Entering is
+    re-entrant, the connections are closed when the outermost context
+    exits.
+
+    Connections are opened lazily. Entering the pool opens
+    `min_connections` in parallel, and further connections are only
+    opened when every open connection is checked out, up to
+    `connections`. Connections above the minimum that sit idle for
+    longer than `idle_timeout` are closed.
 
-    def __init__(self, connections: int = 10):
+    While the pool is open a single maintenance thread sends a NOOP to
+    connections that have been idle for `keep_alive_interval`, closes
+    connections that fail it and tops the pool back up to
+    `min_connections`.
+    """
+
+    def __init__(
+        self,
+        connections: int = 10,
+        timeout: Optional[float] = 60.0,
+        min_connections: int = 0,
+        idle_timeout: Optional[float] = 300.0,
+        keep_alive_interval: Optional[float] = 60.0,
+        health_check_after: Optional[float] = 30.0,
+    ):
         """
         Instantiate the FTP Connection Pool
 
         Args:
-            connections: Number of connection to create in the pool. Defaults to 10.
+            connections: Maximum number of connections in the pool. Defaults to 10.
+            timeout: Seconds to wait for a free connection before raising
+                :class:`PoolTimeoutError`. Defaults to 60. None waits forever.
+            min_connections: Number of connections opened when entering the
+                pool and kept open while idle. Defaults to 0.
+            idle_timeout: Seconds before an idle connection above
+                `min_connections` is closed. Defaults to 300. None keeps them open.
+            keep_alive_interval: Seconds between keep alive and health check
+                passes over idle connections. Defaults to 60. None disables them.
+            health_check_after: Seconds a connection can be idle before it is
+                checked with a NOOP on checkout. Defaults to 30. None disables it.
         """
 
+        if connections < 1:
+            raise ValueError("connections should be at least 1")
+
         self._connections_count = connections
+        self._min_connections = min(max(min_connections, 0), connections)
+        self._timeout = timeout
+        self._idle_timeout = idle_timeout
+        self._keep_alive_interval = keep_alive_interval
+        self._health_check_after = health_check_after
+
+        self._condition = threading.Condition()
+        self._enter_count = 0
+        self._open = False
+        self._pending_connections = 0
+        self._all_connections: List[BOMFTPConn] = []
+        self._available_connections: List[BOMFTPConn] = []
+        self._used_connections: List[BOMFTPConn] = []
+        self._idle_since: Dict[BOMFTPConn, float] = {}
+        self._maintenance_thread: Optional[threading.Thread] = None
+        self._maintenance_stop = threading.Event()
 
     def __enter__(self):
         """
         Enter context manager
         """
-        self._init_connections()
+        with self._condition:
+            self._enter_count += 1
+            if self._enter_count > 1:
+                return self
+            # Opened before the lock is released, so a concurrent enterer
+            # never gets a pool that isn't open yet
+            self._open = True
+
+        try:
+            self._init_connections()
+        except BaseException:
+            with self._condition:
+                self._enter_count -= 1
+                close = self._enter_count == 0
+            if close:
+                self.close_pool()
+            raise
+
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
         """
         Exit Context Manager
         """
+        with self._condition:
+            self._enter_count -= 1
+            if self._enter_count > 0:
+                return
+
         self.close_pool()
 
     def _init_connections(self):
         """
-        Initiate the connections.
+        Start the pool and open the minimum number of connections, in
+        parallel.
+        """
+
+        self._start_maintenance()
+        self._fill_connections(self._min_connections)
+
+    def _fill_connections(self, count: int):
+        """
+        Open `count` idle connections in parallel
+        """
+
+        if count <= 0:
+            return
+
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [
+                executor.submit(self._create_new_connection) for x in range(0, count)
+            ]
+
+        connections = []
+        for future in futures:
+            try:
+                connections.append(future.result())
+            except Exception as e:
+                logger.exception(e)
+
+        now = time.monotonic()
+        with self._condition:
+            if not self._open:
+                closed, connections = connections, []
+            else:
+                closed = []
+            self._all_connections.extend(connections)
+            self._available_connections.extend(connections)
+            self._idle_since.update({conn: now for conn in connections})
+            self._condition.notify_all()
+
+        for conn in closed:
+            self._close_connection(conn)
+
+    def _start_maintenance(self):
+        """
+        Start the keep alive and health check thread
+        """
+
+        if self._keep_alive_interval is None:
+            return
+
+        self._maintenance_stop.clear()
+        self._maintenance_thread = threading.Thread(
+            target=self._maintenance_loop,
+            args=(self._keep_alive_interval,),
+            name="BOMFTPPool-keep-alive",
+            daemon=True,
+        )
+        self._maintenance_thread.start()
+
+    def _stop_maintenance(self):
+        """
+        Stop the keep alive and health check thread
         """
 
-        self._all_connections = [
-            self._create_new_connection() for x in range(0, self._connections_count)
-        ]
+        self._maintenance_stop.set()
+        thread, self._maintenance_thread = self._maintenance_thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _maintenance_loop(self, interval: float):
+        """
+        Run :meth:`maintain` every `interval` seconds until the pool closes
+        """
 
-        self._available_connections = [x for x in self._all_connections]
+        while not self._maintenance_stop.wait(interval):
+            try:
+                self.maintain()
+            except Exception as e:
+                logger.exception(e)
 
-    def _create_new_connection(self):
+    def maintain(self):
+        """
+        Keep idle connections alive and replace dead ones
+
+        Called periodically by the maintenance thread. Closes connections
+        that have been idle past `idle_timeout`, sends a NOOP to idle
+        connections that haven't been used for `keep_alive_interval`,
+        closes the ones that fail and reopens connections up to
+        `min_connections`.
+        """
+
+        self.reap_idle_connections()
+
+        interval = self._keep_alive_interval or 0.0
+        now = time.monotonic()
+
+        # Take stale connections out of the pool while they are checked
+        with self._condition:
+            stale = [
+                conn
+                for conn in self._available_connections
+                if now - conn.last_activity >= interval
+            ]
+            for conn in stale:
+                self._available_connections.remove(conn)
+
+        alive = []
+        dead = []
+        for conn in stale:
+            (alive if conn.keep_alive() else dead).append(conn)
+
+        with self._condition:
+            # Put them back as the longest idle, keeping their idle time
+            self._available_connections[0:0] = [
+                conn for conn in alive if conn in self._all_connections
+            ]
+            for conn in dead:
+                self._idle_since.pop(conn, None)
+                if conn in self._all_connections:
+                    self._all_connections.remove(conn)
+            missing = self._min_connections - (
+                len(self._all_connections) + self._pending_connections
+            )
+            open_pool = self._open
+            self._condition.notify_all()
+
+        for conn in dead:
+            logger.info("Closing dead FTP connection")
+            try:
+                self._close_connection(conn)
+            except Exception as e:
+                logger.exception(e)
+
+        if open_pool:
+            self._fill_connections(missing)
+
+    def _create_new_connection(self) -> BOMFTPConn:
         """
         Function to create the connection
         """
@@ -57,41 +264,241 @@ class BOMFTPPool(object):
 
         return new_conn
 
-    def get_connection(self) -> BOMFTPConn:
+    def get_connection(self, timeout: Optional[float] = None) -> BOMFTPConn:
         """
         Get a connection from the pool
+
+        Blocks until a connection is available. Connections that have been
+        idle for longer than `health_check_after` are checked with a NOOP,
+        and dead connections are replaced.
+
+        Args:
+            timeout: Seconds to wait for a connection. Defaults to the pool timeout.
+
+        Raises:
+            PoolError: If the pool is not open.
+            PoolTimeoutError: If no connection became available in time.
         """
 
-        if len(self._available_connections) == 0:
-            raise Exception("No available connections")
+        if timeout is None:
+            timeout = self._timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            conn = self._checkout(deadline, timeout)
+            if conn is None:
+                return self._open_reserved_connection()
+
+            if self._is_healthy(conn):
+                return conn
+
+            logger.info("Replacing dead FTP connection")
+            self.discard_connection(conn)
+
+    def _checkout(
+        self, deadline: Optional[float], timeout: Optional[float]
+    ) -> Optional[BOMFTPConn]:
+        """
+        Check out an available connection, waiting until the deadline
+
+        Returns:
+            A connection, or None if a slot was reserved to open a new one.
+        """
+
+        with self._condition:
+            while True:
+                if not self._open:
+                    raise PoolError("Connection pool is not open")
+
+                if self._available_connections:
+                    conn = self._available_connections.pop()
+                    self._idle_since.pop(conn, None)
+                    self._used_connections.append(conn)
+                    return conn
+
+                # Grow the pool only when every open connection is in use
+                total = len(self._all_connections) + self._pending_connections
+                if total < self._connections_count:
+                    self._pending_connections += 1
+                    return None
+
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"No available connections after {timeout}s"
+                        )
+
+                self._condition.wait(remaining)
+
+    def _open_reserved_connection(self) -> BOMFTPConn:
+        """
+        Open a connection in a slot reserved by :meth:`_checkout`
+        """
+
+        # Open the new connection outside the lock so other threads can
+        # check out and release connections, or open their own, meanwhile
+        try:
+            conn = self._create_new_connection()
+        except BaseException:
+            with self._condition:
+                self._pending_connections -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._pending_connections -= 1
+            if not self._open:
+                closed = True
+            else:
+                closed = False
+                self._all_connections.append(conn)
+                self._used_connections.append(conn)
+
+        if closed:
+            self._close_connection(conn)
+            raise PoolError("Connection pool is not open")
 
-        conn = self._available_connections.pop()
-        self._used_connections.append(conn)
         return conn
 
+    def _is_healthy(self, conn: BOMFTPConn) -> bool:
+        """
+        Check a connection that has been idle for a while is still alive
+        """
+
+        if self._health_check_after is None:
+            return True
+
+        if time.monotonic() - conn.last_activity < self._health_check_after:
+            return True
+
+        return conn.keep_alive()
+
+    def discard_connection(self, conn: BOMFTPConn):
+        """
+        Remove a checked out connection from the pool and close it
+
+        Use this instead of :meth:`release_connection` for a connection
+        that has failed, so that it is not handed out again.
+        """
+
+        with self._condition:
+            if conn in self._used_connections:
+                self._used_connections.remove(conn)
+            if conn in self._all_connections:
+                self._all_connections.remove(conn)
+            self._condition.notify()
+
+        try:
+            self._close_connection(conn)
+        except Exception as e:
+            logger.exception(e)
+
     def release_connection(self, conn: BOMFTPConn):
         """
         Return a connection to the pool
         """
 
-        self._used_connections.remove(conn)
-        self._available_connections.append(conn)
+        with self._condition:
+            if conn not in self._used_connections:
+                return
+
+            self._used_connections.remove(conn)
+            self._available_connections.append(conn)
+            self._idle_since[conn] = time.monotonic()
+            self._condition.notify()
+
+        self.reap_idle_connections()
+
+    def reap_idle_connections(self) -> int:
+        """
+        Close connections above the minimum that have been idle too long
+
+        Returns:
+            Number of connections closed.
+        """
+
+        if self._idle_timeout is None:
+            return 0
+
+        now = time.monotonic()
+        reaped = []
+
+        with self._condition:
+            # Available connections are used LIFO, so the longest idle are first
+            while (
+                self._available_connections
+                and len(self._all_connections) > self._min_connections
+            ):
+                conn = self._available_connections[0]
+                if now - self._idle_since.get(conn, now) < self._idle_timeout:
+                    break
+
+                self._available_connections.pop(0)
+                self._all_connections.remove(conn)
+                self._idle_since.pop(conn, None)
+                reaped.append(conn)
+
+        for conn in reaped:
+            try:
+                self._close_connection(conn)
+            except Exception as e:
+                logger.exception(e)
+
+        if reaped:
+            logger.debug(f"Closed {len(reaped)} idle FTP connections")
+
+        return len(reaped)
+
+    @property
+    def size(self) -> int:
+        """Number of open connections in the pool."""
+
+        with self._condition:
+            return len(self._all_connections)
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[BOMFTPConn]:
+        """
+        Check out a connection for the duration of a ``with`` block
+
+        Args:
+            timeout: Seconds to wait for a connection. Defaults to the pool timeout.
+
+        Raises:
+            PoolError: If the pool is not open.
+            PoolTimeoutError: If no connection became available in time.
+        """
+
+        conn = self.get_connection(timeout=timeout)
+        try:
+            yield conn
+        finally:
+            self.release_connection(conn)
 
     def close_pool(self):
         """
         Close all connections in this pool
         """
 
-        for conn in self._all_connections:
+        self._stop_maintenance()
+
+        with self._condition:
+            connections = list(self._all_connections)
+            self._open = False
+            self._all_connections.clear()
+            self._used_connections.clear()
+            self._available_connections.clear()
+            self._idle_since.clear()
+            self._condition.notify_all()
+
+        for conn in connections:
             try:
                 self._close_connection(conn)
             except Exception as e:
                 logger.exception(e)
 
-        self._all_connections.clear()
-        self._used_connections.clear()
-        self._available_connections.clear()
-
     def _close_connection(self, conn: BOMFTPConn):
         """
         Close an individual connection
@@ -0,0 +1,95 @@
+import ftplib
+import random
+import socket
+
+from typing import Tuple, Type
+
+DEFAULT_RETRY_ERRORS: Tuple[Type[BaseException], ...] = (
+    ftplib.error_temp,
+    socket.timeout,
+    ConnectionError,
+    EOFError,
+)
+"""Errors retried by default: 4xx replies, timeouts and dropped connections. 5xx replies (EG. 550 file not found) and local file errors (EG. a full disk) are not retried."""
+
+
+class RetryPolicy(object):
+    """Retry policy for FTP operations
+
+    Retries use exponential backoff with jitter. The delay before retry
+    `n` (starting at 1) is ``min(max_backoff, backoff * 2 ** (n - 1))``,
+    reduced by a random fraction of up to `jitter`.
+
+    Errors are matched against `retry_on` using the error that caused
+    them if there is one, so the :class:`IOError` raised by
+    :meth:`BOMFTPConn.get_file` is retried according to the underlying
+    :mod:`ftplib` error.
+    """
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        jitter: float = 0.5,
+        retry_on: Tuple[Type[BaseException], ...] = DEFAULT_RETRY_ERRORS,
+    ):
+        """Initialise the retry policy
+
+        Args:
+            attempts: Total number of attempts, including the first. Defaults to 3.
+            backoff: Delay in seconds before the first retry. Defaults to 1.
+            max_backoff: Maximum delay in seconds between attempts. Defaults to 30.
+            jitter: Fraction (0 - 1) of the delay that is randomised. Defaults to 0.5.
+            retry_on: Error types to retry. Defaults to :data:`DEFAULT_RETRY_ERRORS`.
+        """
+
+        if attempts < 1:
+            raise ValueError("attempts should be at least 1")
+
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter should be between 0 and 1")
+
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_on = retry_on
+
+    def __str__(self) -> str:
+        return f"RetryPolicy<attempts={self.attempts}, backoff={self.backoff}>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def should_retry(self, error: BaseException) -> bool:
+        """Whether an error should be retried
+
+        Args:
+            error: The error raised by the attempt.
+
+        Returns:
+            True if the error (or the error that caused it) is in `retry_on`.
+        """
+
+        cause = error.__cause__ or error
+        return isinstance(cause, self.retry_on)
+
+    def delay(self, attempt: int) -> float:
+        """Delay before the next attempt
+
+        Args:
+            attempt: Number of the attempt that failed, starting at 1.
+
+        Returns:
+            Seconds to wait before retrying.
+        """
+
+        delay = min(self.max_backoff, self.backoff * 2.0 ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
+
+
+__all__ = [
+    "DEFAULT_RETRY_ERRORS",
+    "RetryPolicy",
+]
@@ -1,22 +1,12 @@
-import os
 import datetime
 
 from loguru import logger
-from typing import List, Union, Optional
+from typing import List, Optional
 
-from aus_weather_data.exceptions import ParseFrameError
 from aus_weather_data.radar.common.types import RADAR_TYPE
 from aus_weather_data.radar.common.location import BOMRadarLocationModel
 from aus_weather_data.radar.common.frame import BOMRadarFrameMetadata
-
-
-def __convert_to_metadata(filename: str) -> Union[BOMRadarFrameMetadata, None]:
-
-    try:
-        return BOMRadarFrameMetadata(filename)
-    except ParseFrameError:
-        logger.debug(f"Failed to parse frame: {filename}. Skipping")
-        return None
+from aus_weather_data.radar.common.catalog import BOMRadarCatalog
 
 
 def get_matching_files(
@@ -43,46 +33,16 @@ def get_matching_files(
 
     logger.info("Filtering radar files")
 
-    # Filter PNG
-    filtered_files = [x for x in file_list if x.endswith(".png")]
-
-    # Get basename
-    filtered_files = [os.path.basename(x) for x in filtered_files]
-
-    # Filter for correct length
-    filtered_files = [x for x in filtered_files if len(x) == 25 or len(x) == 26]
-
-    # Filter through ignore list. Expecting ignore list ot be larger than file_list_metadata
-    if ignore_list:
-        ignore_set = set(ignore_list)
-        png_set = set(filtered_files)
-        filtered_files = list(png_set.difference(ignore_set))
-
-    # Convert to metadata format.
-    metadata: List[BOMRadarFrameMetadata] = [
-        metadataFrame
-        for x in filtered_files
-        if (metadataFrame := __convert_to_metadata(x)) is not None
-    ]
-
-    # Filter according to radar_type
-    if radar_locations:
-        metadata = [x for x in metadata if x.radar_id in radar_locations]
-
-    # Filter according to radar type
-    if radar_types:
-        metadata = [x for x in metadata if x.radar_type in radar_types]
-
-    # Filter according to start and end times
-    if start_time_utc and end_time_utc:
-        metadata = [x for x in metadata if start_time_utc <= x.dt_utc <= end_time_utc]
-    elif start_time_utc:
-        metadata = [x for x in metadata if start_time_utc <= x.dt_utc]
-    elif end_time_utc:
-        metadata = [x for x in metadata if x.dt_utc <= end_time_utc]
+    # Parse once into columns, then filter with vectorized masks
+    catalog = BOMRadarCatalog.from_filenames(file_list)
 
-    # Return just filenames
-    return metadata
+    return catalog.filter(
+        radar_locations=radar_locations,
+        radar_types=radar_types,
+        start_time_utc=start_time_utc,
+        end_time_utc=end_time_utc,
+        ignore_list=ignore_list,
+    ).frames()
 
 
 __all__ = [
@@ -0,0 +1,60 @@
+"""Decoding a day of frames in one process and across a process pool.
+
+Decodes a day of 5 minute frames for 4 radars (1152 frames, the test
+asset as every PNG) with :func:`decode_png` in this process, keeping
+every result, then with :class:`BOMRadarBatchDecoder` at increasing
+worker counts up to the number of CPUs.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/bench_batch_decode.py
+"""
+
+import os
+import time
+
+from aus_weather_data.radar.common.decode import BOMRadarBatchDecoder
+from aus_weather_data.radar.common.frame import BOMRadarFramePNG
+from aus_weather_data.radar.common.png import decode_png
+
+ASSET = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "assets", "IDR024.T.202001312324.png"
+)
+FRAMES = 288 * 4
+
+
+def main():
+    with open(ASSET, "rb") as f:
+        data = f.read()
+
+    frames = []
+    for _ in range(FRAMES):
+        frame = BOMRadarFramePNG("IDR024.T.202001312324.png")
+        frame.load_png_data(data)
+        frames.append(frame)
+
+    start = time.perf_counter()
+    results = [decode_png(frame.png_data) for frame in frames]
+    serial_ms = (time.perf_counter() - start) * 1000
+    del results
+
+    print(f"{FRAMES} frames on {os.cpu_count()} CPUs\n")
+    print(f"in process          {serial_ms:8.1f} ms")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        with BOMRadarBatchDecoder(max_workers=workers) as decoder:
+            # Start the workers before timing
+            decoder.decode(frames[:workers]).close()
+
+            start = time.perf_counter()
+            with decoder.decode(frames) as batch:
+                assert batch.ok
+            batch_ms = (time.perf_counter() - start) * 1000
+
+        print(f"{workers:2} workers          {batch_ms:8.1f} ms")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Filtering cost for a full BOM radar directory listing.
+
+Compares filtering a list of :class:`BOMRadarFrameMetadata` with list
+comprehensions (as ``get_matching_files`` used to) against the boolean
+masks of :class:`BOMRadarCatalog`.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/bench_catalog.py
+"""
+
+import datetime
+import timeit
+
+from aus_weather_data.radar.common.catalog import BOMRadarCatalog
+from aus_weather_data.radar.common.frame import BOMRadarFrameMetadata
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.common.types import RADAR_TYPE
+
+START = datetime.datetime(2024, 10, 15, tzinfo=datetime.timezone.utc)
+
+
+def build_listing() -> list:
+    """A day of 5 minute frames for every location and radar type"""
+
+    return [
+        f"/anon/gen/radar/{idr}{radar_type.value}.T."
+        f"{START + datetime.timedelta(minutes=5 * i):%Y%m%d%H%M}.png"
+        for idr in BOMRadarLocation.IDR_LIST
+        for radar_type in RADAR_TYPE
+        for i in range(288)
+    ]
+
+
+def list_filter(frames, radar_locations, radar_types, start_time, end_time):
+    """The list comprehension passes get_matching_files used to make"""
+
+    frames = [x for x in frames if x.radar_id in radar_locations]
+    frames = [x for x in frames if x.radar_type in radar_types]
+    return [x for x in frames if start_time <= x.dt_utc <= end_time]
+
+
+def bench(name: str, func, repeat: int = 5, number: int = 10) -> float:
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    print(f"{name:<32} {best * 1e6:>12.1f} us")
+    return best
+
+
+def main():
+    listing = build_listing()
+    print(f"{len(listing)} filenames\n")
+
+    radar_locations = [BOMRadarLocation.IDR02]
+    radar_types = [RADAR_TYPE.REF_128_KM]
+    start_time = START + datetime.timedelta(hours=12)
+    end_time = START + datetime.timedelta(hours=13)
+
+    frames = [BOMRadarFrameMetadata(x.rpartition("/")[2]) for x in listing]
+    catalog = BOMRadarCatalog.from_filenames(listing)
+
+    print("Build")
+    bench(
+        "metadata list",
+        lambda: [BOMRadarFrameMetadata(x[16:]) for x in listing],
+        number=1,
+    )
+    bench(
+        "BOMRadarCatalog.from_filenames",
+        lambda: BOMRadarCatalog.from_filenames(listing),
+        number=1,
+    )
+
+    print("\nFilter (one radar, one type, one hour)")
+    before = bench(
+        "list comprehensions",
+        lambda: list_filter(frames, radar_locations, radar_types, start_time, end_time),
+    )
+    after = bench(
+        "BOMRadarCatalog.mask",
+        lambda: catalog.mask(radar_locations, radar_types, start_time, end_time),
+        number=1000,
+    )
+    print(f"{'speedup':<32} {before / after:>12.1f} x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Translating a 512x512 grid of distances and bearings from a radar.
+
+Compares calling the scalar :func:`get_translation_coordinate` for
+every pixel with one call to :func:`get_translation_coordinates`.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/bench_coordinates.py
+"""
+
+import time
+
+import numpy as np
+
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.common.utils import (
+    get_translation_coordinate,
+    get_translation_coordinates,
+)
+
+SIZE = 512
+RANGE = 128
+
+
+def main():
+    latitude, longitude = BOMRadarLocation.IDR02.location
+    offsets = (np.arange(SIZE) + 0.5) * (2 * RANGE / SIZE) - RANGE
+    x, y = np.meshgrid(offsets, -offsets)
+    distances = np.hypot(x, y)
+    bearings = np.degrees(np.arctan2(x, y)) % 360
+
+    start = time.perf_counter()
+    scalar = [
+        get_translation_coordinate(latitude, longitude, d, b)
+        for d, b in zip(distances.ravel().tolist(), bearings.ravel().tolist())
+    ]
+    scalar_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    lats, lons = get_translation_coordinates(latitude, longitude, distances, bearings)
+    vector_ms = (time.perf_counter() - start) * 1000
+
+    assert len(scalar) == lats.size
+    print(f"{SIZE}x{SIZE} pixels\n")
+    print(f"scalar loop     {scalar_ms:8.1f} ms")
+    print(f"vectorised      {vector_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Routing locations to the radar product with the best resolution.
+
+Times :meth:`BOMRadarCoverage.best` for 10,000 locations across
+south east Australia against looping over every (location, radar type)
+pair of every radar for each location.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/bench_coverage.py
+"""
+
+import time
+
+import numpy as np
+
+from aus_weather_data.radar.common.coverage import BOMRadarCoverage
+from aus_weather_data.radar.common.location import IDR_LOCATIONS
+from aus_weather_data.radar.common.types import RADAR_TYPE_RANGE
+from aus_weather_data.radar.common.utils import get_distance_bearing
+
+POINTS = 10000
+SAMPLE = 200
+
+
+def loop_best(latitude, longitude):
+    best = None
+    for location in IDR_LOCATIONS:
+        distance, _ = get_distance_bearing(*location.location, latitude, longitude)
+        for radar_type in location.radar_types:
+            key = (RADAR_TYPE_RANGE[radar_type], float(distance))
+            if distance <= key[0] and (best is None or key < best[0]):
+                best = (key, location, radar_type)
+    return best
+
+
+def main():
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(-39, -27, POINTS)
+    lons = rng.uniform(140, 154, POINTS)
+
+    start = time.perf_counter()
+    coverage = BOMRadarCoverage()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    best = coverage.best(lats, lons)
+    index_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for lat, lon in zip(lats[:SAMPLE].tolist(), lons[:SAMPLE].tolist()):
+        loop_best(lat, lon)
+    loop_ms = (time.perf_counter() - start) / SAMPLE * POINTS * 1000
+
+    print(f"{POINTS} locations, {len(coverage)} (location, radar type) pairs\n")
+    print(f"build index       {build_ms:8.1f} ms")
+    print(f"best (index)      {index_ms:8.1f} ms  {(best >= 0).mean():.0%} covered")
+    print(f"loop over pairs   {loop_ms:8.1f} ms  (scaled from {SAMPLE})")
+
+
+if __name__ == "__main__":
+    main()
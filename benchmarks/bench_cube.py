@@ -0,0 +1,70 @@
+"""Reopening a day of decoded frames from a cube against decoding them again.
+
+Builds a :class:`BOMRadarCube` of a day of 5 minute frames for one
+radar (288 frames, the test asset as every PNG), then times getting
+the indices of every frame by decoding the PNGs again and by reopening
+the cube. The page cache is warm for both.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/bench_cube.py
+"""
+
+import datetime
+import os
+import tempfile
+import time
+
+from loguru import logger
+
+from aus_weather_data.radar.common.frame import BOMRadarFramePNG
+from aus_weather_data.radar.common.png import decode_png
+from aus_weather_data.radar.local.cube import BOMRadarCube
+
+ASSET = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "assets", "IDR024.T.202001312324.png"
+)
+START = datetime.datetime(2024, 10, 15, tzinfo=datetime.timezone.utc)
+
+
+def main():
+    logger.disable("aus_weather_data")
+
+    with open(ASSET, "rb") as f:
+        data = f.read()
+
+    frames = []
+    for i in range(288):
+        frame = BOMRadarFramePNG(
+            f"IDR023.T.{START + datetime.timedelta(minutes=5 * i):%Y%m%d%H%M}.png"
+        )
+        frame.load_png_data(data)
+        frames.append(frame)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "day")
+
+        start = time.perf_counter()
+        BOMRadarCube.build(path, frames)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        decoded = sum(int(decode_png(frame.png_data)[0].sum()) for frame in frames)
+        decode_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        cube = BOMRadarCube(path)
+        reopen_ms = (time.perf_counter() - start) * 1000
+        total = sum(int(cube.indices[t].sum()) for t in range(len(cube)))
+        read_ms = (time.perf_counter() - start) * 1000
+
+    assert decoded == total
+    print(f"{len(frames)} frames, cube of {cube.indices.nbytes / 2**20:.0f} MiB\n")
+    print(f"build cube               {build_ms:8.1f} ms")
+    print(f"decode every frame       {decode_ms:8.1f} ms")
+    print(f"reopen cube              {reopen_ms:8.1f} ms")
+    print(f"reopen and read frames   {read_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
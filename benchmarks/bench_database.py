@@ -0,0 +1,80 @@
+"""Selecting the frames to download when most are already stored.
+
+Compares passing the stored frames as an ``ignore_list`` to
+:meth:`BOMRadarCatalog.filter` with an indexed query on
+:class:`BOMRadarFrameDatabase`.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/bench_database.py
+"""
+
+import datetime
+import time
+
+from aus_weather_data.radar.common.catalog import BOMRadarCatalog
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.common.types import RADAR_TYPE
+from aus_weather_data.radar.local.database import BOMRadarFrameDatabase, FRAME_STATUS
+
+START = datetime.datetime(2024, 10, 15, tzinfo=datetime.timezone.utc)
+REPEAT = 5
+
+
+def build_listing(days: int) -> list:
+    """5 minute frames for every location and radar type"""
+
+    return [
+        f"{idr}{radar_type.value}.T.{START + datetime.timedelta(minutes=5 * i):%Y%m%d%H%M}.png"
+        for idr in BOMRadarLocation.IDR_LIST
+        for radar_type in RADAR_TYPE
+        for i in range(288 * days)
+    ]
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main():
+    listing = build_listing(days=1)
+    catalog = BOMRadarCatalog.from_filenames(listing)
+
+    # Everything but the last hour is already stored
+    cutoff = START + datetime.timedelta(hours=23)
+    stored = catalog.filter(end_time_utc=cutoff - datetime.timedelta(minutes=1))
+    ignore_list = [frame.filename for frame in stored]
+
+    database = BOMRadarFrameDatabase()
+    database.update_listing(catalog)
+    for frame in stored:
+        database.mark_stored(frame, size=0)
+
+    print(f"{len(catalog)} listed, {len(ignore_list)} stored")
+
+    locations = [BOMRadarLocation.IDR02, BOMRadarLocation.IDR71]
+    result = catalog.filter(radar_locations=locations, ignore_list=ignore_list)
+    query = database.query(
+        radar_locations=locations, exclude_status=[FRAME_STATUS.STORED]
+    )
+    assert sorted(result.keys) == sorted(query.keys)
+    print(f"{len(result)} to download for {len(locations)} radars\n")
+
+    ignore_ms = timed(
+        lambda: catalog.filter(radar_locations=locations, ignore_list=ignore_list)
+    )
+    query_ms = timed(
+        lambda: database.query(
+            radar_locations=locations, exclude_status=[FRAME_STATUS.STORED]
+        )
+    )
+
+    print(f"ignore_list filter   {ignore_ms:8.2f} ms")
+    print(f"database query       {query_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Memory held by frame metadata for a week of listings.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/bench_frame_memory.py
+"""
+
+import datetime
+import tracemalloc
+
+from aus_weather_data.radar.common.frame import BOMRadarFrameMetadata
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.common.types import RADAR_TYPE
+
+
+def build_listing(days: int) -> list:
+    """5 minute frames for every location and radar type"""
+
+    start = datetime.datetime(2024, 10, 15, tzinfo=datetime.timezone.utc)
+    return [
+        f"{idr}{radar_type.value}.T.{start + datetime.timedelta(minutes=5 * i):%Y%m%d%H%M}.png"
+        for idr in BOMRadarLocation.IDR_LIST
+        for radar_type in RADAR_TYPE
+        for i in range(288 * days)
+    ]
+
+
+def main():
+    listing = build_listing(days=7)
+
+    tracemalloc.start()
+    frames = [BOMRadarFrameMetadata(filename) for filename in listing]
+    del listing
+    current, _ = tracemalloc.get_traced_memory()
+    print(f"{len(frames)} frames")
+    print(f"{current / 2**20:.1f} MiB held, {current / len(frames):.0f} bytes/frame")
+
+    for frame in frames:
+        frame.date_utc
+    current, _ = tracemalloc.get_traced_memory()
+    print(
+        f"{current / 2**20:.1f} MiB held after reading date_utc, "
+        f"{current / len(frames):.0f} bytes/frame"
+    )
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
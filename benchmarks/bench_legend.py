@@ -0,0 +1,58 @@
+"""Converting a decoded radar frame to physical values.
+
+Compares matching each pixel's RGB colour against the legend colours
+with a lookup table from palette index to value
+(:meth:`BOMRadarLegend.convert`).
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/bench_legend.py
+"""
+
+import os
+import time
+
+import numpy as np
+
+from aus_weather_data.radar.common.legend import REFLECTIVITY_DBZ
+from aus_weather_data.radar.common.png import decode_png
+
+ASSET = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "assets", "IDR024.T.202001312324.png"
+)
+REPEAT = 50
+
+
+def colour_match(indices, palette):
+    rgb = palette[indices]
+    values = np.full(indices.shape, np.nan, dtype=np.float32)
+    for colour, value in zip(REFLECTIVITY_DBZ.colours, REFLECTIVITY_DBZ.values):
+        values[(rgb == colour).all(axis=2)] = value
+    return values
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main():
+    with open(ASSET, "rb") as f:
+        indices, palette, alpha = decode_png(f.read())
+
+    expected = colour_match(indices, palette)
+    result = REFLECTIVITY_DBZ.convert(indices, palette)
+    np.testing.assert_array_equal(expected, result)
+
+    match_ms = timed(lambda: colour_match(indices, palette))
+    lut_ms = timed(lambda: REFLECTIVITY_DBZ.convert(indices, palette))
+
+    print(f"{indices.shape[1]}x{indices.shape[0]} frame\n")
+    print(f"colour matching  {match_ms:8.2f} ms")
+    print(f"lookup table     {lut_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Parse work per poll for a 5 minute radar listing poller.
+
+Compares re-parsing the whole listing each poll with
+:class:`BOMRadarListingTracker`, which only parses new entries.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/bench_listing.py
+"""
+
+import datetime
+import time
+
+from loguru import logger
+
+from aus_weather_data.radar.common.catalog import BOMRadarCatalog
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.common.types import RADAR_TYPE
+from aus_weather_data.radar.remote.listing import BOMRadarListingTracker
+
+START = datetime.datetime(2024, 10, 15, tzinfo=datetime.timezone.utc)
+
+
+def build_listing(offset: int) -> list:
+    """A rolling day of 5 minute frames, shifted by `offset` frames"""
+
+    return [
+        f"/anon/gen/radar/{idr}{radar_type.value}.T."
+        f"{START + datetime.timedelta(minutes=5 * i):%Y%m%d%H%M}.png"
+        for idr in BOMRadarLocation.IDR_LIST
+        for radar_type in RADAR_TYPE
+        for i in range(offset, offset + 288)
+    ]
+
+
+def main():
+    logger.disable("aus_weather_data")
+    polls = [build_listing(offset) for offset in range(6)]
+    print(f"{len(polls[0])} filenames per poll, {len(polls)} polls\n")
+
+    start = time.perf_counter()
+    for listing in polls[1:]:
+        BOMRadarCatalog.from_filenames(listing).filter([BOMRadarLocation.IDR02])
+    full = (time.perf_counter() - start) / (len(polls) - 1)
+    print(f"{'full re-parse':<24} {full * 1e3:>10.1f} ms/poll")
+
+    tracker = BOMRadarListingTracker()
+    tracker.update(polls[0])
+    tracker.catalog
+
+    parsed = 0
+    start = time.perf_counter()
+    for listing in polls[1:]:
+        parsed += len(tracker.update(listing).added)
+        tracker.catalog.filter([BOMRadarLocation.IDR02])
+    incremental = (time.perf_counter() - start) / (len(polls) - 1)
+    print(f"{'listing tracker':<24} {incremental * 1e3:>10.1f} ms/poll")
+    print(
+        f"{'entries parsed':<24} {parsed / (len(polls) - 1):>10.0f} /poll "
+        f"({100 * parsed / (len(polls) - 1) / len(polls[0]):.1f}% of the listing)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Compositing the Sydney and Wollongong radars onto a lat/lon grid.
+
+Times building the index maps of a :class:`BOMRadarMosaic` once, then
+compositing a pair of frames with them, against working out the pixel
+of every cell and converting whole frames each time.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/bench_mosaic.py
+"""
+
+import os
+import time
+
+import numpy as np
+
+from aus_weather_data.radar.common.frame import BOMRadarFrameData
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.common.mosaic import BOMRadarMosaic
+from aus_weather_data.radar.common.types import RADAR_TYPE
+
+ASSET = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "assets", "IDR024.T.202001312324.png"
+)
+LOCATIONS = [BOMRadarLocation.IDR71, BOMRadarLocation.IDR03]
+LATITUDES = np.arange(-32.6, -35.8, -0.004)
+LONGITUDES = np.arange(149.4, 152.6, 0.004)
+REPEAT = 20
+
+
+def per_frame(frames, lats, lons):
+    out = np.full(lats.shape, np.nan, dtype=np.float32)
+    for frame, location in zip(frames, LOCATIONS):
+        rows, cols = location.coordinates_to_pixels(RADAR_TYPE.REF_128_KM, lats, lons)
+        values = frame.values()[rows, cols]
+        values[rows < 0] = np.nan
+        out = np.fmax(out, values)
+    return out
+
+
+def main():
+    with open(ASSET, "rb") as f:
+        data = f.read()
+
+    frames = []
+    for filename in ["IDR713.T.202410150000.png", "IDR033.T.202410150000.png"]:
+        frame = BOMRadarFrameData(filename)
+        frame.load_png_data(data)
+        frame.decode()
+        frames.append(frame)
+
+    start = time.perf_counter()
+    mosaic = BOMRadarMosaic(
+        LOCATIONS, RADAR_TYPE.REF_128_KM, LATITUDES, LONGITUDES, "max"
+    )
+    build_ms = (time.perf_counter() - start) * 1000
+
+    out = np.empty(mosaic.shape, dtype=np.float32)
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        mosaic.composite(frames, out=out)
+    composite_ms = (time.perf_counter() - start) / REPEAT * 1000
+
+    lats, lons = np.meshgrid(LATITUDES, LONGITUDES, indexing="ij")
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        per_frame(frames, lats, lons)
+    naive_ms = (time.perf_counter() - start) / REPEAT * 1000
+
+    rows, cols = mosaic.shape
+    print(f"{len(frames)} radars onto a {rows}x{cols} grid\n")
+    print(f"build index maps       {build_ms:8.1f} ms  (once)")
+    print(f"composite              {composite_ms:8.1f} ms  per pair of frames")
+    print(f"pixels every frame     {naive_ms:8.1f} ms  per pair of frames")
+
+
+if __name__ == "__main__":
+    main()
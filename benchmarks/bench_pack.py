@@ -0,0 +1,75 @@
+"""Replaying a day of frames from PNG files and from a pack.
+
+Writes a day of 5 minute frames for 8 radars (2304 frames, the test
+asset as every PNG) as individual files and as a
+:class:`BOMRadarFramePack`, then times reading every frame back in time
+order. The page cache is warm for both.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/bench_pack.py
+"""
+
+import datetime
+import os
+import tempfile
+import time
+
+from aus_weather_data.radar.common.frame import BOMRadarFramePNG
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.local.pack import BOMRadarFramePack
+
+ASSET = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "assets", "IDR024.T.202001312324.png"
+)
+START = datetime.datetime(2024, 10, 15, tzinfo=datetime.timezone.utc)
+
+
+def build_frames(data: bytes) -> list:
+    frames = []
+    for i in range(288):
+        for idr in BOMRadarLocation.IDR_LIST[:8]:
+            frame = BOMRadarFramePNG(
+                f"{idr}3.T.{START + datetime.timedelta(minutes=5 * i):%Y%m%d%H%M}.png"
+            )
+            frame.load_png_data(data)
+            frames.append(frame)
+    return frames
+
+
+def main():
+    with open(ASSET, "rb") as f:
+        data = f.read()
+    frames = build_frames(data)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for frame in frames:
+            frame.save_png_to_file(directory)
+
+        pack_path = os.path.join(directory, "day")
+        with BOMRadarFramePack(pack_path) as pack:
+            pack.extend(frames)
+
+        names = [frame.filename for frame in frames]
+
+        start = time.perf_counter()
+        total = 0
+        for name in names:
+            loaded = BOMRadarFramePNG(name)
+            loaded.load_png_from_file(directory)
+            total += len(loaded.png_data)
+        files_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        with BOMRadarFramePack(pack_path) as pack:
+            pack_total = sum(len(frame.png_data) for frame in pack.frames())
+        pack_ms = (time.perf_counter() - start) * 1000
+
+    assert total == pack_total
+    print(f"{len(frames)} frames, {total / 2**20:.1f} MiB\n")
+    print(f"PNG files   {files_ms:8.1f} ms")
+    print(f"pack        {pack_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
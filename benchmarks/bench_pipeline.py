@@ -0,0 +1,102 @@
+"""Downloading, decoding and storing frames one step after another and as a pipeline.
+
+Simulates a backfill of 384 frames over 4 FTP connections, each
+download taking 20 ms, with the test asset as every PNG. The steps run
+one after another (:meth:`BOMRadarDownload.get_radar_frames`, then
+:meth:`BOMRadarBatchDecoder.decode`, then the writer), then as
+:meth:`BOMRadarDownload.process_radar_frames` with the stages
+overlapping.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/bench_pipeline.py
+"""
+
+import datetime
+import os
+import time
+
+import numpy as np
+from loguru import logger
+
+from aus_weather_data.radar.common.decode import BOMRadarBatchDecoder
+from aus_weather_data.radar.common.frame import BOMRadarFramePNG
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.remote.download import BOMRadarDownload
+
+ASSET = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "assets", "IDR024.T.202001312324.png"
+)
+START = datetime.datetime(2024, 10, 15, tzinfo=datetime.timezone.utc)
+LATENCY = 0.02
+
+with open(ASSET, "rb") as f:
+    DATA = f.read()
+
+FILENAMES = [
+    f"{idr}3.T.{START + datetime.timedelta(minutes=5 * i):%Y%m%d%H%M}.png"
+    for idr in BOMRadarLocation.IDR_LIST[:4]
+    for i in range(96)
+]
+
+
+class SimulatedConn(object):
+    def __init__(self):
+        self.last_activity = time.monotonic()
+
+    def quit(self):
+        pass
+
+    def keep_alive(self):
+        return True
+
+    def get_directory_contents(self):
+        return ["/anon/gen/radar/" + x for x in FILENAMES]
+
+    def get_file(self, remote_file, reuse_buffer=False):
+        time.sleep(LATENCY)
+        frame = BOMRadarFramePNG(remote_file.filename)
+        frame.load_png_data(DATA)
+        return frame
+
+
+class SimulatedDownload(BOMRadarDownload):
+    def _create_new_connection(self):
+        return SimulatedConn()
+
+
+def main():
+    logger.disable("aus_weather_data")
+    store = np.empty((len(FILENAMES), 512, 512), dtype=np.uint8)
+    positions = {x: i for i, x in enumerate(FILENAMES)}
+
+    def writer(frame, indices, palette, alpha):
+        store[positions[frame.filename]] = indices
+
+    with BOMRadarBatchDecoder() as decoder:
+        decoder.decode([]).close()
+
+        start = time.perf_counter()
+        frames_map = SimulatedDownload(connections_count=4).get_radar_frames()
+        frames = [x for types in frames_map.values() for y in types.values() for x in y]
+        with decoder.decode(frames) as batch:
+            for number, frame in enumerate(batch.frames):
+                writer(frame, *batch[number])
+        sequential_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        report = SimulatedDownload(connections_count=4).process_radar_frames(
+            writer, decoder=decoder
+        )
+        pipeline_ms = (time.perf_counter() - start) * 1000
+        assert report.ok
+
+    print(
+        f"{len(FILENAMES)} frames, {LATENCY * 1000:.0f} ms per download, 4 connections\n"
+    )
+    print(f"one step after another  {sequential_ms:8.1f} ms")
+    print(f"pipeline                {pipeline_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
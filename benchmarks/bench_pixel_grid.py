@@ -0,0 +1,59 @@
+"""Getting the latitude and longitude of every pixel of a radar image.
+
+Times computing the grid, loading it from the disk cache in a fresh
+location model (as a worker process would) and the in-process memo.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/bench_pixel_grid.py
+"""
+
+import tempfile
+import time
+
+from aus_weather_data.radar.common.grid import compute_pixel_grid
+from aus_weather_data.radar.common.idr_data import IDR_DATA
+from aus_weather_data.radar.common.location import BOMRadarLocationModel
+from aus_weather_data.radar.common.types import RADAR_TYPE, RADAR_TYPE_RANGE
+
+RADAR_TYPES = [
+    RADAR_TYPE.REF_64_KM,
+    RADAR_TYPE.REF_128_KM,
+    RADAR_TYPE.REF_256_KM,
+    RADAR_TYPE.REF_512_KM,
+]
+
+
+def main():
+    location = BOMRadarLocationModel(**IDR_DATA["IDR02"])
+    latitude, longitude = location.location
+
+    start = time.perf_counter()
+    for radar_type in RADAR_TYPES:
+        compute_pixel_grid(latitude, longitude, RADAR_TYPE_RANGE[radar_type])
+    compute_ms = (time.perf_counter() - start) * 1000
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for radar_type in RADAR_TYPES:
+            location.pixel_grid(radar_type, cache_dir=cache_dir)
+
+        worker = BOMRadarLocationModel(**IDR_DATA["IDR02"])
+        start = time.perf_counter()
+        for radar_type in RADAR_TYPES:
+            lats, lons = worker.pixel_grid(radar_type, cache_dir=cache_dir)
+            lats.sum() + lons.sum()
+        disk_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for radar_type in RADAR_TYPES:
+            worker.pixel_grid(radar_type, cache_dir=cache_dir)
+        memo_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{len(RADAR_TYPES)} radar types, 512x512 pixels\n")
+    print(f"computed          {compute_ms:8.2f} ms")
+    print(f"disk cache        {disk_ms:8.2f} ms  (memory mapped and read)")
+    print(f"in-process memo   {memo_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
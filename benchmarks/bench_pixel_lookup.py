@@ -0,0 +1,61 @@
+"""Finding the pixels of many locations on a radar frame.
+
+Times the closed form :meth:`BOMRadarLocationModel.coordinates_to_pixels`
+for 10,000 locations against a nearest neighbour search of the pixel
+grid, which is run on a sample of the locations and scaled up.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/bench_pixel_lookup.py
+"""
+
+import tempfile
+import time
+
+import numpy as np
+
+from aus_weather_data.radar.common.idr_data import IDR_DATA
+from aus_weather_data.radar.common.location import BOMRadarLocationModel
+from aus_weather_data.radar.common.types import RADAR_TYPE
+
+POINTS = 10000
+SAMPLE = 100
+REPEAT = 100
+
+
+def main():
+    location = BOMRadarLocationModel(**IDR_DATA["IDR02"])
+    radar_type = RADAR_TYPE.REF_128_KM
+    latitude, longitude = location.location
+
+    rng = np.random.default_rng(0)
+    lats = latitude + rng.uniform(-1, 1, POINTS)
+    lons = longitude + rng.uniform(-1, 1, POINTS)
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        rows, cols = location.coordinates_to_pixels(radar_type, lats, lons)
+    closed_ms = (time.perf_counter() - start) / REPEAT * 1000
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        grid_lats, grid_lons = location.pixel_grid(radar_type, cache_dir=cache_dir)
+        grid_lats, grid_lons = grid_lats.ravel(), grid_lons.ravel()
+
+        start = time.perf_counter()
+        nearest = [
+            np.argmin((grid_lats - lat) ** 2 + (grid_lons - lon) ** 2)
+            for lat, lon in zip(lats[:SAMPLE], lons[:SAMPLE])
+        ]
+        search_ms = (time.perf_counter() - start) / SAMPLE * POINTS * 1000
+
+    inside = rows[:SAMPLE] >= 0
+    agree = (np.array(nearest) == rows[:SAMPLE] * 512 + cols[:SAMPLE])[inside].mean()
+
+    print(f"{POINTS} locations on a 512x512 frame\n")
+    print(f"closed form          {closed_ms:10.2f} ms")
+    print(f"nearest neighbour    {search_ms:10.2f} ms  (scaled from {SAMPLE})")
+    print(f"agreement            {agree:10.1%}")
+
+
+if __name__ == "__main__":
+    main()
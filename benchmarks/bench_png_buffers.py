@@ -0,0 +1,98 @@
+"""Memory allocated per downloaded frame by :meth:`BOMFTPConn.get_file`.
+
+Compares the previous ``BytesIO`` + ``getvalue()`` download with the
+connection buffer, copied out (the default) and reused
+(``reuse_buffer=True``). The FTP server is replaced with the test asset
+served in 8 KiB chunks, the :mod:`ftplib` default block size.
+
+Only the reused buffer allocates less than ``BytesIO``. Frames that are
+kept, as by :meth:`BOMRadarDownload.get_radar_frames`, need the copy, so
+the saving is limited to :meth:`BOMRadarDownload.iter_radar_frames`.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/bench_png_buffers.py
+"""
+
+import os
+import tracemalloc
+
+from io import BytesIO
+
+from loguru import logger
+
+from aus_weather_data.radar.common.frame import BOMRadarFrameMetadata, BOMRadarFramePNG
+from aus_weather_data.radar.remote.conn import BOMFTPConn
+
+ASSET = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "assets", "IDR024.T.202001312324.png"
+)
+FRAMES = 1000
+
+
+class AssetFTP(object):
+    """Serves the test asset for every RETR
+
+    The chunks are made up front, so only allocations made by the
+    download itself are measured (``ftplib`` allocates the received
+    chunks the same way for every method).
+    """
+
+    def __init__(self, data: bytes, blocksize: int = 8192):
+        self.chunks = [
+            data[start : start + blocksize] for start in range(0, len(data), blocksize)
+        ]
+
+    def retrbinary(self, cmd, callback):
+        for chunk in self.chunks:
+            callback(chunk)
+
+
+def get_file_bytesio(conn: BOMFTPConn, remote_file: BOMRadarFrameMetadata):
+    """The download as it was before the connection buffer"""
+
+    byte_stream = BytesIO()
+    conn._ftp.retrbinary(f"RETR {remote_file.filename}", byte_stream.write)
+    frame = BOMRadarFramePNG(remote_file.filename)
+    frame.load_png_data(byte_stream.getvalue())
+    return frame
+
+
+def measure(name: str, download) -> None:
+    """Average peak bytes allocated per frame when each frame is dropped"""
+
+    peaks = 0
+    tracemalloc.start()
+    for _ in range(FRAMES):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        frame = download()
+        _, peak = tracemalloc.get_traced_memory()
+        peaks += peak - before
+        del frame
+    tracemalloc.stop()
+
+    print(f"{name:<22} {peaks / FRAMES:>8.0f} bytes peak/frame")
+
+
+def main():
+    logger.remove()
+
+    with open(ASSET, "rb") as f:
+        data = f.read()
+    print(f"{len(data)} byte PNG, {FRAMES} frames\n")
+
+    remote_file = BOMRadarFrameMetadata(os.path.basename(ASSET))
+    conn = BOMFTPConn()
+    conn._ftp_conn = AssetFTP(data)  # type: ignore
+
+    measure("BytesIO + getvalue", lambda: get_file_bytesio(conn, remote_file))
+    measure("buffer, copied out", lambda: conn.get_file(remote_file))
+    measure(
+        "buffer, reused",
+        lambda: conn.get_file(remote_file, reuse_buffer=True),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Decoding a radar frame PNG into an array.
+
+Times :func:`decode_png` on the test asset and reports the size of the
+palette index array against an RGBA decode of the same frame. If Pillow
+happens to be installed, its RGBA decode is timed too for comparison.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/bench_png_decode.py
+"""
+
+import os
+import time
+
+from aus_weather_data.radar.common.png import decode_png
+
+ASSET = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "assets", "IDR024.T.202001312324.png"
+)
+REPEAT = 200
+
+
+def main():
+    with open(ASSET, "rb") as f:
+        data = f.read()
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        indices, palette, alpha = decode_png(data)
+    decode_ms = (time.perf_counter() - start) / REPEAT * 1000
+
+    height, width = indices.shape
+    print(f"{width}x{height} frame, {len(data)} bytes of PNG\n")
+    print(f"decode_png       {decode_ms:8.2f} ms  {indices.nbytes:>8} bytes")
+    print(f"RGBA array                   {height * width * 4:>8} bytes")
+
+    try:
+        import io
+
+        from PIL import Image
+    except ImportError:
+        return
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        rgba = Image.open(io.BytesIO(data)).convert("RGBA").tobytes()
+    pillow_ms = (time.perf_counter() - start) / REPEAT * 1000
+    print(f"Pillow RGBA      {pillow_ms:8.2f} ms  {len(rgba):>8} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Per-filename parsing cost for a BOM radar directory listing.
+
+Compares the original ``split_filename`` / frame construction path with
+the fixed-offset :func:`parse_filename` fast path.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/bench_split_filename.py
+"""
+
+import datetime
+import timeit
+
+from aus_weather_data.radar.common.frame import BOMRadarFrameMetadata
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.common.types import RADAR_TYPE
+from aus_weather_data.radar.common.utils import parse_filename, split_filename
+
+
+def legacy_split_filename(filename: str) -> dict:
+    """split_filename as it was before the fast path was added"""
+
+    filename_array = filename.split(".")
+    if len(filename_array) != 4:
+        raise ValueError("Filename is not in the correct format.")
+
+    year = filename_array[2][0:4]
+    month = filename_array[2][4:6]
+    day = filename_array[2][6:8]
+    hour = filename_array[2][8:10]
+    minute = filename_array[2][10:12]
+    return {
+        "filename": filename,
+        "idr": filename_array[0][:-1],
+        "idrType": filename_array[0][-1:],
+        "base": filename_array[0],
+        "year": year,
+        "month": month,
+        "day": day,
+        "hour": hour,
+        "minute": minute,
+        "date": "{year}-{month}-{day}".format(year=year, month=month, day=day),
+        "dt": datetime.datetime.strptime(filename_array[2], "%Y%m%d%H%M").replace(
+            tzinfo=datetime.timezone.utc
+        ),
+    }
+
+
+def legacy_frame(filename: str) -> dict:
+    """Frame construction work as it was before the fast path was added"""
+
+    metadata = legacy_split_filename(filename)
+    getattr(BOMRadarLocation, metadata["idr"])
+    RADAR_TYPE(metadata["idrType"])
+    return metadata
+
+
+def build_listing() -> list:
+    """A day of 5 minute frames for every location and radar type"""
+
+    start = datetime.datetime(2024, 10, 15, tzinfo=datetime.timezone.utc)
+    return [
+        f"{idr}{radar_type.value}.T.{start + datetime.timedelta(minutes=5 * i):%Y%m%d%H%M}.png"
+        for idr in BOMRadarLocation.IDR_LIST
+        for radar_type in RADAR_TYPE
+        for i in range(288)
+    ]
+
+
+def bench(name: str, func, listing: list, repeat: int = 5) -> float:
+    def run():
+        for filename in listing:
+            func(filename)
+
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    per_filename = best / len(listing) * 1e9
+    print(f"{name:<32} {per_filename:>10.0f} ns/filename")
+    return per_filename
+
+
+def main():
+    listing = build_listing()
+    print(f"{len(listing)} filenames\n")
+
+    print("Parsing")
+    before = bench("legacy split_filename", legacy_split_filename, listing)
+    bench("split_filename", split_filename, listing)
+    after = bench("parse_filename", parse_filename, listing)
+    print(f"{'speedup':<32} {before / after:>10.1f} x\n")
+
+    print("Frame metadata construction")
+    before = bench("legacy frame", legacy_frame, listing)
+    after = bench("BOMRadarFrameMetadata", BOMRadarFrameMetadata, listing)
+    print(f"{'speedup':<32} {before / after:>10.1f} x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import datetime
+import os
+import stat
+
+import pytest
+
+from aus_weather_data.radar.common.catalog import BOMRadarCatalog
+from aus_weather_data.radar.common.frame import (
+    BOMRadarFrameMetadata,
+    BOMRadarFramePNG,
+)
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.common.types import RADAR_TYPE
+from aus_weather_data.radar.local.archive import BOMRadarArchive
+
+FILENAMES = [
+    "IDR023.T.202410142355.png",
+    "IDR023.T.202410150000.png",
+    "IDR023.T.202410150005.png",
+    "IDR714.T.202410150000.png",
+]
+
+
+def png_frame(filename):
+    frame = BOMRadarFramePNG(filename)
+    frame.load_png_data(filename.encode())
+    return frame
+
+
+def test_archive_layout(tmp_path):
+    archive = BOMRadarArchive(str(tmp_path))
+    path = archive.save(png_frame(FILENAMES[1]))
+
+    assert path == os.path.join(
+        str(tmp_path), "IDR02", "3", "2024", "10", "15", FILENAMES[1]
+    )
+    assert os.listdir(os.path.dirname(path)) == [FILENAMES[1]]
+    assert archive.load(BOMRadarFrameMetadata(FILENAMES[1])).png_data == (
+        FILENAMES[1].encode()
+    )
+
+
+def test_archive_index(tmp_path):
+    with BOMRadarArchive(str(tmp_path)) as archive:
+        for filename in FILENAMES:
+            archive.save(png_frame(filename))
+
+        assert len(archive) == 4
+        assert BOMRadarFrameMetadata(FILENAMES[0]) in archive
+        assert BOMRadarFrameMetadata("IDR023.T.202410150010.png") not in archive
+
+        frames = archive.between(
+            BOMRadarLocation.IDR02,
+            RADAR_TYPE.REF_128_KM,
+            datetime.datetime(2024, 10, 15, tzinfo=datetime.timezone.utc),
+        )
+        assert [x.filename for x in frames] == FILENAMES[1:3]
+
+    # The index is saved on exit and loaded without scanning the archive
+    assert os.path.exists(tmp_path / BOMRadarArchive.INDEX_FILENAME)
+    os.remove(archive.path(BOMRadarFrameMetadata(FILENAMES[3])))
+
+    reopened = BOMRadarArchive(str(tmp_path))
+    assert len(reopened) == 4
+
+    reopened.rebuild_index()
+    assert len(reopened) == 3
+    assert BOMRadarFrameMetadata(FILENAMES[3]) not in reopened
+
+
+def test_archive_rebuild_without_index(tmp_path):
+    archive = BOMRadarArchive(str(tmp_path))
+    for filename in FILENAMES:
+        archive.save(png_frame(filename))
+
+    # Not flushed, so the frames are found by scanning
+    assert len(BOMRadarArchive(str(tmp_path))) == 4
+
+
+def test_archive_remove_and_missing(tmp_path):
+    archive = BOMRadarArchive(str(tmp_path))
+    for filename in FILENAMES[:2]:
+        archive.save(png_frame(filename))
+
+    missing = archive.missing(BOMRadarCatalog.from_filenames(FILENAMES))
+    assert sorted(x.filename for x in missing) == sorted(FILENAMES[2:])
+
+    archive.remove(BOMRadarFrameMetadata(FILENAMES[0]))
+    assert BOMRadarFrameMetadata(FILENAMES[0]) not in archive
+    with pytest.raises(FileNotFoundError):
+        archive.load(BOMRadarFrameMetadata(FILENAMES[0]))
+
+    # The keys are cached between calls and refreshed by changes
+    missing = archive.missing(BOMRadarCatalog.from_filenames(FILENAMES))
+    assert sorted(x.filename for x in missing) == sorted(FILENAMES[:1] + FILENAMES[2:])
+    archive.save(png_frame(FILENAMES[3]))
+    missing = archive.missing(BOMRadarCatalog.from_filenames(FILENAMES))
+    assert sorted(x.filename for x in missing) == sorted(FILENAMES[:1] + FILENAMES[2:3])
+
+
+def test_archive_stale_index(tmp_path):
+    with BOMRadarArchive(str(tmp_path)) as archive:
+        for filename in FILENAMES[:3]:
+            archive.save(png_frame(filename))
+        assert os.path.exists(tmp_path / BOMRadarArchive.DIRTY_FILENAME)
+
+    assert not os.path.exists(tmp_path / BOMRadarArchive.DIRTY_FILENAME)
+
+    # Changes that are never flushed, as if the process had crashed
+    archive = BOMRadarArchive(str(tmp_path))
+    archive.remove(BOMRadarFrameMetadata(FILENAMES[0]))
+    archive.save(png_frame(FILENAMES[3]))
+    del archive
+
+    reopened = BOMRadarArchive(str(tmp_path))
+    assert len(reopened) == 3
+    missing = reopened.missing(BOMRadarCatalog.from_filenames(FILENAMES))
+    assert [x.filename for x in missing] == FILENAMES[:1]
+
+    reopened.flush()
+    assert not os.path.exists(tmp_path / BOMRadarArchive.DIRTY_FILENAME)
+    assert len(BOMRadarArchive(str(tmp_path))) == 3
+
+
+def test_archive_file_mode(tmp_path):
+    umask = os.umask(0)
+    os.umask(umask)
+
+    with BOMRadarArchive(str(tmp_path)) as archive:
+        path = archive.save(png_frame(FILENAMES[0]))
+
+    for saved in [path, tmp_path / BOMRadarArchive.INDEX_FILENAME]:
+        assert stat.S_IMODE(os.stat(saved).st_mode) == 0o666 & ~umask
@@ -0,0 +1,118 @@
+import datetime
+import sqlite3
+
+import numpy as np
+
+from .constants import ANON_GEN_RADAR_DIRECTORY_TEST_FILES
+from aus_weather_data.radar.common.catalog import (
+    BOMRadarCatalog,
+    frame_key_sql,
+    pack_frame_key,
+    parse_frame_key,
+    unpack_frame_key,
+)
+from aus_weather_data.radar.common.frame import BOMRadarFrameMetadata
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.common.types import RADAR_TYPE
+from aus_weather_data.exceptions import ParseFrameError
+
+
+def _reference_frames():
+    frames = []
+    for path in ANON_GEN_RADAR_DIRECTORY_TEST_FILES:
+        try:
+            frames.append(BOMRadarFrameMetadata(path.rpartition("/")[2]))
+        except ParseFrameError:
+            pass
+    return frames
+
+
+def test_catalog_from_filenames():
+    catalog = BOMRadarCatalog.from_filenames(ANON_GEN_RADAR_DIRECTORY_TEST_FILES)
+    reference = _reference_frames()
+
+    assert len(catalog) == len(reference)
+    assert [frame.filename for frame in catalog] == [x.filename for x in reference]
+
+
+def test_frame_keys():
+    catalog = BOMRadarCatalog.from_filenames(ANON_GEN_RADAR_DIRECTORY_TEST_FILES)
+    keys = catalog.keys
+
+    # Scalar and array packing agree, and unpack is the inverse
+    frame = next(iter(catalog))
+    key = pack_frame_key(
+        frame.radar_index, ord(frame.radar_type_str), frame.epoch_minute
+    )
+    assert key == keys[0] == parse_frame_key(frame.filename)
+    assert unpack_frame_key(key) == (
+        frame.radar_index,
+        ord(frame.radar_type_str),
+        frame.epoch_minute,
+    )
+
+    radar_index, type_code, epoch_minute = unpack_frame_key(keys)
+    np.testing.assert_array_equal(radar_index, catalog.radar_index)
+    np.testing.assert_array_equal(type_code, catalog.type_code)
+    np.testing.assert_array_equal(epoch_minute, catalog.epoch_minute)
+
+    # The SQL expression packs the same keys
+    conn = sqlite3.connect(":memory:")
+    sql = frame_key_sql(":radar", "unicode(:product)", ":epoch")
+    row = {
+        "radar": frame.radar_index,
+        "product": frame.radar_type_str,
+        "epoch": frame.epoch_minute,
+    }
+    assert conn.execute(f"SELECT {sql}", row).fetchone()[0] == key
+
+
+def test_catalog_filter():
+    catalog = BOMRadarCatalog.from_filenames(ANON_GEN_RADAR_DIRECTORY_TEST_FILES)
+    reference = _reference_frames()
+
+    radar_locations = [BOMRadarLocation.IDR02, BOMRadarLocation.IDR66]
+    radar_types = [RADAR_TYPE.REF_128_KM, RADAR_TYPE.RAI_128_KM_5M]
+    start_time = datetime.datetime(2024, 10, 15, 20, 30, tzinfo=datetime.timezone.utc)
+    end_time = datetime.datetime(2024, 10, 15, 21, 0, tzinfo=datetime.timezone.utc)
+
+    expected = [
+        x.filename
+        for x in reference
+        if x.radar_id in radar_locations
+        and x.radar_type in radar_types
+        and start_time <= x.dt_utc <= end_time
+    ]
+    assert expected
+
+    matched = catalog.filter(
+        radar_locations=radar_locations,
+        radar_types=radar_types,
+        start_time_utc=start_time,
+        end_time_utc=end_time,
+    )
+    assert [frame.filename for frame in matched] == expected
+
+    matched = catalog.filter(
+        radar_locations=radar_locations,
+        radar_types=radar_types,
+        start_time_utc=start_time,
+        end_time_utc=end_time,
+        ignore_list=expected[1:],
+    )
+    assert [frame.filename for frame in matched] == expected[:1]
+
+
+def test_get_matching_files_models():
+    from aus_weather_data.radar.remote.utils import get_matching_files
+
+    matching_files = get_matching_files(
+        ANON_GEN_RADAR_DIRECTORY_TEST_FILES,
+        [BOMRadarLocation.IDR71],
+        [RADAR_TYPE.REF_256_KM],
+    )
+
+    assert matching_files
+    for metadata in matching_files:
+        assert metadata.radar_id == BOMRadarLocation.IDR71
+        assert metadata.radar_type == RADAR_TYPE.REF_256_KM
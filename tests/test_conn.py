@@ -1,4 +1,16 @@
+import os
+import stat
+import errno
+import ftplib
+import hashlib
+
+import pytest
+
 from .constants import TEST_WITH_CONNECTION
+from aus_weather_data.radar.common.frame import BOMRadarFrameMetadata
+from aus_weather_data.radar.remote import conn as conn_module
+from aus_weather_data.radar.remote.conn import BOMFTPConn
+from aus_weather_data.radar.remote.retry import RetryPolicy
 
 
 def test_single_connection():
@@ -15,3 +27,133 @@ def test_single_connection():
 
     assert directory_contents is not None
     assert type(directory_contents) is list
+
+
+class FakeFTP(object):
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+        self.commands = []
+
+    def retrbinary(self, cmd, callback):
+        self.commands.append(cmd)
+        for chunk in self.chunks:
+            callback(chunk)
+        if self.error:
+            raise ftplib.error_temp(self.error)
+
+
+def test_download_file(tmp_path):
+    conn = BOMFTPConn()
+    conn._ftp_conn = FakeFTP([b"\x89PNG", b"data"])
+    frame = BOMRadarFrameMetadata("IDR023.T.202201010000.png")
+
+    digest = hashlib.sha256()
+    saved = conn.download_file(frame, str(tmp_path), digest)
+
+    assert saved == str(tmp_path / frame.filename)
+    assert (tmp_path / frame.filename).read_bytes() == b"\x89PNGdata"
+    assert digest.hexdigest() == hashlib.sha256(b"\x89PNGdata").hexdigest()
+    assert conn._ftp_conn.commands[0].endswith("/" + frame.filename)
+    assert [x.name for x in tmp_path.iterdir()] == [frame.filename]
+
+    # Not left readable only by the owner, as temporary files are created
+    umask = os.umask(0)
+    os.umask(umask)
+    mode = (tmp_path / frame.filename).stat().st_mode
+    assert stat.S_IMODE(mode) == 0o666 & ~umask
+
+
+def test_download_file_failure_leaves_no_file(tmp_path):
+    conn = BOMFTPConn()
+    conn._ftp_conn = FakeFTP([b"\x89PNG"], error="421 Timeout")
+    frame = BOMRadarFrameMetadata("IDR023.T.202201010000.png")
+
+    with pytest.raises(IOError) as e:
+        conn.download_file(frame, str(tmp_path))
+
+    assert isinstance(e.value.__cause__, ftplib.error_temp)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_download_file_write_error(tmp_path, monkeypatch):
+    class FullFile(object):
+        def __init__(self, f):
+            self.f = f
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            self.f.close()
+
+        def write(self, data):
+            raise OSError(errno.ENOSPC, "No space left on device")
+
+    fdopen = conn_module.os.fdopen
+    monkeypatch.setattr(conn_module.os, "fdopen", lambda *args: FullFile(fdopen(*args)))
+
+    class CountingFTP(FakeFTP):
+        def retrbinary(self, cmd, callback):
+            super().retrbinary(cmd, callback)
+            self.completed = True
+
+    conn = BOMFTPConn()
+    conn._ftp_conn = CountingFTP([b"\x89PNG", b"data"])
+    frame = BOMRadarFrameMetadata("IDR023.T.202201010000.png")
+
+    with pytest.raises(OSError) as e:
+        conn.download_file(frame, str(tmp_path))
+
+    # The local error isn't wrapped as an FTP failure or retried, and the
+    # transfer was read to the end so the connection can be reused
+    assert e.value.errno == errno.ENOSPC
+    assert e.value.__cause__ is None
+    assert not RetryPolicy().should_retry(e.value)
+    assert conn._ftp_conn.completed
+    assert list(tmp_path.iterdir()) == []
+
+
+class FakeFileFTP(object):
+    def __init__(self, files):
+        self.files = files
+
+    def retrbinary(self, cmd, callback):
+        data = self.files[cmd.rpartition("/")[2]]
+        for start in range(0, len(data), 3):
+            callback(data[start : start + 3])
+
+
+def test_get_file_reuse_buffer():
+    first = BOMRadarFrameMetadata("IDR023.T.202201010000.png")
+    second = BOMRadarFrameMetadata("IDR023.T.202201010005.png")
+
+    conn = BOMFTPConn()
+    conn._ftp_conn = FakeFileFTP(
+        {first.filename: b"first frame data", second.filename: b"second"}
+    )
+
+    frame = conn.get_file(first)
+    assert type(frame.png_data) is bytes
+    assert frame.png_data == b"first frame data"
+
+    # Dropped frames leave the buffer free for the next download
+    buffer = conn._buffer
+    frame = conn.get_file(first, reuse_buffer=True)
+    assert isinstance(frame.png_data, memoryview)
+    assert frame.png_data == b"first frame data"
+    del frame
+    frame = conn.get_file(second, reuse_buffer=True)
+    assert conn._buffer is buffer
+    assert frame.png_data == b"second"
+
+    # Frames still holding the buffer keep their data
+    kept = frame
+    frame = conn.get_file(first, reuse_buffer=True)
+    assert conn._buffer is not buffer
+    assert kept.png_data == b"second"
+    assert frame.png_data == b"first frame data"
+
+    kept.detach()
+    assert type(kept.png_data) is bytes
+    assert kept.png_data == b"second"
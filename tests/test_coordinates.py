@@ -0,0 +1,137 @@
+import os
+import stat
+
+import numpy as np
+import pytest
+
+from aus_weather_data.radar.common.grid import GRID_CACHE_ENV, get_cache_dir
+from aus_weather_data.radar.common.idr_data import IDR_DATA
+from aus_weather_data.radar.common.location import (
+    BOMRadarLocation,
+    BOMRadarLocationModel,
+)
+from aus_weather_data.radar.common.types import RADAR_TYPE
+from aus_weather_data.radar.common.utils import (
+    get_distance_bearing,
+    get_translation_coordinate,
+    get_translation_coordinates,
+)
+
+
+def test_translation_coordinates_match_scalar():
+    latitude, longitude = BOMRadarLocation.IDR02.location
+
+    # The scalar version rounds to 5 decimal places, and uses the
+    # destination latitude in its longitude term (a few metres off at 512km)
+    for distance, bearing in [(128, 0), (256, 90), (64, 180), (512, 270)]:
+        expected = get_translation_coordinate(latitude, longitude, distance, bearing)
+        result = get_translation_coordinates(latitude, longitude, distance, bearing)
+        np.testing.assert_allclose(result, expected, atol=1e-4)
+
+
+def test_translation_coordinates_broadcast_and_inverse():
+    latitude, longitude = BOMRadarLocation.IDR02.location
+    distances = np.linspace(0, 500, 11)[:, None]
+    bearings = np.arange(0, 360, 15)[None, :]
+
+    lats, lons = get_translation_coordinates(latitude, longitude, distances, bearings)
+    assert lats.shape == lons.shape == (11, 24)
+    np.testing.assert_allclose(lats[0], latitude)
+
+    result_distances, result_bearings = get_distance_bearing(
+        latitude, longitude, lats, lons
+    )
+    np.testing.assert_allclose(result_distances, np.broadcast_to(distances, (11, 24)))
+    # Bearing is undefined at zero distance
+    error = (result_bearings[1:] - bearings + 180) % 360 - 180
+    np.testing.assert_allclose(error, 0, atol=1e-9)
+    assert ((result_bearings >= 0) & (result_bearings < 360)).all()
+
+
+def test_translation_coordinates_wrap_longitude():
+    lats, lons = get_translation_coordinates(
+        [0.0, 0.0], [179.5, -179.5], 200, [90, 270]
+    )
+    assert (lons < 0).tolist() == [True, False]
+    np.testing.assert_allclose(np.abs(lons), 180 - (200 / 6378.1 * 180 / np.pi - 0.5))
+
+
+def test_pixel_grid(tmp_path):
+    location = BOMRadarLocationModel(**IDR_DATA["IDR02"])
+    cache_dir = str(tmp_path)
+
+    lats, lons = location.pixel_grid(RADAR_TYPE.REF_128_KM, cache_dir=cache_dir)
+    assert lats.shape == lons.shape == (512, 512)
+    assert not lats.flags.writeable
+    assert location.pixel_grid(RADAR_TYPE.REF_128_KM, cache_dir=cache_dir)[0] is lats
+    assert os.listdir(cache_dir) == ["grid-v1-IDR023-512.npy"]
+    umask = os.umask(0)
+    os.umask(umask)
+    mode = os.stat(os.path.join(cache_dir, "grid-v1-IDR023-512.npy")).st_mode
+    assert stat.S_IMODE(mode) == 0o666 & ~umask
+
+    # The centre pixels are half a pixel (250 m) each way from the radar
+    distances, bearings = get_distance_bearing(*location.location, lats, lons)
+    np.testing.assert_allclose(distances[255:257, 255:257], np.hypot(0.25, 0.25))
+    np.testing.assert_allclose(distances[0, 0], np.hypot(127.75, 127.75))
+    np.testing.assert_allclose(bearings[0, 0], 315)
+
+    # North is up and east is right
+    assert (np.diff(lats, axis=0) < 0).all()
+    assert (np.diff(lons, axis=1) > 0).all()
+
+    # Another process loads the grid from the disk cache
+    other = BOMRadarLocationModel(**IDR_DATA["IDR02"])
+    cached = other.pixel_grid(RADAR_TYPE.REF_128_KM, cache_dir=cache_dir)
+    assert isinstance(cached[0].base, np.memmap)
+    np.testing.assert_array_equal(cached[0], lats)
+    np.testing.assert_array_equal(cached[1], lons)
+
+    with pytest.raises(TypeError):
+        BOMRadarLocationModel(**IDR_DATA["IDR55"]).pixel_grid(
+            RADAR_TYPE.VEL_128_KM, cache_dir=cache_dir
+        )
+
+
+def test_pixel_grid_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(GRID_CACHE_ENV, str(tmp_path))
+    assert get_cache_dir() == str(tmp_path)
+
+    location = BOMRadarLocationModel(**IDR_DATA["IDR02"])
+    lats, _ = location.pixel_grid(RADAR_TYPE.REF_512_KM, size=64)
+    assert lats.shape == (64, 64)
+    assert os.listdir(tmp_path) == ["grid-v1-IDR021-64.npy"]
+
+
+def test_coordinates_to_pixels(tmp_path):
+    location = BOMRadarLocationModel(**IDR_DATA["IDR02"])
+    radar_type = RADAR_TYPE.REF_128_KM
+    lats, lons = location.pixel_grid(radar_type, cache_dir=str(tmp_path))
+
+    # Every pixel centre maps back to its own pixel
+    rows, cols = location.coordinates_to_pixels(radar_type, lats, lons)
+    expected_rows, expected_cols = np.indices((512, 512))
+    np.testing.assert_array_equal(rows, expected_rows)
+    np.testing.assert_array_equal(cols, expected_cols)
+
+    rows, cols = np.array([0, 17, 511]), np.array([511, 300, 0])
+    centres = location.pixels_to_coordinates(radar_type, rows, cols)
+    np.testing.assert_allclose(centres[0], lats[rows, cols])
+    np.testing.assert_allclose(centres[1], lons[rows, cols])
+
+    # The radar is on the corner of the four centre pixels, outside locations are -1
+    latitude, longitude = location.location
+    rows, cols = location.coordinates_to_pixels(
+        radar_type,
+        [latitude - 1e-6, latitude + 1e-6, -30.0],
+        [longitude - 1e-6, longitude + 1e-6, longitude],
+    )
+    assert rows.tolist() == [256, 255, -1]
+    assert cols.tolist() == [255, 256, -1]
+
+    # Scalars and other sizes work too
+    rows, cols = location.coordinates_to_pixels(
+        radar_type, latitude + 0.1, longitude, size=64
+    )
+    assert rows.shape == ()
+    assert (int(rows), int(cols)) == (29, 32)
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from aus_weather_data.radar.common.coverage import BOMRadarCoverage
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.common.types import RADAR_TYPE, RADAR_TYPE_RANGE
+from aus_weather_data.radar.common.utils import get_translation_coordinates
+
+SYDNEY = (-33.87, 151.21)
+REFLECTIVITY = [
+    RADAR_TYPE.REF_64_KM,
+    RADAR_TYPE.REF_128_KM,
+    RADAR_TYPE.REF_256_KM,
+    RADAR_TYPE.REF_512_KM,
+]
+
+
+def test_covers_true_range():
+    coverage = BOMRadarCoverage()
+    assert len(coverage) == sum(
+        len(location.radar_types)
+        for location in (
+            getattr(BOMRadarLocation, idr) for idr in BOMRadarLocation.IDR_LIST
+        )
+    )
+
+    # Locations on the edge of each range, including where it bulges
+    # past the points due east and west of the radar
+    bearings = np.linspace(0, 360, 721)
+    for i, (location, radar_type) in enumerate(coverage.keys):
+        distance = RADAR_TYPE_RANGE[radar_type]
+        inside = get_translation_coordinates(
+            *location.location, distance - 0.01, bearings
+        )
+        outside = get_translation_coordinates(
+            *location.location, distance + 0.01, bearings
+        )
+        assert coverage.covers(*inside)[:, i].all()
+        assert not coverage.covers(*outside)[:, i].any()
+
+    # The corners of the image are outside the range
+    location = BOMRadarLocation.IDR71
+    corner = location.radar_range(RADAR_TYPE.REF_128_KM)[0]
+    key = coverage.keys.index((location, RADAR_TYPE.REF_128_KM))
+    assert not coverage.covers(*corner)[0, key]
+
+    with pytest.raises(ValueError):
+        coverage.covers([1, 2], [3])
+
+
+def test_covering_and_best():
+    coverage = BOMRadarCoverage(radar_types=REFLECTIVITY)
+    assert {radar_type for _, radar_type in coverage.keys} == set(REFLECTIVITY)
+    np.testing.assert_array_equal(coverage.resolutions, 2 * coverage.ranges / 512)
+
+    covering = coverage.covering(*SYDNEY)
+    assert covering[:2] == [
+        (BOMRadarLocation.IDR71, RADAR_TYPE.REF_64_KM),
+        (BOMRadarLocation.IDR03, RADAR_TYPE.REF_64_KM),
+    ]
+    ranges = [RADAR_TYPE_RANGE[radar_type] for _, radar_type in covering]
+    assert ranges == sorted(ranges)
+
+    # Sydney, Brisbane, the middle of the Tasman Sea
+    best = coverage.best([SYDNEY[0], -27.47, -36.0], [SYDNEY[1], 153.03, 160.0])
+    assert best.dtype == np.int64
+    assert best[2] == -1
+    assert [coverage.keys[i] for i in best[:2]] == [
+        (BOMRadarLocation.IDR71, RADAR_TYPE.REF_64_KM),
+        (BOMRadarLocation.IDR66, RADAR_TYPE.REF_64_KM),
+    ]
+
+    covered = coverage.covers([SYDNEY[0], -36.0], [SYDNEY[1], 160.0])
+    assert covered.shape == (2, len(coverage))
+    assert covered[0].sum() == len(covering)
+    assert not covered[1].any()
+
+
+def test_covering_polygon():
+    coverage = BOMRadarCoverage(radar_types=REFLECTIVITY)
+
+    # A small box around Sydney is inside the 64 km ranges of both radars
+    small = coverage.covering_polygon(
+        [-33.8, -33.8, -33.9, -33.9], [151.1, 151.2, 151.2, 151.1]
+    )
+    assert small[0] == (BOMRadarLocation.IDR71, RADAR_TYPE.REF_64_KM)
+
+    # From Sydney to Canberra needs at least a 256 km range
+    large = coverage.covering_polygon([SYDNEY[0], -35.28], [SYDNEY[1], 149.13])
+    assert large[0][1] == RADAR_TYPE.REF_256_KM
+    assert all(RADAR_TYPE_RANGE[radar_type] >= 256 for _, radar_type in large)
+    assert set(large) < set(coverage.covering(*SYDNEY))
+
+    with pytest.raises(ValueError):
+        coverage.covering_polygon([], [])
+
+
+def test_empty_coverage():
+    coverage = BOMRadarCoverage(locations=[])
+    assert len(coverage) == 0
+    assert coverage.best([SYDNEY[0]], [SYDNEY[1]]).tolist() == [-1]
+    assert coverage.covering(*SYDNEY) == []
@@ -0,0 +1,144 @@
+import datetime
+import os
+import stat
+
+import numpy as np
+import pytest
+
+from aus_weather_data.radar.common.decode import BOMRadarBatchDecoder
+from aus_weather_data.radar.common.frame import BOMRadarFramePNG
+from aus_weather_data.radar.common.legend import REFLECTIVITY_RAIN_RATE
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.common.png import decode_png
+from aus_weather_data.radar.common.types import RADAR_TYPE
+from aus_weather_data.radar.local.archive import BOMRadarArchive
+from aus_weather_data.radar.local.cube import BOMRadarCube
+
+ASSET = os.path.join(*[".", "tests", "assets", "IDR024.T.202001312324.png"])
+
+FILENAMES = [
+    "IDR023.T.202410150010.png",
+    "IDR023.T.202410150000.png",
+    "IDR023.T.202410150005.png",
+    "IDR023.T.202410150015.png",
+]
+
+
+def load_frames():
+    with open(ASSET, "rb") as f:
+        data = f.read()
+
+    frames = []
+    for filename in FILENAMES:
+        frame = BOMRadarFramePNG(filename)
+        frame.load_png_data(data)
+        frames.append(frame)
+    return frames, decode_png(data)
+
+
+def test_cube_build_and_reopen(tmp_path):
+    path = str(tmp_path / "cube")
+    frames, (indices, palette, alpha) = load_frames()
+    # A corrupt frame is left out
+    frames[3].load_png_data(frames[3].png_data[:500])
+
+    cube = BOMRadarCube.build(path, frames)
+    assert sorted(os.listdir(tmp_path)) == ["cube.1.npy", "cube.npz"]
+    assert cube.shape == (3, 512, 512)
+    assert cube.radar_id is BOMRadarLocation.IDR02
+    assert cube.radar_type is RADAR_TYPE.REF_128_KM
+    assert [x.strftime("%H%M") for x in cube.datetimes] == ["0000", "0005", "0010"]
+
+    cube = BOMRadarCube(path)
+    assert isinstance(cube.indices, np.memmap)
+    assert not cube.indices.flags.writeable
+    assert (cube.indices == indices).all()
+
+    frame_indices, frame_palette, frame_alpha = cube[1]
+    np.testing.assert_array_equal(frame_palette[: len(palette)], palette)
+    np.testing.assert_array_equal(frame_alpha[: len(alpha)], alpha)
+    assert not frame_alpha[len(alpha) :].any()
+
+    rain = cube.values(0, REFLECTIVITY_RAIN_RATE)
+    expected = REFLECTIVITY_RAIN_RATE.convert(indices, palette, alpha)
+    np.testing.assert_array_equal(rain, expected)
+    assert np.isnan(cube.values(0)[indices == 0]).all()
+
+    window = cube.between(
+        datetime.datetime(2024, 10, 15, 0, 1, tzinfo=datetime.timezone.utc),
+        datetime.datetime(2024, 10, 15, 0, 10, tzinfo=datetime.timezone.utc),
+    )
+    assert window == slice(1, 3)
+
+    # A rebuild is committed by the .npz and removes the previous indices,
+    # which an open cube still has mapped
+    rebuilt = BOMRadarCube.build(path, frames[:2])
+    assert sorted(os.listdir(tmp_path)) == ["cube.2.npy", "cube.npz"]
+    assert len(rebuilt) == 2
+    assert len(BOMRadarCube(path)) == 2
+    assert (cube.indices == indices).all()
+
+
+def test_cube_build_failure_keeps_cube(tmp_path, monkeypatch):
+    path = str(tmp_path / "cube")
+    frames, _ = load_frames()
+    BOMRadarCube.build(path, frames)
+
+    # Fails moving the indices compacted over the corrupt frame into place
+    frames[3].load_png_data(frames[3].png_data[:500])
+    replace = os.replace
+
+    def fail_compact(src, dst):
+        if src.endswith(".compact"):
+            raise OSError("disk full")
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", fail_compact)
+    with pytest.raises(OSError):
+        BOMRadarCube.build(path, frames)
+
+    assert sorted(os.listdir(tmp_path)) == ["cube.1.npy", "cube.npz"]
+    assert len(BOMRadarCube(path)) == 4
+
+
+def test_cube_build_errors(tmp_path):
+    frames, _ = load_frames()
+    other = BOMRadarFramePNG("IDR714.T.202410150000.png")
+    other.load_png_data(frames[0].png_data)
+
+    with pytest.raises(ValueError):
+        BOMRadarCube.build(str(tmp_path / "cube"), frames + [other])
+
+    with pytest.raises(ValueError):
+        BOMRadarCube.build(str(tmp_path / "cube"), [])
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_cube_from_archive(tmp_path):
+    frames, (indices, _, _) = load_frames()
+    archive = BOMRadarArchive(str(tmp_path / "archive"))
+    for frame in frames:
+        archive.save(frame)
+
+    with BOMRadarBatchDecoder(max_workers=2) as decoder:
+        cube = BOMRadarCube.from_archive(
+            str(tmp_path / "cube"),
+            archive,
+            BOMRadarLocation.IDR02,
+            RADAR_TYPE.REF_128_KM,
+            start_time_utc=datetime.datetime(
+                2024, 10, 15, 0, 5, tzinfo=datetime.timezone.utc
+            ),
+            decoder=decoder,
+        )
+
+    assert len(cube) == 3
+    assert cube.times.tolist() == sorted(x.epoch_minute for x in frames)[1:]
+    assert (cube.indices == indices).all()
+
+    # Written through temporary files, but with the mode of a new file
+    umask = os.umask(0)
+    os.umask(umask)
+    for name in ["cube.1.npy", "cube.npz"]:
+        assert stat.S_IMODE(os.stat(tmp_path / name).st_mode) == 0o666 & ~umask
@@ -0,0 +1,113 @@
+import datetime
+import hashlib
+
+import numpy as np
+
+from .constants import ANON_GEN_RADAR_DIRECTORY_TEST_FILES
+from aus_weather_data.radar.common.catalog import BOMRadarCatalog
+from aus_weather_data.radar.common.frame import (
+    BOMRadarFrameMetadata,
+    BOMRadarFramePNG,
+)
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.common.types import RADAR_TYPE
+from aus_weather_data.radar.local.database import (
+    BOMRadarFrameDatabase,
+    FRAME_STATUS,
+)
+
+FILENAMES = [
+    "IDR023.T.202410150000.png",
+    "IDR023.T.202410150005.png",
+    "IDR023.T.202410150010.png",
+]
+
+
+def test_database_query_matches_catalog():
+    catalog = BOMRadarCatalog.from_filenames(ANON_GEN_RADAR_DIRECTORY_TEST_FILES)
+    database = BOMRadarFrameDatabase()
+    database.update_listing(catalog)
+
+    assert len(database) == len(np.unique(catalog.keys))
+
+    filters = dict(
+        radar_locations=[BOMRadarLocation.IDR02, BOMRadarLocation.IDR71],
+        radar_types=[RADAR_TYPE.REF_128_KM, RADAR_TYPE.REF_256_KM],
+        start_time_utc=datetime.datetime(
+            2024, 10, 15, 20, 0, tzinfo=datetime.timezone.utc
+        ),
+        end_time_utc=datetime.datetime(
+            2024, 10, 15, 21, 0, tzinfo=datetime.timezone.utc
+        ),
+    )
+
+    expected = catalog.filter(**filters)
+    result = database.query(**filters)
+    assert len(result) > 0
+    assert sorted(result.keys) == sorted(set(expected.keys.tolist()))
+
+
+def test_database_status():
+    database = BOMRadarFrameDatabase()
+    database.update_listing(BOMRadarCatalog.from_filenames(FILENAMES))
+
+    frames = [BOMRadarFrameMetadata(x) for x in FILENAMES]
+    assert database.status(frames[0]) == FRAME_STATUS.LISTED
+    assert BOMRadarFrameMetadata("IDR023.T.202410150015.png") not in database
+
+    png_frame = BOMRadarFramePNG(FILENAMES[0])
+    png_frame.load_png_data(b"png data")
+    database.mark_stored(png_frame)
+    database.mark_failed(frames[1])
+
+    assert database.status(frames[0]) == FRAME_STATUS.STORED
+    assert database.info(frames[0]) == (8, hashlib.sha256(b"png data").hexdigest())
+    assert database.status(frames[1]) == FRAME_STATUS.FAILED
+
+    missing = database.query(exclude_status=[FRAME_STATUS.STORED])
+    assert [x.filename for x in missing] == FILENAMES[1:]
+
+    stored = database.query(status=[FRAME_STATUS.STORED])
+    assert [x.filename for x in stored] == FILENAMES[:1]
+
+
+def test_database_listing_updates(tmp_path):
+    path = str(tmp_path / "frames.db")
+
+    with BOMRadarFrameDatabase(path) as database:
+        database.update_listing(BOMRadarCatalog.from_filenames(FILENAMES))
+        database.mark_stored(BOMRadarFrameMetadata(FILENAMES[0]), size=10)
+        database.mark_failed(BOMRadarFrameMetadata(FILENAMES[1]))
+
+        # Stored frames are kept when they leave the listing, failed ones aren't
+        database.update_listing(
+            BOMRadarCatalog.from_filenames([]),
+            BOMRadarCatalog.from_filenames(FILENAMES[:2]),
+        )
+        assert [x.filename for x in database.query()] == [FILENAMES[0], FILENAMES[2]]
+
+        database.mark_failed(BOMRadarFrameMetadata(FILENAMES[2]))
+        database.mark_failed(BOMRadarFrameMetadata("IDR023.T.202410150020.png"))
+
+    with BOMRadarFrameDatabase(path) as database:
+        database.update_listing(
+            BOMRadarCatalog.from_filenames(
+                ["IDR023.T.202410150015.png", "IDR023.T.202410150020.png"]
+            ),
+            replace=True,
+        )
+        assert [x.filename for x in database.query()] == [
+            FILENAMES[0],
+            "IDR023.T.202410150015.png",
+            "IDR023.T.202410150020.png",
+        ]
+        assert (
+            database.status(BOMRadarFrameMetadata("IDR023.T.202410150020.png"))
+            == FRAME_STATUS.FAILED
+        )
+        assert database.info(BOMRadarFrameMetadata(FILENAMES[0])) == (10, None)
+
+        database.mark_stored(
+            BOMRadarFrameMetadata(FILENAMES[0]), size=10, checksum="ab"
+        )
+        assert database.info(BOMRadarFrameMetadata(FILENAMES[0])) == (10, "ab")
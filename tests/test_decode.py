@@ -0,0 +1,108 @@
+import os
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+from aus_weather_data.exceptions import DecodeFrameError
+from aus_weather_data.radar.common.decode import BOMRadarBatchDecoder
+from aus_weather_data.radar.common.frame import BOMRadarFramePNG
+from aus_weather_data.radar.common.png import decode_png
+
+ASSET_PATH = os.path.join(*[".", "tests", "assets"])
+ASSET = "IDR024.T.202001312324.png"
+
+
+def load_frames(count):
+    with open(os.path.join(ASSET_PATH, ASSET), "rb") as f:
+        data = f.read()
+
+    frames = []
+    for minute in range(count):
+        frame = BOMRadarFramePNG(f"IDR024.T.2020013123{minute:02}.png")
+        frame.load_png_data(data)
+        frames.append(frame)
+    return frames, decode_png(data)
+
+
+@pytest.fixture(scope="module")
+def decoder():
+    with BOMRadarBatchDecoder(max_workers=2) as decoder:
+        yield decoder
+
+
+def test_batch_decode(decoder):
+    frames, (indices, palette, alpha) = load_frames(6)
+
+    with decoder.decode(frames, chunk_size=4) as batch:
+        assert batch.ok
+        assert len(batch) == 6
+
+        decoded = batch[3]
+        np.testing.assert_array_equal(decoded[0], indices)
+        np.testing.assert_array_equal(decoded[1], palette)
+        np.testing.assert_array_equal(decoded[2], alpha)
+
+        stack = batch.stack()
+        assert stack.shape == (6, 512, 512)
+        assert (stack == indices).all()
+
+        name = batch._block.shm.name
+        del decoded, stack
+
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+
+    with pytest.raises(ValueError):
+        batch[0]
+
+
+def test_batch_close_with_arrays(decoder):
+    frames, (indices, _, _) = load_frames(2)
+
+    with decoder.decode(frames) as batch:
+        kept = batch[1][0]
+        stack = batch.stack()
+        shm = batch._block.shm
+        name = shm.name
+
+    # The block is unlinked but stays mapped for the arrays
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+    np.testing.assert_array_equal(kept, indices)
+    assert (stack == indices).all()
+
+    with pytest.raises(ValueError):
+        batch[0]
+
+    del stack
+    np.testing.assert_array_equal(kept, indices)
+    assert shm.buf is not None
+
+    # Unmapped with the last array
+    view = kept[1:]
+    del kept
+    assert shm.buf is not None
+    del view
+    assert shm.buf is None
+
+
+def test_batch_decode_failures(decoder):
+    frames, (indices, _, _) = load_frames(3)
+    frames[1].load_png_data(b"not a png")
+    frames[2].load_png_data(frames[2].png_data[:2000])
+
+    with decoder.decode(frames) as batch:
+        assert not batch.ok
+        assert set(batch.failures) == {1, 2}
+        np.testing.assert_array_equal(batch[0][0], indices)
+
+        with pytest.raises(DecodeFrameError):
+            batch[1]
+
+        with pytest.raises(ValueError):
+            batch.stack()
+
+    with decoder.decode([]) as batch:
+        assert batch.ok
+        assert batch.stack().shape == (0, 0, 0)
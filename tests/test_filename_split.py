@@ -40,3 +40,36 @@ def test_split_filename():
             tzinfo=datetime.timezone.utc,
         ),
     }
+
+
+def test_parse_filename():
+    from aus_weather_data.radar.common.utils import (
+        parse_filename,
+        epoch_minute_to_datetime,
+    )
+
+    for filename in ["IDR66A.T.202312132105.png", "IDR00004.T.202312131628.png"]:
+        idr, idr_type, epoch_minute = parse_filename(filename)
+        metadata = split_filename(filename)
+
+        assert idr == metadata["idr"]
+        assert idr_type == metadata["idrType"]
+        assert epoch_minute_to_datetime(epoch_minute) == metadata["dt"]
+        assert epoch_minute * 60 == metadata["dt"].timestamp()
+
+
+def test_parse_filename_invalid():
+    import pytest
+
+    from aus_weather_data.radar.common.utils import parse_filename
+
+    for filename in [
+        "IDR66A.T.202312132105.gif",
+        "IDR66A.X.202312132105.png",
+        "IDR66A.T.2023121321a5.png",
+        "IDR66A.T.202313132105.png",
+        "IDR66A.T.202312132465.png",
+        "T.202312132105.png",
+    ]:
+        with pytest.raises(ValueError):
+            parse_filename(filename)
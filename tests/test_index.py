@@ -0,0 +1,74 @@
+import datetime
+
+from .constants import ANON_GEN_RADAR_DIRECTORY_TEST_FILES
+from aus_weather_data.radar.common.catalog import BOMRadarCatalog
+from aus_weather_data.radar.common.index import BOMRadarFrameIndex
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.common.types import RADAR_TYPE
+
+
+def _utc(hour: int, minute: int) -> datetime.datetime:
+    return datetime.datetime(2024, 10, 15, hour, minute, tzinfo=datetime.timezone.utc)
+
+
+def test_index_matches_catalog():
+    catalog = BOMRadarCatalog.from_filenames(ANON_GEN_RADAR_DIRECTORY_TEST_FILES)
+    index = BOMRadarFrameIndex.from_catalog(catalog)
+
+    assert len(index) == len(catalog)
+
+    for radar_location, radar_type in index.keys():
+        expected = sorted(
+            frame.filename for frame in catalog.filter([radar_location], [radar_type])
+        )
+        frames = index.between(radar_location, radar_type)
+        assert [frame.filename for frame in frames] == expected
+
+    assert len(BOMRadarFrameIndex.from_frames(catalog)) == len(catalog)
+
+
+def test_index_queries():
+    index = BOMRadarFrameIndex.from_catalog(
+        BOMRadarCatalog.from_filenames(
+            [
+                "IDR023.T.202410152000.png",
+                "IDR023.T.202410152006.png",
+                "IDR023.T.202410152012.png",
+                "IDR023.T.202410152018.png",
+                "IDR024.T.202410152030.png",
+            ]
+        )
+    )
+    location = BOMRadarLocation.IDR02
+    radar_type = RADAR_TYPE.REF_128_KM
+
+    latest = index.latest(location, radar_type, 2)
+    assert [x.dt_utc for x in latest] == [_utc(20, 12), _utc(20, 18)]
+    assert index.latest(location, radar_type, 0) == []
+    assert index.latest(BOMRadarLocation.IDR03, radar_type) == []
+
+    between = index.between(location, radar_type, _utc(20, 5), _utc(20, 12))
+    assert [x.dt_utc for x in between] == [_utc(20, 6), _utc(20, 12)]
+
+    assert index.nearest(location, radar_type, _utc(20, 8)).dt_utc == _utc(20, 6)
+    assert index.nearest(location, radar_type, _utc(20, 9)).dt_utc == _utc(20, 6)
+    assert index.nearest(location, radar_type, _utc(20, 10)).dt_utc == _utc(20, 12)
+    assert index.nearest(location, radar_type, _utc(23, 0)).dt_utc == _utc(20, 18)
+    assert index.nearest(location, radar_type, _utc(1, 0)).dt_utc == _utc(20, 0)
+    assert index.nearest(location, RADAR_TYPE.REF_512_KM, _utc(1, 0)) is None
+
+    frame = index.latest(location, radar_type)[0]
+    assert frame in index
+    index.remove(frame)
+    assert frame not in index
+    index.add(frame)
+    index.add(frame)
+    assert len(index.between(location, radar_type)) == 4
+
+
+def test_index_to_catalog():
+    catalog = BOMRadarCatalog.from_filenames(ANON_GEN_RADAR_DIRECTORY_TEST_FILES)
+    index = BOMRadarFrameIndex.from_catalog(catalog)
+
+    assert sorted(index.to_catalog().keys) == sorted(set(catalog.keys.tolist()))
+    assert len(BOMRadarFrameIndex().to_catalog()) == 0
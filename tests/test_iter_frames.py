@@ -0,0 +1,302 @@
+import ftplib
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from aus_weather_data.radar.common.decode import BOMRadarBatchDecoder
+from aus_weather_data.radar.common.frame import BOMRadarFramePNG
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.common.png import decode_png
+from aus_weather_data.radar.common.types import RADAR_TYPE
+from aus_weather_data.radar.local.database import (
+    BOMRadarFrameDatabase,
+    FRAME_STATUS,
+)
+from aus_weather_data.radar.remote.download import BOMRadarDownload
+from aus_weather_data.radar.remote.retry import RetryPolicy
+
+FILENAMES = [f"IDR023.T.2022010100{x:02d}.png" for x in range(0, 60, 5)] + [
+    f"IDR024.T.2022010100{x:02d}.png" for x in range(0, 60, 5)
+]
+
+
+class FakeServer(object):
+    def __init__(self, delays=None, missing=()):
+        self.delays = delays or {}
+        self.missing = set(missing)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requested = []
+
+
+class FakeConn(object):
+    def __init__(self, server):
+        self.server = server
+        self.last_activity = time.monotonic()
+
+    def quit(self):
+        pass
+
+    def keep_alive(self):
+        return True
+
+    def get_directory_contents(self):
+        return ["/anon/gen/radar/" + x for x in FILENAMES]
+
+    def get_file(self, remote_file, reuse_buffer=False):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.requested.append(remote_file.filename)
+
+        try:
+            time.sleep(server.delays.get(remote_file.filename, 0.001))
+            if remote_file.filename in server.missing:
+                raise IOError("Not found") from ftplib.error_perm("550 No such file")
+            return BOMRadarFramePNG(remote_file.filename)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+class FakeDownload(BOMRadarDownload):
+    def __init__(self, server, **kwargs):
+        self.server = server
+        kwargs.setdefault("retry_policy", RetryPolicy(attempts=1))
+        super().__init__(**kwargs)
+
+    def _create_new_connection(self):
+        return FakeConn(self.server)
+
+
+def test_iter_radar_frames_time_order():
+    # The earliest frame is the slowest, but is still yielded first
+    server = FakeServer(delays={FILENAMES[0]: 0.05})
+    download = FakeDownload(server, connections_count=4)
+
+    frames = list(download.iter_radar_frames(order="time"))
+    filenames = [x.filename for x in frames]
+
+    assert sorted(filenames) == sorted(FILENAMES)
+    assert [x.epoch_minute for x in frames] == sorted(x.epoch_minute for x in frames)
+    assert filenames[0] == FILENAMES[0]
+
+
+def test_iter_radar_frames_completion_order():
+    server = FakeServer(delays={FILENAMES[0]: 0.05})
+    download = FakeDownload(server, connections_count=4)
+
+    frames = list(
+        download.iter_radar_frames(
+            radar_locations=[BOMRadarLocation.IDR02],
+            radar_types=[RADAR_TYPE.REF_128_KM],
+        )
+    )
+    filenames = [x.filename for x in frames]
+
+    assert sorted(filenames) == FILENAMES[:12]
+    assert filenames[0] != FILENAMES[0]
+
+
+def test_iter_radar_frames_window():
+    server = FakeServer()
+    download = FakeDownload(server, connections_count=8)
+
+    frames = download.iter_radar_frames(window=3)
+    first = next(frames)
+    assert isinstance(first, BOMRadarFramePNG)
+
+    # Only the window is requested until the consumer takes more frames
+    time.sleep(0.05)
+    assert len(server.requested) <= 4
+    assert server.max_in_flight <= 3
+
+    frames.close()
+    assert len(server.requested) <= 4
+
+
+def test_iter_radar_frames_failures():
+    server = FakeServer(missing=FILENAMES[:2])
+    download = FakeDownload(server, connections_count=2)
+
+    filenames = [x.filename for x in download.iter_radar_frames(order="time")]
+
+    assert sorted(filenames) == sorted(FILENAMES[2:])
+    assert sorted(x.filename for x in download.last_report.failed_frames) == sorted(
+        FILENAMES[:2]
+    )
+
+
+def test_iter_radar_frames_ignore_list():
+    ignore_list = FILENAMES[:3] + ["IDR021.T.202201010000.png", "readme.txt"]
+
+    for database in [None, BOMRadarFrameDatabase()]:
+        download = FakeDownload(FakeServer(), connections_count=2, database=database)
+        frames = download.iter_radar_frames(ignore_list=ignore_list)
+        assert sorted(x.filename for x in frames) == sorted(FILENAMES[3:])
+
+
+def test_iter_radar_frames_invalid():
+    download = FakeDownload(FakeServer())
+
+    with pytest.raises(ValueError):
+        next(download.iter_radar_frames(order="random"))
+
+    with pytest.raises(ValueError):
+        next(download.iter_radar_frames(window=0))
+
+
+class SavingConn(FakeConn):
+    def download_file(self, remote_file, path, digest=None):
+        self.server.requested.append(remote_file.filename)
+        if remote_file.filename in self.server.missing:
+            raise IOError("Not found") from ftplib.error_perm("550 No such file")
+
+        target = os.path.join(path, remote_file.filename)
+        with open(target, "wb") as f:
+            f.write(b"\x89PNG")
+        if digest is not None:
+            digest.update(b"\x89PNG")
+        return target
+
+
+class SavingDownload(FakeDownload):
+    def _create_new_connection(self):
+        return SavingConn(self.server)
+
+
+def test_save_radar_frames(tmp_path):
+    server = FakeServer(missing=FILENAMES[:1])
+    download = SavingDownload(server, connections_count=3)
+
+    paths = download.save_radar_frames(
+        str(tmp_path), radar_types=[RADAR_TYPE.REF_128_KM]
+    )
+
+    assert sorted(os.path.basename(x) for x in paths) == FILENAMES[1:12]
+    assert sorted(x.name for x in tmp_path.iterdir()) == FILENAMES[1:12]
+    assert [x.filename for x in download.last_report.failed_frames] == FILENAMES[:1]
+
+
+def test_save_radar_frames_database(tmp_path):
+    server = FakeServer(missing=FILENAMES[:1])
+    database = BOMRadarFrameDatabase()
+    download = SavingDownload(server, connections_count=3, database=database)
+
+    download.save_radar_frames(str(tmp_path), radar_types=[RADAR_TYPE.REF_128_KM])
+    assert len(database.query(status=[FRAME_STATUS.STORED])) == 11
+    assert [x.filename for x in database.query(status=[FRAME_STATUS.FAILED])] == (
+        FILENAMES[:1]
+    )
+    checksum = hashlib.sha256(b"\x89PNG").hexdigest()
+    assert database.info(BOMRadarFramePNG(FILENAMES[1])) == (4, checksum)
+
+    # Stored frames are skipped, the failed frame is tried again
+    server.requested.clear()
+    server.missing.clear()
+    download.save_radar_frames(str(tmp_path))
+    assert sorted(set(server.requested)) == sorted([FILENAMES[0]] + FILENAMES[12:])
+    assert len(database.query(status=[FRAME_STATUS.STORED])) == 24
+
+
+ASSET = os.path.join(*[".", "tests", "assets", "IDR024.T.202001312324.png"])
+
+
+class PNGConn(FakeConn):
+    def get_file(self, remote_file, reuse_buffer=False):
+        frame = super().get_file(remote_file, reuse_buffer)
+        with open(ASSET, "rb") as f:
+            data = f.read()
+        # The second IDR024 frame is corrupt
+        if remote_file.filename == FILENAMES[13]:
+            data = data[:100]
+        frame.load_png_data(data)
+        return frame
+
+
+class PNGDownload(FakeDownload):
+    def _create_new_connection(self):
+        return PNGConn(self.server)
+
+
+@pytest.fixture(scope="module")
+def decoder():
+    with BOMRadarBatchDecoder(max_workers=2) as decoder:
+        yield decoder
+
+
+def test_process_radar_frames(decoder):
+    server = FakeServer(missing=FILENAMES[:1])
+    database = BOMRadarFrameDatabase()
+    download = PNGDownload(server, connections_count=3, database=database)
+
+    written = {}
+
+    def writer(frame, indices, palette, alpha):
+        written[frame.filename] = (indices.copy(), palette, alpha)
+
+    report = download.process_radar_frames(
+        writer, decoder=decoder, queue_size=2, batch_size=4
+    )
+
+    assert report is download.last_report
+    assert sorted(x.filename for x in report.failed_frames) == [
+        FILENAMES[0],
+        FILENAMES[13],
+    ]
+    assert sorted(written) == sorted(set(FILENAMES) - {FILENAMES[0], FILENAMES[13]})
+
+    indices, palette, alpha = written[FILENAMES[1]]
+    assert indices.shape == (512, 512)
+    assert palette.shape == (16, 3)
+    assert alpha[0] == 0
+
+    assert len(database.query(status=[FRAME_STATUS.STORED])) == 22
+    assert len(database.query(status=[FRAME_STATUS.FAILED])) == 2
+
+
+def test_process_radar_frames_writer_error(decoder):
+    server = FakeServer(delays={x: 0.01 for x in FILENAMES})
+    database = BOMRadarFrameDatabase()
+    download = PNGDownload(server, connections_count=3, database=database)
+
+    def writer(frame, indices, palette, alpha):
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        download.process_radar_frames(writer, decoder=decoder, queue_size=1)
+
+    # The writer failed on the first frame, the downloads stopped early
+    assert len(server.requested) < len(FILENAMES)
+
+    # The frame the writer failed on isn't recorded as stored
+    assert len(database.query(status=[FRAME_STATUS.STORED])) == 0
+    failed = download.last_report.failed_frames
+    assert len(failed) == 1
+    assert database.status(failed[0]) == FRAME_STATUS.FAILED
+
+    with pytest.raises(ValueError):
+        download.process_radar_frames(writer, decoder=decoder, batch_size=0)
+
+
+def test_process_radar_frames_writer_keeps_arrays(decoder):
+    download = PNGDownload(FakeServer(), connections_count=3)
+    kept = []
+
+    def writer(frame, indices, palette, alpha):
+        kept.append(indices)
+
+    report = download.process_radar_frames(writer, decoder=decoder, batch_size=4)
+
+    # The batches weren't unmapped under the kept arrays
+    assert len(kept) == len(FILENAMES) - len(report.failed_frames)
+    with open(ASSET, "rb") as f:
+        expected, _, _ = decode_png(f.read())
+    for indices in kept:
+        np.testing.assert_array_equal(indices, expected)
@@ -0,0 +1,101 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from aus_weather_data.radar.common.frame import BOMRadarFrameData
+from aus_weather_data.radar.common.legend import (
+    BOMRadarLegend,
+    RADAR_TYPE_LEGEND,
+    RAINFALL_SHORT,
+    REFLECTIVITY_DBZ,
+    REFLECTIVITY_RAIN_RATE,
+    get_radar_type_legend,
+)
+from aus_weather_data.radar.common.types import RADAR_TYPE
+
+ASSET_PATH = os.path.join(*[".", "tests", "assets"])
+ASSET = "IDR024.T.202001312324.png"
+
+
+def test_legend_lut():
+    legend = BOMRadarLegend("Test", "mm", [(1, 2, 3), (4, 5, 6)], [1.5, 2.5])
+    palette = np.array([[0, 0, 0], [4, 5, 6], [1, 2, 3], [1, 2, 3]], dtype=np.uint8)
+    alpha = np.array([255, 255, 255, 0], dtype=np.uint8)
+
+    lut = legend.lut(palette, alpha)
+    assert lut.dtype == np.float32
+    assert np.isnan(lut[0]) and np.isnan(lut[3])
+    assert lut[1:3].tolist() == [2.5, 1.5]
+    assert legend.lut(palette, alpha) is lut
+
+    # Threads filling the shared cache all get the stored table
+    palettes = [np.full((4, 3), n, dtype=np.uint8) for n in range(8)]
+    results = []
+
+    def fill():
+        results.extend(legend.lut(p) for p in palettes)
+
+    threads = [threading.Thread(target=fill) for x in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 32
+    assert all(r is legend.lut(palettes[n % 8]) for n, r in enumerate(results))
+
+    indices = np.array([[1, 2], [3, 9]], dtype=np.uint8)
+    values = legend.convert(indices, palette, alpha)
+    assert values[0].tolist() == [2.5, 1.5]
+    assert np.isnan(values[1]).all()
+
+    with pytest.raises(ValueError):
+        BOMRadarLegend("Test", "mm", [(1, 2, 3)], [1.0, 2.0])
+
+    with pytest.raises(ValueError):
+        BOMRadarLegend("Test", "mm", [(1, 2, 3), (1, 2, 3)], [1.0, 2.0])
+
+
+def test_radar_type_legend():
+    assert RADAR_TYPE_LEGEND[RADAR_TYPE.REF_128_KM] is REFLECTIVITY_DBZ
+    assert get_radar_type_legend(RADAR_TYPE.REF_64_KM) is REFLECTIVITY_DBZ
+
+    # Every radar type has a legend
+    assert set(RADAR_TYPE_LEGEND) == set(RADAR_TYPE)
+    assert get_radar_type_legend(RADAR_TYPE.VEL_128_KM).unit == "m/s"
+    assert get_radar_type_legend(RADAR_TYPE.RAI_128_KM_24H).unit == "mm"
+
+    # Z = 200R^1.6
+    rates = REFLECTIVITY_RAIN_RATE.values
+    np.testing.assert_allclose(
+        REFLECTIVITY_DBZ.values, 10 * np.log10(200 * rates.astype(float) ** 1.6), 1e-5
+    )
+
+
+def test_frame_data_values():
+    frame = BOMRadarFrameData(ASSET)
+    frame.load_png_from_file(ASSET_PATH)
+
+    dbz = frame.values()
+    assert dbz.shape == (512, 512)
+    assert dbz.dtype == np.float32
+
+    # Transparent and background pixels have no value
+    indices = frame.palette_indices
+    assert np.isnan(dbz[indices == 0]).all()
+    assert np.isnan(dbz[(frame.palette[indices] == [192, 192, 192]).all(axis=2)]).all()
+    assert np.nanmin(dbz) == REFLECTIVITY_DBZ.values[0]
+
+    rain = frame.values(REFLECTIVITY_RAIN_RATE)
+    assert (np.isnan(rain) == np.isnan(dbz)).all()
+    assert np.nanmax(rain) <= 360
+
+    # The rainfall products default to the rainfall legend
+    with open(os.path.join(ASSET_PATH, ASSET), "rb") as f:
+        data = f.read()
+    frame = BOMRadarFrameData("IDR02A.T.202001312324.png")
+    frame.load_png_data(data)
+    rainfall = frame.values()
+    assert (np.isnan(rainfall) == np.isnan(dbz)).all()
+    assert np.nanmin(rainfall) == RAINFALL_SHORT.values[0]
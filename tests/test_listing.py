@@ -0,0 +1,58 @@
+from .constants import ANON_GEN_RADAR_DIRECTORY_TEST_FILES
+from aus_weather_data.radar.common.catalog import BOMRadarCatalog
+from aus_weather_data.radar.remote.listing import BOMRadarListingTracker
+
+
+def test_listing_tracker():
+    first = ANON_GEN_RADAR_DIRECTORY_TEST_FILES[:-10]
+    second = ANON_GEN_RADAR_DIRECTORY_TEST_FILES[10:]
+
+    tracker = BOMRadarListingTracker()
+
+    diff = tracker.update(first)
+    assert len(diff.added) == len(first)
+    assert diff.removed == []
+    assert len(tracker.catalog) == len(BOMRadarCatalog.from_filenames(first))
+
+    diff = tracker.update(first)
+    assert diff.added == []
+    assert diff.removed == []
+
+    diff = tracker.update(second)
+    assert diff.added == [x.rpartition("/")[2] for x in second[-10:]]
+    assert diff.removed == [x.rpartition("/")[2] for x in first[:10]]
+    assert sorted(diff.added_keys) == sorted(
+        BOMRadarCatalog.from_filenames(diff.added).keys
+    )
+    assert sorted(diff.removed_keys) == sorted(
+        BOMRadarCatalog.from_filenames(diff.removed).keys
+    )
+    assert len(tracker) == len(second)
+    assert sorted(x.filename for x in tracker.catalog) == sorted(
+        x.filename for x in BOMRadarCatalog.from_filenames(second)
+    )
+
+
+def test_listing_tracker_parses_new_entries_only(monkeypatch):
+    from aus_weather_data.radar.remote import listing
+
+    parsed = []
+
+    def parse_frame_key(filename):
+        parsed.append(filename)
+        return None
+
+    monkeypatch.setattr(listing, "parse_frame_key", parse_frame_key)
+
+    tracker = BOMRadarListingTracker()
+    tracker.update(["a.png", "b.png"])
+    diff = tracker.update(["b.png", "c.png", "/path/c.png", "c.png"])
+
+    assert diff.added == ["c.png"]
+    assert parsed == ["a.png", "b.png", "c.png"]
+    assert tracker.filenames == ["b.png", "c.png"]
+    assert len(tracker.catalog) == 0
+
+    # Listed filenames reuse their parsed key
+    assert len(tracker.keys(["b.png", "/path/c.png", "d.png"])) == 0
+    assert parsed == ["a.png", "b.png", "c.png", "d.png"]
@@ -0,0 +1,123 @@
+import os
+
+import numpy as np
+import pytest
+
+from aus_weather_data.radar.common.frame import BOMRadarFrameData
+from aus_weather_data.radar.common.legend import REFLECTIVITY_RAIN_RATE
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.common.mosaic import BOMRadarMosaic
+from aus_weather_data.radar.common.types import RADAR_TYPE
+from aus_weather_data.radar.common.utils import get_distance_bearing
+
+ASSET = os.path.join(*[".", "tests", "assets", "IDR024.T.202001312324.png"])
+
+SYDNEY = BOMRadarLocation.IDR71
+WOLLONGONG = BOMRadarLocation.IDR03
+LATITUDES = np.linspace(-33.0, -35.5, 60)
+LONGITUDES = np.linspace(149.5, 152.5, 70)
+
+
+def load_frame(filename):
+    with open(ASSET, "rb") as f:
+        data = f.read()
+
+    frame = BOMRadarFrameData(filename)
+    frame.load_png_data(data)
+    return frame
+
+
+def expected_values(frame, location):
+    """Value of the frame at each cell, NaN past the range, done cell by cell"""
+
+    lats, lons = np.meshgrid(LATITUDES, LONGITUDES, indexing="ij")
+    rows, cols = location.coordinates_to_pixels(RADAR_TYPE.REF_128_KM, lats, lons)
+    distances, _ = get_distance_bearing(*location.location, lats, lons)
+    values = frame.values()[rows, cols]
+    distances[(distances > 128) | (rows < 0)] = np.inf
+    values[np.isinf(distances)] = np.nan
+    return values, distances
+
+
+@pytest.mark.parametrize("method", ["max", "nearest"])
+def test_mosaic_composite(method):
+    mosaic = BOMRadarMosaic(
+        [SYDNEY, WOLLONGONG], RADAR_TYPE.REF_128_KM, LATITUDES, LONGITUDES, method
+    )
+    assert mosaic.shape == (60, 70)
+
+    sydney = load_frame("IDR713.T.202410150000.png")
+    wollongong = load_frame("IDR033.T.202410150000.png")
+    sydney_values, sydney_distances = expected_values(sydney, SYDNEY)
+    wollongong_values, wollongong_distances = expected_values(wollongong, WOLLONGONG)
+
+    if method == "max":
+        expected = np.fmax(sydney_values, wollongong_values)
+        assert mosaic.coverage().max() == 2
+    else:
+        nearer = sydney_distances <= wollongong_distances
+        expected = np.where(nearer, sydney_values, wollongong_values)
+        assert mosaic.coverage().max() == 1
+
+    composite = mosaic.composite([sydney, wollongong])
+    assert composite.dtype == np.float32
+    np.testing.assert_array_equal(composite, expected)
+    assert np.isfinite(composite).any() and np.isnan(composite).any()
+
+    # The output is reused, and a radar without a frame leaves its cells empty
+    out = np.zeros(mosaic.shape, dtype=np.float32)
+    assert mosaic.composite([sydney], out=out) is out
+    if method == "max":
+        np.testing.assert_array_equal(out, sydney_values)
+    assert np.isnan(out[mosaic.coverage() == 0]).all()
+
+    rain = mosaic.composite([sydney], legend=REFLECTIVITY_RAIN_RATE)
+    assert np.nanmax(rain) <= 360
+
+
+def test_mosaic_outside_image(monkeypatch):
+    # Cells the image doesn't reach are left empty, even if within range
+    import aus_weather_data.radar.common.mosaic as mosaic_module
+
+    def shrunk_distance_bearing(*args):
+        distances, bearings = get_distance_bearing(*args)
+        return distances * 0.99, bearings
+
+    monkeypatch.setattr(mosaic_module, "get_distance_bearing", shrunk_distance_bearing)
+
+    latitude, longitude = SYDNEY.location
+    longitudes = np.linspace(longitude + 1.3, longitude + 1.5, 21)
+    mosaic = BOMRadarMosaic(
+        [SYDNEY], RADAR_TYPE.REF_128_KM, [latitude], longitudes, method="max"
+    )
+
+    rows, _ = SYDNEY.coordinates_to_pixels(RADAR_TYPE.REF_128_KM, latitude, longitudes)
+    assert (rows < 0).any() and (rows >= 0).any()
+    np.testing.assert_array_equal(mosaic.coverage()[0], rows >= 0)
+
+    composite = mosaic.composite([load_frame("IDR713.T.202410150000.png")])
+    assert np.isnan(composite[0, rows < 0]).all()
+
+
+def test_mosaic_errors():
+    with pytest.raises(ValueError):
+        BOMRadarMosaic([SYDNEY], RADAR_TYPE.REF_128_KM, LATITUDES, LONGITUDES, "mean")
+
+    with pytest.raises(TypeError):
+        BOMRadarMosaic(
+            [BOMRadarLocation.IDR55], RADAR_TYPE.VEL_128_KM, LATITUDES, LONGITUDES
+        )
+
+    mosaic = BOMRadarMosaic([SYDNEY], RADAR_TYPE.REF_128_KM, LATITUDES, LONGITUDES)
+    sydney = load_frame("IDR713.T.202410150000.png")
+
+    for frames in [
+        [sydney, sydney],
+        [load_frame("IDR033.T.202410150000.png")],
+        [load_frame("IDR712.T.202410150000.png")],
+    ]:
+        with pytest.raises(ValueError):
+            mosaic.composite(frames)
+
+    with pytest.raises(ValueError):
+        mosaic.composite([sydney], out=np.empty((70, 60), dtype=np.float32))
@@ -0,0 +1,97 @@
+import datetime
+import os
+
+import pytest
+
+from aus_weather_data.radar.common.frame import (
+    BOMRadarFrameMetadata,
+    BOMRadarFramePNG,
+)
+from aus_weather_data.radar.common.location import BOMRadarLocation
+from aus_weather_data.radar.common.types import RADAR_TYPE
+from aus_weather_data.radar.local.pack import BOMRadarFramePack, PACK_INDEX_DTYPE
+
+FILENAMES = [
+    "IDR023.T.202410150005.png",
+    "IDR714.T.202410150000.png",
+    "IDR023.T.202410150000.png",
+    "IDR023.T.202410150010.png",
+]
+
+
+def png_frame(filename):
+    frame = BOMRadarFramePNG(filename)
+    frame.load_png_data(filename.encode() * 3)
+    return frame
+
+
+def test_pack_append_and_load(tmp_path):
+    path = str(tmp_path / "day")
+
+    with BOMRadarFramePack(path) as pack:
+        assert pack.extend(png_frame(x) for x in FILENAMES) == 4
+        assert not pack.append(png_frame(FILENAMES[0]))
+        assert len(pack) == 4
+
+        frame = pack.load(BOMRadarFrameMetadata(FILENAMES[1]), verify=True)
+        assert frame.filename == FILENAMES[1]
+        assert isinstance(frame.png_data, memoryview)
+        assert frame.png_data == FILENAMES[1].encode() * 3
+
+        frame.detach()
+        assert frame.png_data == FILENAMES[1].encode() * 3
+
+    assert os.path.getsize(path + ".idx") == 4 * PACK_INDEX_DTYPE.itemsize
+
+    with BOMRadarFramePack(path) as pack:
+        assert len(pack) == 4
+        assert BOMRadarFrameMetadata(FILENAMES[3]) in pack
+        assert BOMRadarFrameMetadata("IDR023.T.202410150015.png") not in pack
+
+        with pytest.raises(KeyError):
+            pack.load(BOMRadarFrameMetadata("IDR023.T.202410150015.png"))
+
+
+def test_pack_frames_in_time_order(tmp_path):
+    with BOMRadarFramePack(str(tmp_path / "day")) as pack:
+        pack.extend(png_frame(x) for x in FILENAMES)
+
+        frames = list(pack.frames(BOMRadarLocation.IDR02, RADAR_TYPE.REF_128_KM))
+        assert [x.filename for x in frames] == sorted(
+            x for x in FILENAMES if x.startswith("IDR023")
+        )
+        assert all(x.png_data == x.filename.encode() * 3 for x in frames)
+
+        frames = pack.frames(
+            start_time_utc=datetime.datetime(
+                2024, 10, 15, 0, 5, tzinfo=datetime.timezone.utc
+            )
+        )
+        assert [x.filename for x in frames] == [FILENAMES[0], FILENAMES[3]]
+
+
+def test_pack_recovers_interrupted_append(tmp_path):
+    path = str(tmp_path / "day")
+
+    with BOMRadarFramePack(path) as pack:
+        pack.extend(png_frame(x) for x in FILENAMES[:2])
+
+    # A frame's data written without its index record, and a partial record
+    with open(path + ".data", "ab") as f:
+        f.write(b"orphaned data")
+    with open(path + ".idx", "ab") as f:
+        f.write(b"\x00" * 10)
+
+    with BOMRadarFramePack(path) as pack:
+        assert len(pack) == 2
+        assert pack.append(png_frame(FILENAMES[2]))
+        assert pack.load(BOMRadarFrameMetadata(FILENAMES[2]), verify=True)
+
+    with BOMRadarFramePack(path) as pack:
+        assert [x.filename for x in pack.frames()] == [
+            FILENAMES[2],
+            FILENAMES[1],
+            FILENAMES[0],
+        ]
+        for frame in pack.frames():
+            assert frame.png_data == frame.filename.encode() * 3
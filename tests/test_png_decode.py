@@ -0,0 +1,197 @@
+import os
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from aus_weather_data.exceptions import DecodeFrameError
+from aus_weather_data.radar.common.frame import BOMRadarFrameData
+from aus_weather_data.radar.common.png import _unfilter, decode_png, read_png_header
+
+ASSET_PATH = os.path.join(*[".", "tests", "assets"])
+ASSET = "IDR024.T.202001312324.png"
+
+
+def chunk(chunk_type, data):
+    return (
+        struct.pack(">I", len(data))
+        + chunk_type
+        + data
+        + struct.pack(">I", zlib.crc32(chunk_type + data))
+    )
+
+
+def paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def filter_row(filter_type, row, previous, bpp=1):
+    out = []
+    for x, value in enumerate(row):
+        left = row[x - bpp] if x >= bpp else 0
+        up = previous[x]
+        upper_left = previous[x - bpp] if x >= bpp else 0
+        predictor = [0, left, up, (left + up) // 2, paeth(left, up, upper_left)]
+        out.append((value - predictor[filter_type]) % 256)
+    return bytes([filter_type] + out)
+
+
+def encode_png(indices, bit_depth, filters, palette_size=16):
+    """Palette PNG with each row using the next filter type from `filters`"""
+
+    height, width = indices.shape
+    per_byte = 8 // bit_depth
+    padded = np.zeros((height, -(-width // per_byte) * per_byte), dtype=np.uint8)
+    padded[:, :width] = indices
+    shifts = np.arange(8 - bit_depth, -1, -bit_depth)
+    packed = (
+        (padded.reshape(height, -1, per_byte) << shifts).sum(axis=2).astype(np.uint8)
+    )
+
+    raw = b""
+    previous = [0] * packed.shape[1]
+    for y in range(height):
+        row = packed[y].tolist()
+        raw += filter_row(filters[y % len(filters)], row, previous)
+        previous = row
+
+    palette = bytes(range(palette_size * 3))
+    ihdr = struct.pack(">IIBBBBB", width, height, bit_depth, 3, 0, 0, 0)
+    compressed = zlib.compress(raw)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", ihdr)
+        + chunk(b"PLTE", palette)
+        + chunk(b"tRNS", b"\x00\x80")
+        + chunk(b"IDAT", compressed[:10])
+        + chunk(b"IDAT", compressed[10:])
+        + chunk(b"IEND", b"")
+    )
+
+
+@pytest.mark.parametrize("bit_depth", [1, 2, 4, 8])
+def test_decode_png_filters_and_bit_depths(bit_depth):
+    rng = np.random.default_rng(bit_depth)
+    indices = rng.integers(0, 2**bit_depth, size=(10, 37), dtype=np.uint8)
+    data = encode_png(indices, bit_depth, filters=[0, 1, 2, 3, 4])
+
+    header = read_png_header(data)
+    assert header.shape == (10, 37)
+    assert header.bit_depth == bit_depth
+
+    decoded, palette, alpha = decode_png(data)
+    assert decoded.dtype == np.uint8
+    np.testing.assert_array_equal(decoded, indices)
+    assert palette.shape == (16, 3)
+    assert palette[1].tolist() == [3, 4, 5]
+    assert alpha.tolist() == [0, 128] + [255] * 14
+
+    out = np.empty((10, 37), dtype=np.uint8)
+    assert decode_png(data, out=out)[0] is out
+    np.testing.assert_array_equal(out, indices)
+
+
+class NoSelfCopy(np.ndarray):
+    def __setitem__(self, key, value):
+        assert not np.may_share_memory(self, value), "out copied onto itself"
+        super().__setitem__(key, value)
+
+
+@pytest.mark.parametrize("bit_depth", [1, 2, 4])
+def test_decode_png_unpacks_into_out(bit_depth):
+    # Rows without padding bits are unpacked straight into `out`
+    rng = np.random.default_rng(bit_depth)
+    indices = rng.integers(0, 2**bit_depth, size=(6, 40), dtype=np.uint8)
+    data = encode_png(indices, bit_depth, filters=[0, 1])
+
+    out = np.empty((6, 40), dtype=np.uint8).view(NoSelfCopy)
+    assert decode_png(data, out=out)[0] is out
+    np.testing.assert_array_equal(out, indices)
+
+
+@pytest.mark.parametrize("bit_depth", [4, 8])
+def test_decode_png_filter_runs(bit_depth):
+    # Long runs of Average and Paeth rows are undone as a wavefront
+    rng = np.random.default_rng(bit_depth)
+    indices = rng.integers(0, 2**bit_depth, size=(200, 53), dtype=np.uint8)
+    filters = [1] * 3 + [3] * 60 + [4] * 50 + [3, 4] * 30 + [2, 3, 4] * 9
+    data = encode_png(indices, bit_depth, filters=filters)
+
+    decoded, _, _ = decode_png(data)
+    np.testing.assert_array_equal(decoded, indices)
+
+
+def test_unfilter_multibyte_pixels():
+    rng = np.random.default_rng(3)
+    rows = rng.integers(0, 256, size=(70, 30), dtype=np.uint8)
+    filters = [4] * 60 + [3] * 10
+
+    raw = []
+    previous = [0] * 30
+    for filter_type, row in zip(filters, rows.tolist()):
+        raw.append(list(filter_row(filter_type, row, previous, bpp=3)))
+        previous = row
+
+    np.testing.assert_array_equal(_unfilter(np.array(raw, dtype=np.uint8), 3), rows)
+
+
+def test_decode_png_errors():
+    data = encode_png(np.zeros((4, 4), dtype=np.uint8), 8, filters=[0])
+
+    with pytest.raises(DecodeFrameError):
+        decode_png(b"GIF89a" + data[6:])
+
+    with pytest.raises(DecodeFrameError):
+        decode_png(data[:40])
+
+    # Filter type 5 doesn't exist
+    raw = zlib.compress(b"\x05" + b"\x00" * 4)
+    ihdr = struct.pack(">IIBBBBB", 4, 1, 8, 3, 0, 0, 0)
+    bad_filter = (
+        data[:8]
+        + chunk(b"IHDR", ihdr)
+        + chunk(b"PLTE", b"\x00" * 3)
+        + chunk(b"IDAT", raw)
+        + chunk(b"IEND", b"")
+    )
+    with pytest.raises(DecodeFrameError):
+        decode_png(bad_filter)
+
+    # Palette images can't have 16 bit samples
+    ihdr = struct.pack(">IIBBBBB", 4, 1, 16, 3, 0, 0, 0)
+    bad_depth = data[:8] + chunk(b"IHDR", ihdr) + data[8 + 25 :]
+    with pytest.raises(DecodeFrameError, match="bit depth"):
+        decode_png(bad_depth)
+
+
+def test_frame_data_decode():
+    frame = BOMRadarFrameData(ASSET)
+    frame.load_png_from_file(ASSET_PATH)
+
+    indices = frame.palette_indices
+    assert indices.shape == (512, 512)
+    assert indices.dtype == np.uint8
+    assert indices.max() < len(frame.palette)
+    assert frame.palette.shape == (16, 3)
+
+    # Index 0 is the transparent background
+    assert frame.alpha[0] == 0
+    assert (indices == 0).any()
+    assert frame.palette_indices is indices
+
+    frame.load_png_data(frame.png_data)
+    assert frame.palette_indices is not indices
+    np.testing.assert_array_equal(frame.palette_indices, indices)
+
+    # Decoding into the caller's array doesn't keep it
+    out = np.zeros((512, 512), dtype=np.uint8)
+    cached = frame.palette_indices
+    assert frame.decode(out=out) is out
+    out[:] = 255
+    assert frame.palette_indices is cached
+    np.testing.assert_array_equal(cached, indices)
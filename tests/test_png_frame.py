@@ -1,9 +1,11 @@
 import os
 import pytz
+import pytest
 import datetime
 import tempfile
 
-from aus_weather_data.radar.common.frame import BOMRadarFramePNG
+from aus_weather_data.exceptions import ParseFrameError
+from aus_weather_data.radar.common.frame import BOMRadarFrameMetadata, BOMRadarFramePNG
 from aus_weather_data.radar.common.location import BOMRadarLocation
 from aus_weather_data.radar.common.types import RADAR_TYPE
 
@@ -68,3 +70,47 @@ def test_radar_metadata():
     assert frame.nice_date_locale == "2020-02-01 10:24 Australia/Melbourne"
 
     assert frame.filename == f"{filename_base}.png"
+
+
+def test_radar_frame_parse_error():
+    for filename in [
+        "IDR00004.T.202312131628.png",
+        "IDR02X.T.202312131628.png",
+        "IDR023.T.20231213.png",
+    ]:
+        with pytest.raises(ParseFrameError):
+            BOMRadarFramePNG(filename)
+
+
+def test_radar_frame_slots():
+    frame = BOMRadarFrameMetadata("IDR024.T.202001312324.png")
+
+    assert not hasattr(frame, "__dict__")
+    assert frame.radar_index == BOMRadarLocation.IDR_LIST.index("IDR02")
+    assert frame.epoch_minute * 60 == frame.epoch_time
+    assert frame.start_time == frame.dt_utc
+
+    frame.locale_tz = pytz.timezone("Australia/Melbourne")
+    assert frame.date_locale == "2020-02-01"
+
+    frame.locale_tz = pytz.timezone("Australia/Perth")
+    assert frame.date_locale == "2020-02-01"
+    assert frame.hour_locale == "07"
+
+    frame.locale_tz = None
+    assert frame.nice_date_locale == "2020-01-31 23:24 UTC"
+
+
+def test_radar_frame_from_components():
+    parsed = BOMRadarFramePNG("IDR024.T.202001312324.png")
+    frame = BOMRadarFramePNG.from_components(
+        parsed.radar_index, parsed.radar_type_str, parsed.epoch_minute
+    )
+
+    assert frame.filename == parsed.filename
+    assert frame.radar_id == BOMRadarLocation.IDR02
+    assert frame.radar_type == RADAR_TYPE.REF_64_KM
+    assert frame.dt_utc == parsed.dt_utc
+    assert isinstance(
+        BOMRadarFrameMetadata.from_components(0, "3", 0), BOMRadarFrameMetadata
+    )
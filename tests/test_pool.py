@@ -0,0 +1,199 @@
+import threading
+import time
+
+import pytest
+
+from aus_weather_data.exceptions import PoolError, PoolTimeoutError
+from aus_weather_data.radar.remote.pool import BOMFTPPool
+
+
+class FakeConn(object):
+    def __init__(self):
+        self.closed = False
+        self.alive = True
+        self.noops = 0
+        self.last_activity = time.monotonic()
+
+    def quit(self):
+        self.closed = True
+
+    def keep_alive(self):
+        self.noops += 1
+        if self.alive:
+            self.last_activity = time.monotonic()
+        return self.alive
+
+
+class FakePool(BOMFTPPool):
+    def _create_new_connection(self):
+        return FakeConn()
+
+
+def test_pool_state_is_per_instance():
+    with FakePool(connections=2, min_connections=2) as first, FakePool(
+        connections=3, min_connections=3
+    ) as second:
+        assert first.size == 2
+        assert second.size == 3
+
+
+def test_pool_not_open():
+    with pytest.raises(PoolError):
+        FakePool(connections=1).get_connection()
+
+
+def test_pool_timeout():
+    with FakePool(connections=1, timeout=0.05) as pool:
+        with pool.connection():
+            with pytest.raises(PoolTimeoutError):
+                pool.get_connection()
+
+        with pool.connection() as conn:
+            assert isinstance(conn, FakeConn)
+
+
+def test_pool_reentrant():
+    pool = FakePool(connections=1)
+    with pool:
+        conn = pool.get_connection()
+        with pool:
+            pass
+        assert not conn.closed
+        pool.release_connection(conn)
+    assert conn.closed
+
+
+def test_pool_open_for_concurrent_enter():
+    started = threading.Event()
+    release = threading.Event()
+
+    class SlowPool(FakePool):
+        def _init_connections(self):
+            started.set()
+            release.wait(5)
+            super()._init_connections()
+
+    pool = SlowPool(connections=2, min_connections=1)
+    first = threading.Thread(target=pool.__enter__)
+    first.start()
+    try:
+        assert started.wait(5)
+        # The first enterer is still starting the pool
+        with pool:
+            conn = pool.get_connection(timeout=5)
+            pool.release_connection(conn)
+    finally:
+        release.set()
+        first.join()
+        pool.__exit__(None, None, None)
+    assert pool.size == 0
+
+
+def test_pool_blocks_until_release():
+    in_use = []
+    max_in_use = []
+    lock = threading.Lock()
+
+    def worker(pool):
+        for _ in range(5):
+            with pool.connection() as conn:
+                with lock:
+                    assert conn not in in_use
+                    in_use.append(conn)
+                    max_in_use.append(len(in_use))
+                time.sleep(0.001)
+                with lock:
+                    in_use.remove(conn)
+
+    with FakePool(connections=2, timeout=5) as pool:
+        threads = [threading.Thread(target=worker, args=(pool,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(max_in_use) == 40
+        assert max(max_in_use) <= 2
+        assert len(pool._available_connections) == 2
+
+
+def test_pool_lazy_growth():
+    with FakePool(connections=3, min_connections=1) as pool:
+        assert pool.size == 1
+
+        first = pool.get_connection()
+        assert pool.size == 1
+        second = pool.get_connection()
+        third = pool.get_connection()
+        assert pool.size == 3
+
+        with pytest.raises(PoolTimeoutError):
+            pool.get_connection(timeout=0.01)
+
+        for conn in [first, second, third]:
+            pool.release_connection(conn)
+
+        # Reused rather than grown
+        with pool.connection():
+            assert pool.size == 3
+
+
+def test_pool_reaps_idle_connections():
+    with FakePool(connections=3, min_connections=1, idle_timeout=0) as pool:
+        connections = [pool.get_connection() for _ in range(3)]
+        for conn in connections:
+            pool.release_connection(conn)
+
+        assert pool.size == 1
+        assert sum(conn.closed for conn in connections) == 2
+
+    with FakePool(connections=3, idle_timeout=None) as pool:
+        connections = [pool.get_connection() for _ in range(3)]
+        for conn in connections:
+            pool.release_connection(conn)
+
+        assert pool.reap_idle_connections() == 0
+        assert pool.size == 3
+
+
+def test_pool_replaces_dead_connection_on_checkout():
+    with FakePool(connections=2, min_connections=1, health_check_after=0) as pool:
+        with pool.connection() as conn:
+            pass
+
+        conn.alive = False
+
+        with pool.connection() as replacement:
+            assert replacement is not conn
+            assert conn.closed
+        assert pool.size == 1
+
+
+def test_pool_maintenance():
+    with FakePool(connections=3, min_connections=2, keep_alive_interval=None) as pool:
+        first, second = [pool.get_connection() for _ in range(2)]
+        pool.release_connection(first)
+        pool.release_connection(second)
+
+        first.last_activity -= 120
+        second.alive = False
+        second.last_activity -= 120
+        pool._keep_alive_interval = 60
+
+        pool.maintain()
+
+        assert first.noops == 1 and not first.closed
+        assert second.closed
+        assert pool.size == 2
+        assert first in pool._available_connections
+
+
+def test_pool_maintenance_thread():
+    with FakePool(connections=1, min_connections=1, keep_alive_interval=0.01) as pool:
+        with pool.connection() as conn:
+            pass
+        time.sleep(0.2)
+        assert conn.noops > 0
+        assert pool._maintenance_thread.is_alive()
+
+    assert pool._maintenance_thread is None
@@ -0,0 +1,154 @@
+import errno
+import ftplib
+import socket
+import time
+
+import pytest
+
+from aus_weather_data.radar.common.frame import (
+    BOMRadarFrameMetadata,
+    BOMRadarFramePNG,
+)
+from aus_weather_data.radar.remote.download import BOMRadarDownload
+from aus_weather_data.radar.remote.retry import RetryPolicy
+
+
+class FlakyConn(object):
+    """Connection that fails the first `failures[filename]` gets of a file"""
+
+    def __init__(self, failures, error):
+        self.failures = failures
+        self.error = error
+        self.closed = False
+        self.last_activity = time.monotonic()
+
+    def quit(self):
+        self.closed = True
+
+    def keep_alive(self):
+        return True
+
+    def get_file(self, remote_file, reuse_buffer=False):
+        if self.failures.get(remote_file.filename, 0) > 0:
+            self.failures[remote_file.filename] -= 1
+            try:
+                raise self.error
+            except ftplib.all_errors as e:
+                raise IOError(f"Failed to get file {remote_file.filename}") from e
+
+        return BOMRadarFramePNG(remote_file.filename)
+
+
+class FlakyDownload(BOMRadarDownload):
+    def __init__(self, failures, error, **kwargs):
+        self.failures = failures
+        self.error = error
+        self.created = []
+        super().__init__(**kwargs)
+
+    def _create_new_connection(self):
+        conn = FlakyConn(self.failures, self.error)
+        self.created.append(conn)
+        return conn
+
+
+FILENAMES = [
+    "IDR023.T.202201010000.png",
+    "IDR023.T.202201010005.png",
+    "IDR023.T.202201010010.png",
+]
+
+
+def no_wait_policy(attempts=3):
+    return RetryPolicy(attempts=attempts, backoff=0, jitter=0)
+
+
+def test_retry_policy_should_retry():
+    policy = RetryPolicy()
+
+    temp = IOError("wrapped")
+    temp.__cause__ = ftplib.error_temp("421 Too many connections")
+    perm = IOError("wrapped")
+    perm.__cause__ = ftplib.error_perm("550 No such file")
+
+    assert policy.should_retry(temp)
+    assert policy.should_retry(EOFError())
+    assert policy.should_retry(ConnectionResetError())
+    assert policy.should_retry(socket.timeout())
+    assert not policy.should_retry(OSError(errno.ENOSPC, "No space left on device"))
+    assert not policy.should_retry(PermissionError(errno.EACCES, "Permission denied"))
+    assert not policy.should_retry(perm)
+    assert not policy.should_retry(ftplib.error_perm("550 No such file"))
+    assert not policy.should_retry(ValueError())
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(backoff=1, max_backoff=5, jitter=0)
+    assert [policy.delay(x) for x in range(1, 5)] == [1, 2, 4, 5]
+
+    policy = RetryPolicy(backoff=4, jitter=0.5)
+    for _ in range(100):
+        assert 2 <= policy.delay(1) <= 4
+
+    with pytest.raises(ValueError):
+        RetryPolicy(attempts=0)
+
+    with pytest.raises(ValueError):
+        RetryPolicy(jitter=2)
+
+
+def test_download_retries_on_fresh_connection():
+    failures = {FILENAMES[1]: 2}
+    download = FlakyDownload(
+        failures,
+        ftplib.error_temp("421 Too many connections"),
+        connections_count=1,
+        retry_policy=no_wait_policy(),
+    )
+
+    report = download._get_frames([BOMRadarFrameMetadata(x) for x in FILENAMES])
+
+    assert report.ok
+    assert [x.filename for x in report.frames] == FILENAMES
+    assert download.last_report is report
+
+    # Each failed attempt discards its connection
+    assert len(download.created) == 3
+    assert [x.closed for x in download.created] == [True, True, True]
+
+
+def test_download_partial_failure_report():
+    failures = {FILENAMES[0]: 5, FILENAMES[2]: 1}
+    download = FlakyDownload(
+        failures,
+        ftplib.error_temp("421 Too many connections"),
+        connections_count=2,
+        retry_policy=no_wait_policy(attempts=2),
+    )
+
+    remote_files = [BOMRadarFrameMetadata(x) for x in FILENAMES]
+    report = download._get_frames(remote_files)
+
+    assert not report.ok
+    assert [x.filename for x in report.frames] == FILENAMES[1:]
+    assert report.failed_frames == [remote_files[0]]
+    assert isinstance(report.failures[0][1], IOError)
+    assert failures[FILENAMES[0]] == 3
+
+
+def test_download_permanent_error_not_retried():
+    failures = {FILENAMES[0]: 1}
+    download = FlakyDownload(
+        failures,
+        ftplib.error_perm("550 No such file"),
+        connections_count=1,
+        retry_policy=no_wait_policy(),
+    )
+
+    report = download._get_frames([BOMRadarFrameMetadata(x) for x in FILENAMES])
+
+    assert [x.filename for x in report.failed_frames] == FILENAMES[:1]
+    assert len(report.frames) == 2
+
+    # The connection is still usable, so it is kept
+    assert len(download.created) == 1